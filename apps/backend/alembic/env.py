@@ -15,10 +15,13 @@ from app.models import (
     ChatMessage,
     Email,
     EmailConversation,
+    EntityTranslation,
     Keyword,
+    LLMBatchJob,
     Match,
     Organization,
     Report,
+    RSSFeedState,
     SearchProfile,
     Subscription,
     Topic,
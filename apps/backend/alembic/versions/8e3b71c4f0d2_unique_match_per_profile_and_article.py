@@ -0,0 +1,45 @@
+"""Unique match per search profile and article
+
+Revision ID: 8e3b71c4f0d2
+Revises: 5c1f0e7d2a94
+Create Date: 2026-10-18 10:03:27.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e3b71c4f0d2'
+down_revision: Union[str, None] = '5c1f0e7d2a94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep only the earliest match for each (search_profile_id, article_id)
+    op.execute(
+        """
+        DELETE FROM matches m
+        USING matches d
+        WHERE m.search_profile_id = d.search_profile_id
+          AND m.article_id = d.article_id
+          AND (m.matched_at, m.id) > (d.matched_at, d.id)
+        """
+    )
+    op.create_unique_constraint(
+        'uq_matches_search_profile_id_article_id',
+        'matches',
+        ['search_profile_id', 'article_id'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        'uq_matches_search_profile_id_article_id', 'matches', type_='unique'
+    )
@@ -22,7 +22,11 @@ logger = get_logger(__name__)
 @router.post("/")
 async def create_article_matching(
     background_tasks: BackgroundTasks,
+    incremental: bool = False,
 ):
     ams = ArticleMatchingService()
-    background_tasks.add_task(ams.run)
+    if incremental:
+        background_tasks.add_task(ams.run_incremental)
+    else:
+        background_tasks.add_task(ams.run)
     return {"message": "Article matching started in the background."}
@@ -11,6 +11,7 @@ from app.schemas.job_schemas import (
 )
 from app.services import pipeline
 from app.services.email_service import EmailService
+from app.services.llm_batch_reconciler import LLMBatchReconciler
 from app.services.web_harvester.breaking_news_crawler import (
     fetch_breaking_news_newsapi,
 )
@@ -106,3 +107,21 @@ async def trigger_newsapi_crawling() -> JobResponse:
         JobStatus.COMPLETED,
         message=f"Crawled {len(breaking_news)} breaking news articles",
     )
+
+
+@router.post("/llm-batches")
+async def reconcile_llm_batches() -> JobResponse:
+    logger.info("Applying finished LLM batch jobs")
+
+    try:
+        applied = await LLMBatchReconciler.run()
+    except Exception as e:
+        return JobResponse(
+            JobStatus.FAILED,
+            message=f"Failed to apply LLM batch jobs: {str(e)}",
+        )
+
+    return JobResponse(
+        JobStatus.COMPLETED,
+        message=f"Applied {applied} LLM batch jobs",
+    )
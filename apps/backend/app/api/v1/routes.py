@@ -24,6 +24,7 @@ from app.api.v1.endpoints.user_controller import router as user_router
 from app.api.v1.endpoints.vector_store_controller import (
     router as vector_store_router,
 )
+from app.services.llm_service.rate_limiter import get_llm_metrics
 
 routers = APIRouter()
 router_list = [
@@ -48,5 +49,10 @@ async def healthcheck():
     return JSONResponse(content={"status": "ok"})
 
 
+@routers.get("/metrics/llm", tags=["healthcheck"])
+async def llm_metrics():
+    return JSONResponse(content=get_llm_metrics())
+
+
 for router in router_list:
     routers.include_router(router)
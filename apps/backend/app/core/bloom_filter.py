@@ -0,0 +1,50 @@
+"""
+Bloom Filter
+
+A fixed-size set of strings that answers "definitely not added" or
+"possibly added", with a configurable false positive rate.
+"""
+
+import hashlib
+import math
+from typing import Iterable
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Args:
+            capacity: Number of items the filter is sized for. Adding more
+                raises the false positive rate above ``error_rate``.
+            error_rate: False positive rate at ``capacity`` items
+        """
+        self.size = max(
+            int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8
+        )
+        self.hash_count = max(round(self.size / capacity * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return (
+            (first + i * second) % self.size for i in range(self.hash_count)
+        )
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
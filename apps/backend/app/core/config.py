@@ -94,9 +94,29 @@ class Configs(BaseSettings):
     QDRANT_URL: str
     QDRANT_API_KEY: str
     ARTICLE_VECTORS_COLLECTION: str
+    QUERY_EMBEDDING_CACHE_SIZE: int = Field(default=10000)
+    QUERY_EMBEDDING_CACHE_TTL: int = Field(default=30 * 24 * 3600)
+    ARTICLE_EMBEDDING_CONCURRENCY: int = Field(default=4)
+    ARTICLE_VECTOR_DIMENSIONS: int = Field(default=3072)
 
     # AI Services
     OPENAI_API_KEY: str
+    LLM_MAX_CONNECTIONS: int = Field(default=100)
+    LLM_REQUESTS_PER_MINUTE: int = Field(default=5000)
+    LLM_TOKENS_PER_MINUTE: int = Field(default=800000)
+    LLM_MIN_CONCURRENCY: int = Field(default=4)
+    LLM_MAX_CONCURRENCY: int = Field(default=64)
+    LLM_TARGET_LATENCY_SECONDS: float = Field(default=60.0)
+    LLM_RESPONSE_CACHE_BACKEND: str = Field(default="none")
+    LLM_RESPONSE_CACHE_TTL: int = Field(default=7 * 24 * 3600)
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = Field(default=50000)
+    LLM_RESPONSE_CACHE_DIR: str = Field(default="")
+    LLM_BATCH_MAX_REQUESTS: int = Field(default=50000)
+    LLM_BATCH_MAX_BYTES: int = Field(default=200 * 1024 * 1024)
+    LLM_BATCH_MAX_CONCURRENT: int = Field(default=4)
+    TRANSLATION_CHUNK_TOKENS: int = Field(default=1500)
+    ARTICLE_SUMMARY_WITH_TRANSLATIONS: bool = Field(default=False)
+    TRANSLATE_CONTENT_EAGERLY: bool = Field(default=False)
 
     # Authentication (Clerk)
     CLERK_SECRET_KEY: str
@@ -111,6 +131,13 @@ class Configs(BaseSettings):
 
     # External APIs
     NEWSAPIAI_API_KEY: str
+    NEWSAPI_MAX_CONCURRENT_SOURCES: int = Field(default=8)
+    RSS_MAX_CONNECTIONS: int = Field(default=20)
+    RSS_MAX_CONNECTIONS_PER_HOST: int = Field(default=2)
+    ARTICLE_URL_FILTER_CAPACITY: int = Field(default=1_000_000)
+    ARTICLE_URL_FILTER_ERROR_RATE: float = Field(default=0.01)
+    ARTICLE_URL_FILTER_DAYS: int = Field(default=30)
+    ARTICLE_DUPLICATE_WINDOW_DAYS: int = Field(default=3)
 
     # Feature Flags
     DISABLE_AUTH: bool = Field(default=False)
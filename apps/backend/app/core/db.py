@@ -2,7 +2,7 @@ import psycopg
 import redis
 from psycopg import OperationalError
 from psycopg import connection as PgConnection
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -77,3 +77,25 @@ def get_qdrant_connection() -> QdrantClient:
         msg = f"Failed to initialize Qdrant client: {err}"
         logger.error(msg)
         raise RuntimeError(msg) from err
+
+
+def get_async_qdrant_connection() -> AsyncQdrantClient:
+    """
+    Initializes and returns an async Qdrant client.
+
+    Raises:
+        RuntimeError: If the client initialization fails.
+    """
+
+    try:
+        client = AsyncQdrantClient(
+            url=configs.QDRANT_URL,
+            api_key=configs.QDRANT_API_KEY,
+            timeout=30,  # seconds
+        )
+        return client
+
+    except Exception as err:
+        msg = f"Failed to initialize async Qdrant client: {err}"
+        logger.error(msg)
+        raise RuntimeError(msg) from err
@@ -6,12 +6,14 @@ from .chat_message import ChatMessage
 from .crawl_stats import CrawlStats
 from .email import Email
 from .email_conversation import EmailConversation
-from .entity import ArticleEntity
+from .entity import ArticleEntity, EntityTranslation
 from .keyword import Keyword
+from .llm_batch_job import LLMBatchJob
 from .match import Match
 from .matching_run import MatchingRun
 from .organization import Organization
 from .report import Report
+from .rss_feed_state import RSSFeedState
 from .search_profile import SearchProfile
 from .subscription import Subscription
 from .topic import Topic
@@ -32,10 +34,13 @@ __all__ = [
     "Subscription",
     "Topic",
     "ArticleEntity",
+    "EntityTranslation",
     "User",
     "NewPassword",
     "Token",
     "TokenPayload",
     "Report",
     "MatchingRun",
+    "LLMBatchJob",
+    "RSSFeedState",
 ]
@@ -3,7 +3,7 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import TIMESTAMP, Column, Text
+from sqlalchemy import TIMESTAMP, BigInteger, Column, ForeignKey, Text, Uuid
 from sqlmodel import JSON, Field, Relationship, SQLModel
 
 from app.models.associations import ArticleKeywordLink
@@ -32,6 +32,14 @@ class Article(SQLModel, table=True):
     title: str = Field(max_length=255)
     content: str = Field(nullable=True)
     url: str = Field(max_length=255, unique=True)
+    canonical_url: Optional[str] = Field(
+        default=None,
+        sa_column=Column(
+            Text,
+            nullable=True,
+            comment="Canonical URL given by the scraped page",
+        ),
+    )
     image_url: Optional[str] = Field(
         default=None,
         sa_column=Column(
@@ -54,6 +62,14 @@ class Article(SQLModel, table=True):
         )
     )
     language: str = Field(max_length=255, nullable=True)
+    field_languages: Optional[dict] = Field(
+        default=None,
+        sa_column=Column(
+            JSON(none_as_null=True),
+            nullable=True,
+            comment="Detected language of each text field",
+        ),
+    )
     categories: List[str] = Field(
         sa_column=Column(
             JSON,
@@ -97,6 +113,27 @@ class Article(SQLModel, table=True):
         sa_column=Column(TIMESTAMP(timezone=True), nullable=True)
     )
 
+    embedded_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=True, index=True),
+    )
+
+    # SimHash of the scraped content, see duplicate_detection_service
+    content_fingerprint: Optional[int] = Field(
+        default=None, sa_column=Column(BigInteger, nullable=True)
+    )
+    # Set on near-duplicates, which are not summarized, translated or
+    # embedded
+    duplicate_of_id: Optional[uuid.UUID] = Field(
+        default=None,
+        sa_column=Column(
+            Uuid,
+            ForeignKey("articles.id", ondelete="SET NULL"),
+            nullable=True,
+            index=True,
+        ),
+    )
+
     # Contains a note or error message related to the article
     note: Optional[str] = Field(default=None, nullable=True)
 
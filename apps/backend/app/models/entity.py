@@ -2,7 +2,7 @@ import uuid
 from enum import Enum
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Column, Text
+from sqlalchemy import Column, Text, text
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -23,7 +23,7 @@ class ArticleEntity(SQLModel, table=True):
     # Attributes
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     entity_type: EntityType = Field(sa_column=Column(Text, nullable=False))
-    value: str = Field(max_length=255, nullable=False)
+    value: str = Field(max_length=255, nullable=False, index=True)
 
     value_en: Optional[str] = Field(default=None, max_length=255)
     value_de: Optional[str] = Field(default=None, max_length=255)
@@ -34,3 +34,22 @@ class ArticleEntity(SQLModel, table=True):
 
     # Relationship
     article: "Article" = Relationship(back_populates="entities")
+
+
+class EntityTranslation(SQLModel, table=True):
+    """
+    Translations of a distinct entity value, shared by all entities with
+    that value.
+    """
+
+    __tablename__ = "entity_translations"
+
+    id: uuid.UUID = Field(
+        default_factory=uuid.uuid4,
+        primary_key=True,
+        sa_column_kwargs={"server_default": text("gen_random_uuid()")},
+    )
+    value: str = Field(max_length=255, nullable=False, unique=True)
+
+    value_en: Optional[str] = Field(default=None, max_length=255)
+    value_de: Optional[str] = Field(default=None, max_length=255)
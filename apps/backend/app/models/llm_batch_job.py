@@ -0,0 +1,63 @@
+import uuid
+from datetime import datetime, timezone
+from enum import Enum
+from typing import List, Optional
+
+from sqlalchemy import JSON, TIMESTAMP, Column, Text
+from sqlmodel import Field, SQLModel
+
+
+class LLMBatchPurpose(Enum):
+    ARTICLE_SUMMARY = "article_summary"
+    ARTICLE_TRANSLATION = "article_translation"
+    ENTITY_TRANSLATION = "entity_translation"
+
+
+class LLMBatchJobStatus(Enum):
+    SUBMITTED = "submitted"
+    APPLYING = "applying"
+    APPLIED = "applied"
+    FAILED = "failed"
+
+
+class LLMBatchJob(SQLModel, table=True):
+    """
+    A batch submitted to the LLM provider's batch API, kept until its
+    results are applied so that they survive process restarts.
+    """
+
+    __tablename__ = "llm_batch_jobs"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    batch_id: str = Field(
+        max_length=255, nullable=False, unique=True, index=True
+    )
+    purpose: LLMBatchPurpose = Field(nullable=False)
+    status: LLMBatchJobStatus = Field(
+        default=LLMBatchJobStatus.SUBMITTED, nullable=False, index=True
+    )
+
+    # custom_id of every request of the batch
+    custom_ids: List[str] = Field(
+        default_factory=list, sa_column=Column(JSON, nullable=False)
+    )
+    request_count: int = Field(default=0, nullable=False)
+
+    created_at: datetime = Field(
+        sa_column=Column(
+            TIMESTAMP(timezone=True),
+            nullable=False,
+            default=lambda: datetime.now(timezone.utc),
+        )
+    )
+    updated_at: datetime = Field(
+        sa_column=Column(
+            TIMESTAMP(timezone=True),
+            nullable=False,
+            default=lambda: datetime.now(timezone.utc),
+        )
+    )
+
+    error: Optional[str] = Field(
+        default=None, sa_column=Column(Text, nullable=True)
+    )
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import TIMESTAMP, Column, Text
+from sqlalchemy import TIMESTAMP, Column, Text, UniqueConstraint
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -14,6 +14,13 @@ if TYPE_CHECKING:
 
 class Match(SQLModel, table=True):
     __tablename__ = "matches"
+    __table_args__ = (
+        UniqueConstraint(
+            "search_profile_id",
+            "article_id",
+            name="uq_matches_search_profile_id_article_id",
+        ),
+    )
     # Attributes
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     article_id: uuid.UUID = Field(
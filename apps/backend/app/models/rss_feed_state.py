@@ -0,0 +1,31 @@
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import TIMESTAMP, Column
+from sqlmodel import Field, SQLModel
+
+
+class RSSFeedState(SQLModel, table=True):
+    """
+    Validators of the last download of an RSS feed, sent with the next
+    request so that unchanged feeds are answered with 304 Not Modified.
+    """
+
+    __tablename__ = "rss_feed_states"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    feed_url: str = Field(
+        max_length=2048, nullable=False, unique=True, index=True
+    )
+    etag: Optional[str] = Field(default=None, max_length=1024, nullable=True)
+    last_modified: Optional[str] = Field(
+        default=None, max_length=255, nullable=True
+    )
+    fetched_at: datetime = Field(
+        sa_column=Column(
+            TIMESTAMP(timezone=True),
+            nullable=False,
+            default=lambda: datetime.now(timezone.utc),
+        )
+    )
@@ -1,23 +1,51 @@
 # flake8: noqa: E501
 import json
 import uuid
-from datetime import date, datetime, timedelta
-from typing import List, Optional, Sequence
+from datetime import date, datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
-from sqlalchemy import or_, select
+from sqlalchemy import (
+    String,
+    any_,
+    bindparam,
+    func,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Select
 
+from app.core.bloom_filter import BloomFilter
+from app.core.config import get_configs
 from app.core.db import async_session
 from app.core.logger import get_logger
 from app.models.article import Article, ArticleStatus
 from app.models.match import Match
+from app.repositories.bulk_update import update_from_values
 from app.repositories.matching_run_repository import MatchingRunRepository
 from app.repositories.subscription_repository import SubscriptionRepository
 
+configs = get_configs()
 logger = get_logger(__name__)
 
+# Known article URLs of this process, see _get_known_urls
+_known_urls: Optional[BloomFilter] = None
+
+TRANSLATION_FIELDS = (
+    "title_en",
+    "title_de",
+    "content_en",
+    "content_de",
+    "summary_en",
+    "summary_de",
+)
+
 
 class ArticleRepository:
     """Repository for managing Article entities in the database."""
@@ -36,6 +64,21 @@ class ArticleRepository:
             ).scalar_one_or_none()
             return article
 
+    @staticmethod
+    async def get_articles_by_ids(
+        article_ids: Sequence[UUID],
+    ) -> List[Article]:
+        """
+        Retrieve the Articles with the given UUIDs in one query.
+        Unknown IDs are skipped.
+        """
+        if not article_ids:
+            return []
+
+        async with async_session() as session:
+            statement = select(Article).where(Article.id.in_(article_ids))
+            return list((await session.execute(statement)).scalars().all())
+
     @staticmethod
     async def update_article(article: Article) -> Optional[Article]:
         """
@@ -58,6 +101,26 @@ class ArticleRepository:
             await session.refresh(existing_article)
             return existing_article
 
+    @staticmethod
+    async def mark_articles_embedded(
+        article_ids: Sequence[UUID], embedded_at: datetime
+    ) -> int:
+        """
+        Set the status of the given articles to EMBEDDED with one UPDATE.
+        Returns the number of updated rows.
+        """
+        if not article_ids:
+            return 0
+
+        async with async_session() as session:
+            result = await session.execute(
+                update(Article)
+                .where(Article.id.in_(article_ids))
+                .values(status=ArticleStatus.EMBEDDED, embedded_at=embedded_at)
+            )
+            await session.commit()
+            return result.rowcount
+
     @staticmethod
     async def update_article_summary(
         article_id: UUID, article_summary: str
@@ -106,31 +169,119 @@ class ArticleRepository:
                 await session.rollback()
                 return
 
+    @staticmethod
+    async def _get_known_urls() -> BloomFilter:
+        """
+        Get the Bloom filter of known article URLs, loading the URLs of
+        recently crawled articles on first use.
+        """
+        global _known_urls
+        if _known_urls is None:
+            _known_urls = BloomFilter(
+                configs.ARTICLE_URL_FILTER_CAPACITY,
+                configs.ARTICLE_URL_FILTER_ERROR_RATE,
+            )
+            since = datetime.now(timezone.utc) - timedelta(
+                days=configs.ARTICLE_URL_FILTER_DAYS
+            )
+            async with async_session() as session:
+                urls = await session.stream_scalars(
+                    select(Article.url).where(Article.crawled_at >= since)
+                )
+                async for url in urls:
+                    _known_urls.add(url)
+            logger.info(f"Loaded {_known_urls.count} known article URLs")
+        return _known_urls
+
     @staticmethod
     async def create_articles_batch(
         articles: list[Article], batch_size: int = 50, logger=logger
     ):
+        """
+        Insert new articles, skipping those whose URL is already stored.
+
+        URLs the Bloom filter of known URLs may contain are checked with
+        one SELECT ... WHERE url = ANY(...) per batch; the remaining
+        articles are inserted with INSERT ... ON CONFLICT (url) DO NOTHING,
+        which also skips URLs other processes inserted since the filter
+        was loaded.
+        """
+        known_urls = await ArticleRepository._get_known_urls()
+        columns = Article.__table__.columns.keys()
         successful = []
+        skipped = 0
         async with async_session() as session:
             for i in range(0, len(articles), batch_size):
-                batch = articles[i : i + batch_size]
+                batch = {}
+                for article in articles[i : i + batch_size]:
+                    batch.setdefault(article.url, article)
+
+                maybe_known = [url for url in batch if url in known_urls]
+                if maybe_known:
+                    existing = await session.scalars(
+                        select(Article.url).where(
+                            Article.url
+                            == any_(
+                                bindparam(
+                                    "urls",
+                                    maybe_known,
+                                    type_=ARRAY(String),
+                                )
+                            )
+                        )
+                    )
+                    for url in existing:
+                        del batch[url]
+                        skipped += 1
+                if not batch:
+                    continue
+
+                rows = [
+                    {
+                        column: getattr(article, column)
+                        for column in columns
+                        if getattr(article, column) is not None
+                    }
+                    for article in batch.values()
+                ]
                 try:
-                    session.add_all(batch)
+                    inserted = set(
+                        await session.scalars(
+                            insert(Article)
+                            .on_conflict_do_nothing(index_elements=["url"])
+                            .returning(Article.url),
+                            rows,
+                        )
+                    )
                     await session.commit()
-                    successful.extend(batch)
-                except Exception:
+                except Exception as e:
                     await session.rollback()
+                    logger.warning(
+                        f"Batch insert failed, inserting one by one: {e}"
+                    )
 
                     # Try inserting articles one-by-one
-                    for article in batch:
+                    inserted = set()
+                    for article in batch.values():
                         created_article = (
                             await ArticleRepository.create_article(
                                 article, logger=logger
                             )
                         )
                         if created_article:
-                            successful.append(created_article)
-            logger.info(f"Inserted {len(successful)} articles successfully.")
+                            inserted.add(created_article.url)
+
+                known_urls.update(batch)
+                skipped += len(batch) - len(inserted)
+                successful.extend(
+                    article
+                    for url, article in batch.items()
+                    if url in inserted
+                )
+            logger.info(
+                f"Inserted {len(successful)} articles successfully, "
+                f"skipped {skipped} known URLs."
+            )
         return successful
 
     @staticmethod
@@ -165,6 +316,7 @@ class ArticleRepository:
                 select(Article)
                 .where(
                     Article.status == "SCRAPED",
+                    Article.duplicate_of_id.is_(None),
                     Article.scraped_at >= datetime_start,
                     or_(Article.summary.is_(None), Article.summary == ""),
                 )
@@ -192,6 +344,7 @@ class ArticleRepository:
                     Article.summary.isnot(None),
                     Article.summary != "",
                     Article.status == "TRANSLATED",
+                    Article.duplicate_of_id.is_(None),
                     Article.scraped_at >= date_start,
                 )
                 .limit(limit)
@@ -203,6 +356,277 @@ class ArticleRepository:
 
             return summarized_articles
 
+    @staticmethod
+    async def list_embedded_article_subscriptions(
+        since: Optional[datetime] = None,
+    ) -> Dict[UUID, UUID]:
+        """
+        Map the IDs of embedded articles to their subscription IDs,
+        optionally only for those embedded at or after `since`.
+        """
+        async with async_session() as session:
+            statement = select(Article.id, Article.subscription_id).where(
+                Article.status == ArticleStatus.EMBEDDED
+            )
+            if since is not None:
+                statement = statement.where(Article.embedded_at >= since)
+
+            return dict((await session.execute(statement)).all())
+
+    @staticmethod
+    async def _iter_keyset(
+        statement: Select, page_size: int
+    ) -> AsyncIterator[List[Article]]:
+        """
+        Iterate over the articles selected by ``statement`` in pages keyed
+        by (scraped_at, id).
+
+        Each page continues after the last row of the previous one, so
+        progress does not depend on the articles changing their status.
+        """
+        last_key = None
+        while True:
+            paged = statement
+            if last_key is not None:
+                paged = paged.where(
+                    tuple_(Article.scraped_at, Article.id) > tuple_(*last_key)
+                )
+            paged = paged.order_by(Article.scraped_at, Article.id).limit(
+                page_size
+            )
+            async with async_session() as session:
+                page: List[Article] = list(
+                    (await session.execute(paged)).scalars().all()
+                )
+
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            last_key = (page[-1].scraped_at, page[-1].id)
+
+    @staticmethod
+    async def iter_articles_with_summary(
+        page_size: int = 100,
+        datetime_start: Optional[datetime] = None,
+        datetime_end: Optional[datetime] = None,
+    ) -> AsyncIterator[List[Article]]:
+        """
+        Iterate over translated articles with a summary, scraped within
+        [datetime_start, datetime_end], in pages keyed by (scraped_at, id).
+        Near-duplicates are skipped.
+        """
+        statement = select(Article).where(
+            Article.summary.isnot(None),
+            Article.summary != "",
+            Article.status == "TRANSLATED",
+            Article.duplicate_of_id.is_(None),
+        )
+        if datetime_start is not None:
+            statement = statement.where(Article.scraped_at >= datetime_start)
+        if datetime_end is not None:
+            statement = statement.where(Article.scraped_at <= datetime_end)
+        async for page in ArticleRepository._iter_keyset(statement, page_size):
+            yield page
+
+    @staticmethod
+    async def iter_articles_without_summary(
+        page_size: int = 100,
+        datetime_start: Optional[datetime] = None,
+        datetime_end: Optional[datetime] = None,
+    ) -> AsyncIterator[List[Article]]:
+        """
+        Iterate over scraped articles without a summary, scraped within
+        [datetime_start, datetime_end], in pages keyed by (scraped_at, id).
+        Near-duplicates are skipped.
+
+        Pages are read ahead of the articles being summarized, so paging
+        must not depend on their status changing.
+        """
+        statement = select(Article).where(
+            Article.status == "SCRAPED",
+            Article.duplicate_of_id.is_(None),
+            or_(Article.summary.is_(None), Article.summary == ""),
+        )
+        if datetime_start is not None:
+            statement = statement.where(Article.scraped_at >= datetime_start)
+        if datetime_end is not None:
+            statement = statement.where(Article.scraped_at <= datetime_end)
+        async for page in ArticleRepository._iter_keyset(statement, page_size):
+            yield page
+
+    @staticmethod
+    async def iter_articles_without_field_languages(
+        page_size: int = 500,
+        datetime_start: Optional[datetime] = None,
+    ) -> AsyncIterator[List[Article]]:
+        """
+        Iterate over scraped articles whose languages have not been
+        detected yet, in pages keyed by (scraped_at, id).
+        """
+        statement = select(Article).where(
+            Article.scraped_at.is_not(None),
+            Article.field_languages.is_(None),
+        )
+        if datetime_start is not None:
+            statement = statement.where(Article.scraped_at >= datetime_start)
+        async for page in ArticleRepository._iter_keyset(statement, page_size):
+            yield page
+
+    @staticmethod
+    async def update_article_languages(
+        session: AsyncSession,
+        languages: Dict[UUID, Tuple[Optional[str], Dict[str, Optional[str]]]],
+    ) -> None:
+        """
+        Set the language and the per-field languages of several articles
+        with one executemany UPDATE. The caller commits the session.
+        """
+        if not languages:
+            return
+        await session.execute(
+            update(Article),
+            [
+                {
+                    "id": article_id,
+                    "language": language,
+                    "field_languages": field_languages,
+                }
+                for article_id, (
+                    language,
+                    field_languages,
+                ) in languages.items()
+            ],
+        )
+
+    @staticmethod
+    async def iter_articles_without_fingerprint(
+        page_size: int = 500,
+        datetime_start: Optional[datetime] = None,
+    ) -> AsyncIterator[List[Article]]:
+        """
+        Iterate over scraped articles waiting for a summary that have not
+        been checked for duplicates yet, in pages keyed by (scraped_at, id).
+        """
+        statement = select(Article).where(
+            Article.status == "SCRAPED",
+            Article.content_fingerprint.is_(None),
+            Article.duplicate_of_id.is_(None),
+        )
+        if datetime_start is not None:
+            statement = statement.where(Article.scraped_at >= datetime_start)
+        async for page in ArticleRepository._iter_keyset(statement, page_size):
+            yield page
+
+    @staticmethod
+    async def list_duplicate_candidates(
+        since: datetime,
+    ) -> List[Tuple[UUID, UUID, str, Optional[str], Optional[int], int]]:
+        """
+        List the ID, subscription ID, URL, canonical URL, content
+        fingerprint and content length of the articles scraped since
+        ``since`` that later articles may duplicate: those already checked
+        for duplicates, or past that stage, that are neither duplicates nor
+        failed.
+        """
+        async with async_session() as session:
+            statement = (
+                select(
+                    Article.id,
+                    Article.subscription_id,
+                    Article.url,
+                    Article.canonical_url,
+                    Article.content_fingerprint,
+                    func.coalesce(func.length(Article.content), 0),
+                )
+                .where(
+                    Article.scraped_at >= since,
+                    Article.status != "ERROR",
+                    Article.duplicate_of_id.is_(None),
+                    or_(
+                        Article.content_fingerprint.is_not(None),
+                        Article.status != "SCRAPED",
+                    ),
+                )
+                .order_by(Article.scraped_at, Article.id)
+            )
+            return [tuple(row) for row in await session.execute(statement)]
+
+    @staticmethod
+    async def update_article_fingerprints(
+        session: AsyncSession,
+        fingerprints: Dict[UUID, Tuple[int, Optional[UUID]]],
+    ) -> None:
+        """
+        Set the content fingerprint of several articles, and mark those
+        given the ID of the article they duplicate, with one executemany
+        UPDATE. The caller commits the session.
+        """
+        if not fingerprints:
+            return
+        await session.execute(
+            update(Article),
+            [
+                {
+                    "id": article_id,
+                    "content_fingerprint": fingerprint,
+                    "duplicate_of_id": duplicate_of_id,
+                    **(
+                        {
+                            "note": f"Near-duplicate of article {duplicate_of_id}"
+                        }
+                        if duplicate_of_id
+                        else {}
+                    ),
+                }
+                for article_id, (
+                    fingerprint,
+                    duplicate_of_id,
+                ) in fingerprints.items()
+            ],
+        )
+
+    @staticmethod
+    async def update_article_summaries(
+        session: AsyncSession, summaries: Dict[UUID, str]
+    ) -> None:
+        """
+        Set the summary of several articles and mark them SUMMARIZED with
+        one executemany UPDATE. The caller commits the session.
+        """
+        if not summaries:
+            return
+        await session.execute(
+            update(Article),
+            [
+                {
+                    "id": article_id,
+                    "summary": summary,
+                    "status": ArticleStatus.SUMMARIZED,
+                }
+                for article_id, summary in summaries.items()
+            ],
+        )
+
+    @staticmethod
+    async def mark_articles_error(
+        session: AsyncSession, notes: Dict[UUID, str]
+    ) -> None:
+        """
+        Mark several articles as ERROR with a note each, in one
+        executemany UPDATE. The caller commits the session.
+        """
+        if not notes:
+            return
+        await session.execute(
+            update(Article),
+            [
+                {"id": article_id, "status": ArticleStatus.ERROR, "note": note}
+                for article_id, note in notes.items()
+            ],
+        )
+
     @staticmethod
     async def get_matched_articles_for_profile_for_create_pdf(
         search_profile_id: uuid.UUID,
@@ -312,30 +736,35 @@ class ArticleRepository:
             date.today(), datetime.min.time()
         ),
         datetime_end: datetime = datetime.now(),
+        include_content: bool = True,
     ) -> Sequence[Article]:
         """
         Returns articles that are missing at least one translation
         (title_en, title_de, content_en, content_de, summary_en, summary_de).
+        Without ``include_content``, missing content translations are
+        ignored, as content is translated on demand. Near-duplicates are
+        skipped.
         """
+        fields = [
+            field
+            for field in TRANSLATION_FIELDS
+            if include_content or not field.startswith("content_")
+        ]
         async with async_session() as session:
             statement = (
                 select(Article)
                 .where(
                     Article.status == "SUMMARIZED",
+                    Article.duplicate_of_id.is_(None),
                     Article.scraped_at >= datetime_start,
                     or_(
-                        Article.title_en.is_(None),
-                        Article.title_en == "",
-                        Article.title_de.is_(None),
-                        Article.title_de == "",
-                        Article.content_en.is_(None),
-                        Article.content_en == "",
-                        Article.content_de.is_(None),
-                        Article.content_de == "",
-                        Article.summary_en.is_(None),
-                        Article.summary_en == "",
-                        Article.summary_de.is_(None),
-                        Article.summary_de == "",
+                        *(
+                            or_(
+                                getattr(Article, field).is_(None),
+                                getattr(Article, field) == "",
+                            )
+                            for field in fields
+                        )
                     ),
                 )
                 .limit(limit)
@@ -346,6 +775,38 @@ class ArticleRepository:
 
             return articles_missing_translations
 
+    @staticmethod
+    async def get_matched_articles_without_content_translations(
+        matched_since: datetime,
+        limit: int = 50,
+    ) -> Sequence[Article]:
+        """
+        Returns articles matched to a search profile since
+        ``matched_since`` whose content is not translated yet.
+        """
+        async with async_session() as session:
+            statement = (
+                select(Article)
+                .where(
+                    Article.id.in_(
+                        select(Match.article_id).where(
+                            Match.matched_at >= matched_since
+                        )
+                    ),
+                    Article.duplicate_of_id.is_(None),
+                    Article.content.is_not(None),
+                    Article.content != "",
+                    or_(
+                        Article.content_en.is_(None),
+                        Article.content_en == "",
+                        Article.content_de.is_(None),
+                        Article.content_de == "",
+                    ),
+                )
+                .limit(limit)
+            )
+            return (await session.execute(statement)).scalars().all()
+
     @staticmethod
     async def update_translations(
         article_id: UUID,
@@ -384,6 +845,53 @@ class ArticleRepository:
             await session.refresh(existing_article)
             return existing_article
 
+    @staticmethod
+    async def update_article_translations(
+        session: AsyncSession,
+        translations: Dict[UUID, Dict[str, str]],
+        status: Optional[ArticleStatus] = None,
+    ) -> int:
+        """
+        Set the translation fields (e.g. ``title_en``) of several articles
+        with UPDATE ... FROM (VALUES ...), keeping fields missing from a
+        row. The caller commits the session.
+
+        Returns:
+            int: Number of updated articles.
+        """
+        if not translations:
+            return 0
+        extra_values = {"status": status} if status is not None else {}
+        updated = 0
+        for statement in update_from_values(
+            Article, translations, TRANSLATION_FIELDS, **extra_values
+        ):
+            updated += (await session.execute(statement)).rowcount
+        return updated
+
+    @staticmethod
+    async def update_translations_many(
+        translations: Dict[UUID, Dict[str, str]],
+    ) -> int:
+        """
+        Update the translation fields of many articles in one transaction
+        and mark them as translated.
+
+        Args:
+            translations: Translated fields (e.g. ``title_en``) by article ID
+
+        Returns:
+            int: Number of updated articles.
+        """
+        if not translations:
+            return 0
+        async with async_session() as session:
+            updated = await ArticleRepository.update_article_translations(
+                session, translations, status=ArticleStatus.TRANSLATED
+            )
+            await session.commit()
+        return updated
+
     @staticmethod
     # get subscription id for an article
     async def get_subscription_id_for_article(
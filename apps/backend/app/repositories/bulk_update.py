@@ -0,0 +1,61 @@
+from typing import Dict, List, Sequence
+from uuid import UUID
+
+from sqlalchemy import column, func, update, values
+from sqlalchemy.sql.dml import Update
+
+# Rows per statement, keeps the number of bind parameters well below
+# the Postgres limit
+ROWS_PER_STATEMENT = 1000
+
+
+def update_from_values(
+    model,
+    rows: Dict[UUID, Dict[str, str]],
+    columns: Sequence[str],
+    **extra_values,
+) -> List[Update]:
+    """
+    Build ``UPDATE ... FROM (VALUES ...)`` statements setting the given
+    columns of many rows of a table at once.
+
+    Args:
+        model: Table model with an ``id`` primary key
+        rows: New column values of each row by ID. Columns missing from a
+            row (or None) keep their current value.
+        columns: Columns that may be updated
+        extra_values: Values set on every updated row
+
+    Returns:
+        list: One statement per ``ROWS_PER_STATEMENT`` rows, to execute in
+        the same transaction. Rows that no longer exist are skipped.
+    """
+    table = model.__table__
+    items = list(rows.items())
+    statements = []
+    for start in range(0, len(items), ROWS_PER_STATEMENT):
+        new_values = values(
+            column("id", table.c.id.type),
+            *(column(name, table.c[name].type) for name in columns),
+            name="new_values",
+        ).data(
+            [
+                (row_id, *(fields.get(name) for name in columns))
+                for row_id, fields in items[start : start + ROWS_PER_STATEMENT]
+            ]
+        )
+        statements.append(
+            update(model)
+            .where(model.id == new_values.c.id)
+            .values(
+                **{
+                    name: func.coalesce(
+                        new_values.c[name], getattr(model, name)
+                    )
+                    for name in columns
+                },
+                **extra_values,
+            )
+            .execution_options(synchronize_session=False)
+        )
+    return statements
@@ -1,11 +1,17 @@
-from typing import List, Optional
+import uuid
+from typing import Dict, List, Optional
 from uuid import UUID
 
-from sqlalchemy import and_, or_, select
+from sqlalchemy import and_, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import async_session
 from app.core.languages import Language
 from app.models.entity import ArticleEntity, EntityType
+from app.repositories.bulk_update import update_from_values
+
+# Length of the entities.value column
+ENTITY_VALUE_MAX_LENGTH = 255
 
 
 class ArticleEntityRepository:
@@ -124,6 +130,28 @@ class ArticleEntityRepository:
             session.add(entity)
             await session.commit()
 
+    @staticmethod
+    async def update_translations_many(
+        translations: Dict[UUID, Dict[str, str]],
+    ) -> int:
+        """
+        Update ``value_en`` and ``value_de`` of many entities in one
+        transaction.
+
+        Returns:
+            int: Number of updated entities.
+        """
+        if not translations:
+            return 0
+        updated = 0
+        async with async_session() as session:
+            for statement in update_from_values(
+                ArticleEntity, translations, ("value_en", "value_de")
+            ):
+                updated += (await session.execute(statement)).rowcount
+            await session.commit()
+        return updated
+
     @staticmethod
     async def add_entities(
         article_id: UUID,
@@ -193,3 +221,32 @@ class ArticleEntityRepository:
 
             session.add_all(entities)
             await session.commit()
+
+    @staticmethod
+    async def add_entities_many(
+        session: AsyncSession,
+        entities_by_article: Dict[UUID, Dict[EntityType, List[str]]],
+    ) -> int:
+        """
+        Insert the entities of several articles with one multi-row
+        INSERT. The caller commits the session. Empty values are skipped
+        and values longer than the column are truncated.
+
+        Returns:
+            int: Number of inserted entities.
+        """
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "article_id": article_id,
+                "entity_type": entity_type.value,
+                "value": value.strip()[:ENTITY_VALUE_MAX_LENGTH],
+            }
+            for article_id, entities in entities_by_article.items()
+            for entity_type, values in entities.items()
+            for value in values or []
+            if isinstance(value, str) and value.strip()
+        ]
+        if rows:
+            await session.execute(insert(ArticleEntity), rows)
+        return len(rows)
@@ -0,0 +1,133 @@
+from typing import Dict, List
+from uuid import UUID
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.db import async_session
+from app.models.entity import ArticleEntity, EntityTranslation, EntityType
+from app.repositories.bulk_update import update_from_values
+
+# Only these entity types are translated
+TRANSLATED_ENTITY_TYPES = [EntityType.INDUSTRY.value, EntityType.EVENT.value]
+
+
+class EntityTranslationRepository:
+    """
+    This repository manages the entity translation dictionary: one row
+    per distinct industry or event value with its translations, which
+    entities copy instead of being translated one by one.
+    """
+
+    @staticmethod
+    async def add_missing_values() -> int:
+        """
+        Add the values of industry and event entities that are not in the
+        dictionary yet, keeping any translation those entities already
+        have.
+
+        Returns:
+            int: Number of added values.
+        """
+        missing = (
+            select(
+                ArticleEntity.value,
+                func.max(func.nullif(ArticleEntity.value_en, "")),
+                func.max(func.nullif(ArticleEntity.value_de, "")),
+            )
+            .where(
+                ArticleEntity.entity_type.in_(TRANSLATED_ENTITY_TYPES),
+                ~select(EntityTranslation.id)
+                .where(EntityTranslation.value == ArticleEntity.value)
+                .exists(),
+            )
+            .group_by(ArticleEntity.value)
+        )
+        statement = (
+            insert(EntityTranslation)
+            .from_select(
+                ["value", "value_en", "value_de"],
+                missing,
+                include_defaults=False,
+            )
+            .on_conflict_do_nothing(index_elements=["value"])
+        )
+        async with async_session() as session:
+            result = await session.execute(statement)
+            await session.commit()
+            return result.rowcount
+
+    @staticmethod
+    async def get_values_without_translations(
+        limit: int = 100,
+    ) -> List[EntityTranslation]:
+        async with async_session() as session:
+            result = await session.execute(
+                select(EntityTranslation)
+                .where(
+                    or_(
+                        EntityTranslation.value_en.is_(None),
+                        EntityTranslation.value_en == "",
+                        EntityTranslation.value_de.is_(None),
+                        EntityTranslation.value_de == "",
+                    )
+                )
+                .limit(limit)
+            )
+            return result.scalars().all()
+
+    @staticmethod
+    async def update_translations_many(
+        translations: Dict[UUID, Dict[str, str]],
+    ) -> int:
+        """
+        Update ``value_en`` and ``value_de`` of many dictionary values in
+        one transaction.
+
+        Returns:
+            int: Number of updated values.
+        """
+        if not translations:
+            return 0
+        updated = 0
+        async with async_session() as session:
+            for statement in update_from_values(
+                EntityTranslation, translations, ("value_en", "value_de")
+            ):
+                updated += (await session.execute(statement)).rowcount
+            await session.commit()
+        return updated
+
+    @staticmethod
+    async def backfill_entities() -> int:
+        """
+        Copy the translations of the dictionary to every untranslated
+        entity with the same value, with one UPDATE ... FROM.
+
+        Returns:
+            int: Number of updated entities.
+        """
+        statement = (
+            update(ArticleEntity)
+            .where(
+                ArticleEntity.value == EntityTranslation.value,
+                ArticleEntity.entity_type.in_(TRANSLATED_ENTITY_TYPES),
+                or_(
+                    ArticleEntity.value_en.is_(None),
+                    ArticleEntity.value_en == "",
+                    ArticleEntity.value_de.is_(None),
+                    ArticleEntity.value_de == "",
+                ),
+                func.coalesce(EntityTranslation.value_en, "") != "",
+                func.coalesce(EntityTranslation.value_de, "") != "",
+            )
+            .values(
+                value_en=EntityTranslation.value_en,
+                value_de=EntityTranslation.value_de,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        async with async_session() as session:
+            result = await session.execute(statement)
+            await session.commit()
+            return result.rowcount
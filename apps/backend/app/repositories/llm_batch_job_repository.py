@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence, Set
+
+from sqlalchemy import and_, or_, select, update
+
+from app.core.db import async_session
+from app.models.llm_batch_job import (
+    LLMBatchJob,
+    LLMBatchJobStatus,
+    LLMBatchPurpose,
+)
+
+
+class LLMBatchJobRepository:
+    """
+    Repository for managing batch API jobs in the database.
+    """
+
+    @staticmethod
+    def _unapplied(stale_after: timedelta):
+        """
+        Jobs that still have to be applied: submitted ones, and ones whose
+        application started ``stale_after`` ago without finishing.
+        """
+        stale_before = datetime.now(timezone.utc) - stale_after
+        return or_(
+            LLMBatchJob.status == LLMBatchJobStatus.SUBMITTED,
+            and_(
+                LLMBatchJob.status == LLMBatchJobStatus.APPLYING,
+                LLMBatchJob.updated_at < stale_before,
+            ),
+        )
+
+    @staticmethod
+    async def create_job(
+        batch_id: str, purpose: LLMBatchPurpose, custom_ids: List[str]
+    ) -> LLMBatchJob:
+        """
+        Record a submitted batch.
+        """
+        async with async_session() as session:
+            job = LLMBatchJob(
+                batch_id=batch_id,
+                purpose=purpose,
+                custom_ids=custom_ids,
+                request_count=len(custom_ids),
+            )
+            session.add(job)
+            await session.commit()
+            await session.refresh(job)
+            return job
+
+    @staticmethod
+    async def get_job(batch_id: str) -> Optional[LLMBatchJob]:
+        async with async_session() as session:
+            result = await session.execute(
+                select(LLMBatchJob).where(LLMBatchJob.batch_id == batch_id)
+            )
+            return result.scalar_one_or_none()
+
+    @staticmethod
+    async def get_unapplied_jobs(
+        stale_after: timedelta,
+    ) -> Sequence[LLMBatchJob]:
+        """
+        Returns the jobs whose results have not been applied yet, oldest
+        first.
+        """
+        async with async_session() as session:
+            result = await session.execute(
+                select(LLMBatchJob)
+                .where(LLMBatchJobRepository._unapplied(stale_after))
+                .order_by(LLMBatchJob.created_at)
+            )
+            return result.scalars().all()
+
+    @staticmethod
+    async def claim_job(batch_id: str, stale_after: timedelta) -> bool:
+        """
+        Mark a job as being applied, unless another process already does.
+
+        Returns:
+            bool: True if the caller may apply the job.
+        """
+        async with async_session() as session:
+            result = await session.execute(
+                update(LLMBatchJob)
+                .where(
+                    LLMBatchJob.batch_id == batch_id,
+                    LLMBatchJobRepository._unapplied(stale_after),
+                )
+                .values(
+                    status=LLMBatchJobStatus.APPLYING,
+                    updated_at=datetime.now(timezone.utc),
+                )
+                .returning(LLMBatchJob.id)
+            )
+            claimed = result.first() is not None
+            await session.commit()
+            return claimed
+
+    @staticmethod
+    async def set_status(
+        batch_id: str,
+        status: LLMBatchJobStatus,
+        error: Optional[str] = None,
+    ) -> None:
+        async with async_session() as session:
+            await session.execute(
+                update(LLMBatchJob)
+                .where(LLMBatchJob.batch_id == batch_id)
+                .values(
+                    status=status,
+                    error=error,
+                    updated_at=datetime.now(timezone.utc),
+                )
+            )
+            await session.commit()
+
+    @staticmethod
+    async def get_pending_custom_ids(purpose: LLMBatchPurpose) -> Set[str]:
+        """
+        Returns the custom_ids of requests whose batch has been submitted
+        but not applied yet, so that they are not submitted twice.
+        """
+        async with async_session() as session:
+            result = await session.execute(
+                select(LLMBatchJob.custom_ids).where(
+                    LLMBatchJob.purpose == purpose,
+                    LLMBatchJob.status.in_(
+                        [
+                            LLMBatchJobStatus.SUBMITTED,
+                            LLMBatchJobStatus.APPLYING,
+                        ]
+                    ),
+                )
+            )
+            pending = set()
+            for custom_ids in result.scalars():
+                pending.update(custom_ids)
+            return pending
@@ -1,8 +1,9 @@
-from datetime import datetime
-from typing import List
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional, Sequence
 from uuid import UUID
 
 from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -33,13 +34,47 @@ class MatchRepository:
     @staticmethod
     async def get_matches_by_search_profile(
         search_profile_id: UUID,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        subscription_ids: Optional[Sequence[UUID]] = None,
+        topic_ids: Optional[Sequence[UUID]] = None,
     ) -> List[Match]:
+        """
+        Get the matches of a search profile, optionally restricted to
+        articles published between ``start_date`` and ``end_date``
+        (inclusive, UTC), articles of the given subscriptions and matches
+        of the given topics.
+        """
         async with async_session() as session:
             query = (
                 select(Match)
                 .options(selectinload(Match.article))
                 .where(Match.search_profile_id == search_profile_id)
             )
+            if (
+                start_date is not None
+                or end_date is not None
+                or subscription_ids
+            ):
+                query = query.join(Article, Article.id == Match.article_id)
+            if start_date is not None:
+                query = query.where(
+                    Article.published_at
+                    >= datetime.combine(start_date, time.min, timezone.utc)
+                )
+            if end_date is not None:
+                query = query.where(
+                    Article.published_at
+                    < datetime.combine(
+                        end_date + timedelta(days=1), time.min, timezone.utc
+                    )
+                )
+            if subscription_ids:
+                query = query.where(
+                    Article.subscription_id.in_(subscription_ids)
+                )
+            if topic_ids:
+                query = query.where(Match.topic_id.in_(topic_ids))
             matches = (await session.execute(query)).scalars().all()
 
             return matches
@@ -127,6 +162,30 @@ class MatchRepository:
             await session.rollback()
             return None
 
+    @staticmethod
+    async def upsert_matches(
+        session: AsyncSession, rows: List[dict], chunk_size: int = 1000
+    ) -> List[UUID]:
+        """
+        Insert many matches with one statement per chunk, skipping rows
+        whose (search_profile_id, article_id) pair already exists.
+        Returns the article IDs of the rows that were actually inserted.
+        """
+        inserted: List[UUID] = []
+        for i in range(0, len(rows), chunk_size):
+            stmt = (
+                pg_insert(Match)
+                .values(rows[i : i + chunk_size])
+                .on_conflict_do_nothing(
+                    index_elements=["search_profile_id", "article_id"]
+                )
+                .returning(Match.article_id)
+            )
+            result = await session.execute(stmt)
+            inserted.extend(result.scalars().all())
+        await session.commit()
+        return inserted
+
     @staticmethod
     async def delete_for_search_profile(
         session: AsyncSession, profile_id: UUID
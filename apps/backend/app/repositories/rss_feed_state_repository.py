@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.db import async_session
+from app.models.rss_feed_state import RSSFeedState
+
+
+class RSSFeedStateRepository:
+    """
+    Repository for the ETag and Last-Modified validators of RSS feeds.
+    """
+
+    @staticmethod
+    async def get_states(feed_urls: List[str]) -> Dict[str, RSSFeedState]:
+        if not feed_urls:
+            return {}
+        async with async_session() as session:
+            result = await session.execute(
+                select(RSSFeedState).where(
+                    RSSFeedState.feed_url.in_(feed_urls)
+                )
+            )
+            return {state.feed_url: state for state in result.scalars()}
+
+    @staticmethod
+    async def save_state(
+        feed_url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ) -> None:
+        """
+        Store the validators of the last download of a feed.
+        """
+        values = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": datetime.now(timezone.utc),
+        }
+        statement = (
+            insert(RSSFeedState)
+            .values(feed_url=feed_url, **values)
+            .on_conflict_do_update(index_elements=["feed_url"], set_=values)
+        )
+        async with async_session() as session:
+            await session.execute(statement)
+            await session.commit()
@@ -217,6 +217,23 @@ class SearchProfileRepository:
             result = await session.execute(query)
             return result.scalars().all()
 
+    @staticmethod
+    async def fetch_profiles_with_topics() -> List[SearchProfile]:
+        """
+        Fetch all search profiles with their subscriptions, topics and
+        keywords loaded.
+        """
+        async with async_session() as session:
+            result = await session.execute(
+                select(SearchProfile).options(
+                    selectinload(SearchProfile.subscriptions),
+                    selectinload(SearchProfile.topics).selectinload(
+                        Topic.keywords
+                    ),
+                )
+            )
+            return result.scalars().all()
+
     @staticmethod
     async def get_search_profile_by_id(
         search_profile_id: UUID,
@@ -227,6 +244,7 @@ class SearchProfileRepository:
                 .where(SearchProfile.id == search_profile_id)
                 .options(
                     selectinload(SearchProfile.users),
+                    selectinload(SearchProfile.subscriptions),
                     selectinload(SearchProfile.topics).selectinload(
                         Topic.keywords
                     ),
@@ -54,3 +54,19 @@ class MatchDetailResponse(BaseModel):
     entities: Optional[dict] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ArticleSummaryResponse(BaseModel):
+    summary: str
+    persons: List[str] = []
+    industries: List[str] = []
+    events: List[str] = []
+    organizations: List[str] = []
+    citations: List[str] = []
+
+
+class TranslatedArticleSummaryResponse(ArticleSummaryResponse):
+    title_en: str
+    title_de: str
+    summary_en: str
+    summary_de: str
@@ -46,8 +46,8 @@ class ArticleCleaner:
     @tenacity.retry(
         stop=tenacity.stop_after_attempt(3), wait=tenacity.wait_fixed(2)
     )
-    def _call_llm_sync(self, prompt: str) -> str:
-        return self.llm_client.generate_response(prompt)
+    async def _call_llm(self, prompt: str) -> str:
+        return await self.llm_client.agenerate_response(prompt)
 
     async def clean_with_llm_removal_only(self, text, title: str) -> str:
         prompt = (
@@ -70,7 +70,7 @@ class ArticleCleaner:
             f"Body: {text}"
         )
         async with self.semaphore:
-            return await asyncio.to_thread(self._call_llm_sync, prompt)
+            return await self._call_llm(prompt)
 
     async def clean_one(
         self, article: Article
@@ -119,7 +119,7 @@ class ArticleCleaner:
             f"Body: {text}"
         )
         async with self.semaphore:
-            return await asyncio.to_thread(self._call_llm_sync, prompt)
+            return await self._call_llm(prompt)
 
     async def clean_articles_since_date(
         self, session: AsyncSession, since_date: date
@@ -1,11 +1,16 @@
 import asyncio
 import json
-from typing import Dict, List, Set, Tuple
-from uuid import UUID
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from uuid import UUID, uuid4
+
+import numpy as np
+from langchain_core.documents import Document
 
 from app.core.db import async_session
 from app.core.logger import get_logger
-from app.models import Match, MatchingRun, SearchProfile
+from app.models import MatchingRun, SearchProfile, Topic
+from app.repositories.article_repository import ArticleRepository
 from app.repositories.match_repository import MatchRepository
 from app.repositories.matching_run_repository import MatchingRunRepository
 from app.repositories.search_profile_repository import SearchProfileRepository
@@ -23,6 +28,10 @@ class ArticleMatchingService:
         self.weights = {"topic": 0.7, "keyword": 0.3}
         self.topic_score_threshold = 0.45
         self.keyword_score_threshold = 0.1
+        # Incremental matching scores plain cosine similarity instead of
+        # fused hybrid scores, so it uses its own thresholds
+        self.incremental_topic_score_threshold = 0.45
+        self.incremental_keyword_score_threshold = 0.3
 
     async def process_article_matching_for_search_profile(
         self, search_profile_id: UUID, matching_run: MatchingRun
@@ -36,9 +45,12 @@ class ArticleMatchingService:
             f"for search profile: {search_profile_id}"
         )
 
-        topic_scores = await self._phase1_topic_matching(profile)
-        keyword_scores = await self._phase2_keyword_matching(
-            profile, topic_scores
+        topic_results, keyword_results = await self._retrieve_similarities(
+            profile
+        )
+        topic_scores = self._phase1_topic_matching(profile, topic_results)
+        keyword_scores = self._phase2_keyword_matching(
+            profile, topic_scores, keyword_results
         )
         keyword_averages = self._compute_keyword_averages(keyword_scores)
 
@@ -65,34 +77,87 @@ class ArticleMatchingService:
             raise ValueError(f"Search profile with ID {profile_id} not found.")
         return profile
 
-    async def _phase1_topic_matching(
-        self, profile: SearchProfile
+    @staticmethod
+    def _profile_subscription_ids(profile: SearchProfile) -> Set[UUID]:
+        """
+        IDs of the subscriptions a profile is limited to, or an empty set
+        if it follows all subscriptions.
+        """
+        return {
+            subscription.id
+            for subscription in getattr(profile, "subscriptions", None) or []
+        }
+
+    @staticmethod
+    def _build_topic_query(topic: Topic) -> str:
+        keywords = [kw.name for kw in topic.keywords]
+        return f"Topic {topic.name}: " + ", ".join(keywords)
+
+    async def _retrieve_similarities(self, profile: SearchProfile) -> Tuple[
+        Dict[UUID, List[Tuple[Document, float]]],
+        Dict[str, List[Tuple[Document, float]]],
+    ]:
+        """
+        Retrieve the similarity results for all topics and keywords of a
+        profile with a single batched vector search.
+        Returns two maps: topic_id -> results and keyword_name -> results
+        """
+        topic_queries = {
+            topic.id: self._build_topic_query(topic)
+            for topic in profile.topics
+        }
+        keyword_names = list(
+            dict.fromkeys(
+                kw.name for topic in profile.topics for kw in topic.keywords
+            )
+        )
+
+        queries = list(topic_queries.values()) + keyword_names
+        thresholds = [self.topic_score_threshold] * len(topic_queries) + [
+            self.keyword_score_threshold
+        ] * len(keyword_names)
+
+        # Profiles limited to some sources only match their articles
+        vector_service = self.article_vector_service
+        results = await vector_service.retrieve_by_similarity_batch(
+            queries,
+            thresholds,
+            query_filter=vector_service.build_filter(
+                subscription_ids=self._profile_subscription_ids(profile)
+            ),
+        )
+
+        topic_results = dict(zip(topic_queries.keys(), results))
+        keyword_results = dict(
+            zip(keyword_names, results[len(topic_queries) :])
+        )
+        return topic_results, keyword_results
+
+    def _phase1_topic_matching(
+        self,
+        profile: SearchProfile,
+        topic_results: Dict[UUID, List[Tuple[Document, float]]],
     ) -> Dict[UUID, Dict[UUID, float]]:
         """
-        Phase 1 - retrieve topic-level similarity scores.
+        Phase 1 - collect topic-level similarity scores.
         Returns a map: topic_id -> { article_id: topic_score }
         """
         topic_score_map: Dict[UUID, Dict[UUID, float]] = {}
         for topic in profile.topics:
-            keywords = [kw.name for kw in topic.keywords]
-            query = f"Topic {topic.name}: " + ", ".join(keywords)
-            retrieved = (
-                await self.article_vector_service.retrieve_by_similarity(
-                    query, self.topic_score_threshold
-                )
-            )
+            retrieved = topic_results.get(topic.id, [])
             topic_score_map[topic.id] = {
                 UUID(doc.metadata["id"]): score for doc, score in retrieved
             }
         return topic_score_map
 
-    async def _phase2_keyword_matching(
+    def _phase2_keyword_matching(
         self,
         profile: SearchProfile,
         topic_scores: Dict[UUID, Dict[UUID, float]],
+        keyword_results: Dict[str, List[Tuple[Document, float]]],
     ) -> Dict[UUID, Dict[UUID, Dict[UUID, List[float]]]]:
         """
-        Phase 2 - retrieve per-keyword similarity and store raw scores.
+        Phase 2 - collect per-keyword similarity and store raw scores.
         Returns nested map: topic_id -> article_id -> keyword_id -> [scores]
         """
         keyword_score_map: Dict[UUID, Dict[UUID, Dict[UUID, List[float]]]] = {}
@@ -103,12 +168,7 @@ class ArticleMatchingService:
                 for art_id in matched
             }
             for kw in topic.keywords:
-                results = (
-                    await self.article_vector_service.retrieve_by_similarity(
-                        kw.name, self.keyword_score_threshold
-                    )
-                )
-                for doc, score in results:
+                for doc, score in keyword_results.get(kw.name, []):
                     art_id = UUID(doc.metadata["id"])
                     if art_id in matched:
                         keyword_score_map[topic.id][art_id][kw.id].append(
@@ -207,62 +267,43 @@ class ArticleMatchingService:
         matching_run: MatchingRun,
     ):
         """
-        Insert new ones in sorted order,
-        but skip articles that are already matched
-        to this profile.
+        Insert new ones in sorted order with a single bulk upsert,
+        skipping articles that are already matched to this profile.
         """
+        payloads = {entry["article_id"]: entry for entry in results}
+        matched_at = datetime.now(timezone.utc)
+        rows = [
+            {
+                "id": uuid4(),
+                "article_id": art_id,
+                "search_profile_id": profile_id,
+                "topic_id": topic_id,
+                "sorting_order": sorting_order,
+                "comment": json.dumps(payloads[art_id], default=str),
+                "score": score,
+                "matched_at": matched_at,
+                "matching_run_id": matching_run.id,
+            }
+            for sorting_order, (art_id, topic_id, score) in enumerate(matches)
+        ]
+        if not rows:
+            return
+
         async with async_session() as session:
-            inserted_count = 0
-            skipped_count = 0
-
-            for _, (art_id, topic_id, score) in enumerate(matches):
-                # Check if match already exists for this profile and article
-                self.logger.debug(
-                    f"Checking if match exists for profile {profile_id} "
-                    f"and article {art_id}"
+            try:
+                inserted = await MatchRepository.upsert_matches(session, rows)
+            except Exception as e:
+                await session.rollback()
+                self.logger.error(
+                    f"Error inserting matches for profile {profile_id}: {e}"
                 )
-                try:
-                    if await MatchRepository.match_exists(
-                        session, profile_id, art_id
-                    ):
-                        skipped_count += 1
-                        self.logger.debug(
-                            f"Skipping article {art_id} for "
-                            f"profile {profile_id} - match already exists"
-                        )
-                        continue
+                return
 
-                    self.logger.debug(
-                        f"Inserting match for profile {profile_id} "
-                        f"and article {art_id}"
-                    )
-                    entry = next(
-                        r for r in results if r["article_id"] == art_id
-                    )
-                    match = Match(
-                        article_id=art_id,
-                        search_profile_id=profile_id,
-                        topic_id=topic_id,
-                        sorting_order=inserted_count,
-                        comment=json.dumps(entry, default=str),
-                        score=score,
-                        matching_run_id=matching_run.id,
-                    )
-
-                    await MatchRepository.insert_match(match, session)
-                    inserted_count += 1
-                except Exception as e:
-                    self.logger.error(
-                        f"Error inserting match for profile {profile_id} "
-                        f"and article {art_id}: {e}"
-                    )
-                    continue
-
-            self.logger.info(
-                f"Profile {profile_id}: "
-                f"Inserted {inserted_count} new matches, "
-                f"skipped {skipped_count} existing matches"
-            )
+        self.logger.info(
+            f"Profile {profile_id}: "
+            f"Inserted {len(inserted)} new matches, "
+            f"skipped {len(rows) - len(inserted)} existing matches"
+        )
 
     async def run(self, batch_size: int = 100) -> None:
         """
@@ -319,3 +360,180 @@ class ArticleMatchingService:
             )
 
         self.logger.info("Article matching process completed")
+
+    async def run_incremental(self, article_batch_size: int = 512) -> None:
+        """
+        Run the article matching process only for the articles embedded
+        since the last matching run.
+
+        All topic and keyword queries of all search profiles are embedded
+        once into a matrix, and each batch of new articles is scored
+        against it with a single matrix multiplication.
+
+        :param article_batch_size: Number of article vectors scored at once.
+        """
+        self.logger.info("Starting incremental article matching process")
+
+        async with async_session() as session:
+            last_run = await MatchingRunRepository.get_last_matching_run(
+                session
+            )
+        since = last_run.created_at if last_run else None
+        profiles = await SearchProfileRepository.fetch_profiles_with_topics()
+        if not profiles:
+            self.logger.info("No search profiles found")
+            return
+
+        algorithm_version = (
+            f"V1_INCREMENTAL_TOPIC_WEIGHTS_{self.weights['topic']}_"
+            f"KEYWORD_WEIGHTS_{self.weights['keyword']}"
+        )
+        async with async_session() as session:
+            matching_run = await MatchingRunRepository.create_matching_run(
+                session, algorithm_version=algorithm_version
+            )
+
+        article_subscriptions = (
+            await ArticleRepository.list_embedded_article_subscriptions(since)
+        )
+        article_ids = list(article_subscriptions)
+        self.logger.info(
+            f"Scoring {len(article_ids)} articles embedded since {since} "
+            f"against {len(profiles)} profiles"
+        )
+        if not article_ids:
+            return
+
+        query_rows, query_matrix = self._build_query_matrix(profiles)
+
+        topic_scores = {p.id: {t.id: {} for t in p.topics} for p in profiles}
+        keyword_scores = {p.id: {t.id: {} for t in p.topics} for p in profiles}
+        missing: List[UUID] = []
+        for start in range(0, len(article_ids), article_batch_size):
+            chunk = article_ids[start : start + article_batch_size]
+            vectors = self.article_vector_service.retrieve_vectors(chunk)
+            missing.extend(
+                article_id for article_id in chunk if article_id not in vectors
+            )
+            if not vectors:
+                continue
+            chunk_ids = list(vectors.keys())
+            article_matrix = self._normalize_rows(
+                np.asarray(list(vectors.values()), dtype=np.float32)
+            )
+            scores = query_matrix @ article_matrix.T
+            for profile in profiles:
+                subscription_ids = self._profile_subscription_ids(profile)
+                self._accumulate_profile_scores(
+                    profile,
+                    scores,
+                    query_rows,
+                    chunk_ids,
+                    topic_scores[profile.id],
+                    keyword_scores[profile.id],
+                    article_mask=(
+                        np.array(
+                            [
+                                article_subscriptions.get(art_id)
+                                in subscription_ids
+                                for art_id in chunk_ids
+                            ]
+                        )
+                        if subscription_ids
+                        else None
+                    ),
+                )
+
+        for profile in profiles:
+            keyword_averages = self._compute_keyword_averages(
+                keyword_scores[profile.id]
+            )
+            final_matches = self._phase3_finalize_matches(
+                topic_scores[profile.id], keyword_averages
+            )
+            if not final_matches:
+                continue
+            match_payloads = self._build_match_payloads(
+                profile, final_matches, keyword_averages
+            )
+            await self._persist_matches(
+                profile.id, final_matches, match_payloads, matching_run
+            )
+
+        if missing:
+            # Move the articles into the window of the next run instead of
+            # skipping them for good
+            self.logger.warning(
+                f"{len(missing)} embedded articles have no vector in the "
+                "vector store yet, carrying them over to the next run"
+            )
+            await ArticleRepository.mark_articles_embedded(
+                missing, datetime.now(timezone.utc)
+            )
+
+        self.logger.info("Incremental article matching process completed")
+
+    def _build_query_matrix(
+        self, profiles: Sequence[SearchProfile]
+    ) -> Tuple[Dict[str, int], np.ndarray]:
+        """
+        Embed every distinct topic query and keyword of the given profiles.
+        Returns a map: query -> row index, and the row-normalized matrix.
+        """
+        queries: Dict[str, int] = {}
+        for profile in profiles:
+            for topic in profile.topics:
+                queries.setdefault(
+                    self._build_topic_query(topic), len(queries)
+                )
+                for kw in topic.keywords:
+                    queries.setdefault(kw.name, len(queries))
+
+        embeddings = self.article_vector_service.embed_queries(list(queries))
+        matrix = self._normalize_rows(np.asarray(embeddings, dtype=np.float32))
+        return queries, matrix
+
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _accumulate_profile_scores(
+        self,
+        profile: SearchProfile,
+        scores: np.ndarray,
+        query_rows: Dict[str, int],
+        article_ids: List[UUID],
+        topic_scores: Dict[UUID, Dict[UUID, float]],
+        keyword_scores: Dict[UUID, Dict[UUID, Dict[UUID, List[float]]]],
+        article_mask: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Add the scores of one article batch to the topic and keyword
+        score maps of a profile, in the layout of phases 1 and 2. With
+        ``article_mask``, only the articles it selects are scored.
+        """
+        for topic in profile.topics:
+            topic_row = scores[query_rows[self._build_topic_query(topic)]]
+            above = topic_row >= self.incremental_topic_score_threshold
+            if article_mask is not None:
+                above &= article_mask
+            matched = np.nonzero(above)[0]
+            if matched.size == 0:
+                continue
+
+            for idx in matched:
+                art_id = article_ids[idx]
+                topic_scores[topic.id][art_id] = float(topic_row[idx])
+                keyword_scores[topic.id][art_id] = {
+                    kw.id: [] for kw in topic.keywords
+                }
+            for kw in topic.keywords:
+                kw_row = scores[query_rows[kw.name]]
+                for idx in matched:
+                    score = float(kw_row[idx])
+                    if score >= self.incremental_keyword_score_threshold:
+                        keyword_scores[topic.id][article_ids[idx]][
+                            kw.id
+                        ].append(score)
@@ -1,36 +1,96 @@
 import asyncio
 import json
+import time
 import uuid
 from datetime import date, datetime
-from pathlib import Path
-from typing import Sequence
+from typing import AsyncIterator, List, NamedTuple, Optional, Sequence
 
+from app.core.config import get_configs
+from app.core.db import async_session
 from app.core.logger import get_logger
-from app.models.article import Article
+from app.models.article import Article, ArticleStatus
+from app.models.entity import EntityType
+from app.models.llm_batch_job import LLMBatchPurpose
 from app.repositories.article_repository import ArticleRepository
 from app.repositories.entity_repository import ArticleEntityRepository
+from app.repositories.llm_batch_job_repository import LLMBatchJobRepository
+from app.schemas.articles_schemas import TranslatedArticleSummaryResponse
+from app.services.language_detection_service import language_name
+from app.services.llm_service.batch_runner import BatchRunner
 from app.services.llm_service.llm_client import LLMClient
 from app.services.llm_service.llm_models import TaskModelMapping
 
+configs = get_configs()
 logger = get_logger(__name__)
 
+# Translations returned with the summary in summarize+translate mode
+SUMMARY_TRANSLATION_FIELDS = (
+    "title_en",
+    "title_de",
+    "summary_en",
+    "summary_de",
+)
+
+
+class SummaryResult(NamedTuple):
+    """Parsed summary of one article, or the error it failed with."""
+
+    article_id: uuid.UUID
+    data: Optional[dict] = None
+    error: Optional[str] = None
+
 
 class ArticleSummaryService:
-    _semaphore = asyncio.Semaphore(50)
-    _llm_client = LLMClient(TaskModelMapping.ARTICLE_SUMMARY, max_retries=1)
+    _llm_client = LLMClient(
+        TaskModelMapping.ARTICLE_SUMMARY, max_retries=1, use_cache=True
+    )
 
     @staticmethod
-    def _build_prompt(article: Article) -> str:
+    def _build_prompt(
+        article: Article, with_translations: bool = False
+    ) -> str:
+        """
+        Build the summary prompt of an article. With translations, the
+        title and the summary are also translated into English and German
+        in the same response.
+        """
+        # The language is detected once after scraping
+        name = language_name(article.language)
+        language = (
+            f"language as the article ({name})"
+            if name
+            else ("language as the article")
+        )
+        translations = ""
+        translation_keys = ""
+        title = ""
+        if with_translations:
+            title = f"\nArticle title:\n{article.title}\n"
+            translations = (
+                "Finally, translate the article title and your summary "
+                "into English and into German. If the article is already "
+                "in one of these languages, repeat the text unchanged for "
+                "that language.\n"
+            )
+            translation_keys = (
+                ",\n"
+                '  "title_en": "<title in English>",\n'
+                '  "title_de": "<title in German>",\n'
+                '  "summary_en": "<summary in English>",\n'
+                '  "summary_de": "<summary in German>"'
+            )
         return (
             f"Summarize the following article in a clear, neutral, "
             f"and informative tone, covering all major points without "
             f"omitting key details. The summary must be in the same "
-            f"language as the article. Then, extract and list separately:\n"
+            f"{language}. Then, extract and list separately:\n"
             f"- Persons mentioned\n"
             f"- Industries mentioned\n"
             f"- Events mentioned\n"
             f"- Organizations mentioned\n"
             f"- Citations in academic reference format present in the text\n"
+            f"{translations}"
+            f"{title}"
             f"\nArticle content:\n{article.content}\n\n"
             f"Return your answer as a JSON object with the "
             f"following structure:\n"
@@ -40,126 +100,318 @@ class ArticleSummaryService:
             f'  "industries": ["industry1", "industry2", ...],\n'
             f'  "events": ["event1", "event2", ...],\n'
             f'  "organizations": ["org1", "org2", ...],\n'
-            f'  "citations": ["cit1", "cit2", ...]\n'
+            f'  "citations": ["cit1", "cit2", ...]'
+            f"{translation_keys}\n"
             f"}}\n"
             f"Make sure the JSON is valid and parsable."
         )
 
     @staticmethod
-    def _generate_summary_batch_file(
-        articles: Sequence[Article],
-    ) -> Path | None:
+    async def _summary_requests(
+        page_size: int, datetime_start: datetime
+    ) -> AsyncIterator[dict]:
         """
-        Generates a .jsonl batch file containing prompts for summarizing
-        and entity extraction.
-
-        Args:
-            articles (Sequence[Article]): A list of articles to summarize
-            and extract entities.
-
-        Returns:
-            str | None: The path to the generated .jsonl batch file.
-        """
-        custom_ids = [str(article.id) for article in articles]
-        prompts = [
-            ArticleSummaryService._build_prompt(article)
-            for article in articles
-        ]
-
-        batch_path = LLMClient.generate_batch(
-            custom_ids=custom_ids,
-            prompts=prompts,
-            model=TaskModelMapping.ARTICLE_SUMMARY.value,
-            temperature=0.1,
-            output_filename="summary_batch.jsonl",
+        Yield one batch API request per article without summary, reading
+        the articles page by page. Articles of batches that are still
+        pending are skipped.
+        """
+        pending = await LLMBatchJobRepository.get_pending_custom_ids(
+            LLMBatchPurpose.ARTICLE_SUMMARY
         )
-
-        return batch_path
+        async for articles in ArticleRepository.iter_articles_without_summary(
+            page_size=page_size, datetime_start=datetime_start
+        ):
+            logger.info(f"Queueing {len(articles)} articles for batch summary")
+            for article in articles:
+                if str(article.id) in pending:
+                    continue
+                yield LLMClient.build_request_jsonl(
+                    custom_id=str(article.id),
+                    model=TaskModelMapping.ARTICLE_SUMMARY.value,
+                    prompt=ArticleSummaryService._build_prompt(
+                        article, configs.ARTICLE_SUMMARY_WITH_TRANSLATIONS
+                    ),
+                    temperature=0.1,
+                )
 
     @staticmethod
-    async def _process_and_store(article_id: uuid.UUID, content: str) -> None:
+    def _parse_content(content: str) -> dict:
         """
-        Parses content and stores summary and extracted entities.
+        Parse the JSON response of the llm model into a summary and its
+        entities, grouped by entity type.
+        """
+        if content.startswith("```json"):
+            content = content[len("```json") :].strip()
+        if content.endswith("```"):
+            content = content[: -len("```")].strip()
 
-        Args:
-            article_id (UUID): ID of the article being processed.
-            content (str): JSON-formatted response from the llm model.
+        return ArticleSummaryService._to_data(json.loads(content))
+
+    @staticmethod
+    def _to_data(data: dict) -> dict:
         """
+        Group the fields of a summary response into the summary, its
+        entities by entity type and, in summarize+translate mode, the
+        translations of the title and the summary.
+        """
+        return {
+            "summary": data.get("summary", ""),
+            "entities": {
+                EntityType.PERSON: data.get("persons", []),
+                EntityType.INDUSTRY: data.get("industries", []),
+                EntityType.EVENT: data.get("events", []),
+                EntityType.ORGANIZATION: data.get("organizations", []),
+                EntityType.CITATION: data.get("citations", []),
+            },
+            "translations": {
+                field: data[field]
+                for field in SUMMARY_TRANSLATION_FIELDS
+                if data.get(field)
+            },
+        }
+
+    @staticmethod
+    def _to_result(article_id: uuid.UUID, content: str) -> SummaryResult:
         try:
-            if content.startswith("```json"):
-                content = content[len("```json") :].strip()
-            if content.endswith("```"):
-                content = content[: -len("```")].strip()
-
-            data = json.loads(content)
-
-            summary = data.get("summary", "")
-            persons = data.get("persons", [])
-            industries = data.get("industries", [])
-            events = data.get("events", [])
-            organizations = data.get("organizations", [])
-            citations = data.get("citations", [])
-
-            await ArticleRepository.update_article_summary(article_id, summary)
-            await ArticleEntityRepository.add_entities(
-                article_id,
-                persons=persons,
-                industries=industries,
-                events=events,
-                organizations=organizations,
-                citations=citations,
+            return SummaryResult(
+                article_id, ArticleSummaryService._parse_content(content)
             )
         except Exception as e:
-            logger.error(
-                f"Error processing and storing article {article_id}: {e}"
+            logger.error(f"Error processing article {article_id}: {e}")
+            return SummaryResult(
+                article_id, error=f"Error processing summary: {str(e)}"
             )
-            article = await ArticleRepository.get_article_by_id(article_id)
-            article.status = "ERROR"
-            article.note = f"Error processing summary: {str(e)}"
-            await ArticleRepository.update_article(article)
 
     @staticmethod
-    async def _summarize_and_store_batch(articles: Sequence[Article]) -> None:
-        batch_path = ArticleSummaryService._generate_summary_batch_file(
-            articles=articles,
+    async def _add_results(session, results: Sequence[SummaryResult]) -> None:
+        """
+        Write summaries, entities and error states of several articles,
+        using one multi-row statement each. The caller commits.
+        """
+        summaries = {}
+        entities = {}
+        translations = {}
+        complete_translations = {}
+        errors = {}
+        for result in results:
+            if result.error is not None:
+                errors[result.article_id] = result.error
+            else:
+                summaries[result.article_id] = result.data["summary"]
+                entities[result.article_id] = result.data["entities"]
+                found = result.data.get("translations") or {}
+                # Without eager content translation, articles with all
+                # title and summary translations need no translation step
+                if (
+                    len(found) == len(SUMMARY_TRANSLATION_FIELDS)
+                    and not configs.TRANSLATE_CONTENT_EAGERLY
+                ):
+                    complete_translations[result.article_id] = found
+                elif found:
+                    translations[result.article_id] = found
+
+        await ArticleRepository.update_article_summaries(session, summaries)
+        await ArticleEntityRepository.add_entities_many(session, entities)
+        await ArticleRepository.update_article_translations(
+            session, translations
         )
-        if not batch_path:
-            logger.error("Could not generate batch file")
-            return
+        await ArticleRepository.update_article_translations(
+            session,
+            complete_translations,
+            status=ArticleStatus.TRANSLATED,
+        )
+        await ArticleRepository.mark_articles_error(session, errors)
 
-        output_lines = await LLMClient.run_batch_api(str(batch_path))
+    @staticmethod
+    async def _store_results(results: Sequence[SummaryResult]) -> None:
+        """
+        Store the results of several articles in one transaction. If it
+        fails, the results are stored one by one, so that only the
+        articles whose results cannot be stored are marked as ERROR.
+        """
+        async with async_session() as session:
+            try:
+                await ArticleSummaryService._add_results(session, results)
+                await session.commit()
+                return
+            except Exception as e:
+                await session.rollback()
+                error = e
+                logger.error(
+                    f"Error storing {len(results)} summary results: {e}"
+                )
 
-        if not output_lines:
-            logger.error("Could not obtain results from batch output")
+        if len(results) > 1:
+            for result in results:
+                await ArticleSummaryService._store_results([result])
             return
 
-        for line in output_lines:
+        article_id = results[0].article_id
+        async with async_session() as session:
             try:
-                result = json.loads(line)
-                article_id = uuid.UUID(result["custom_id"])
-                response = result["response"]
+                await ArticleRepository.mark_articles_error(
+                    session, {article_id: f"Error storing summary: {error}"}
+                )
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                logger.error(
+                    f"Error marking article {article_id} as ERROR: {e}"
+                )
+
+    @staticmethod
+    async def _process_and_store(article_id: uuid.UUID, content: str) -> None:
+        """
+        Parses content and stores summary and extracted entities.
+
+        Args:
+            article_id (UUID): ID of the article being processed.
+            content (str): JSON-formatted response from the llm model.
+        """
+        await ArticleSummaryService._store_results(
+            [ArticleSummaryService._to_result(article_id, content)]
+        )
+
+    @staticmethod
+    async def store_batch_output(lines: Sequence[dict]) -> None:
+        """
+        Store the results of parsed batch API output lines, the same way
+        as ``_process_and_store`` does for a single response.
+        """
+        results = []
+        for line in lines:
+            try:
+                article_id = uuid.UUID(line["custom_id"])
+                response = line["response"]
+                if response.get("status_code", 200) != 200:
+                    error = response["body"].get("error", {}).get("message")
+                    results.append(
+                        SummaryResult(
+                            article_id, error=f"Batch request failed: {error}"
+                        )
+                    )
+                    continue
                 content = response["body"]["choices"][0]["message"]["content"]
-                await ArticleSummaryService._process_and_store(
-                    article_id, content
+                results.append(
+                    ArticleSummaryService._to_result(article_id, content)
                 )
             except Exception as e:
                 logger.error(f"Error storing data for line: {e}")
+        await ArticleSummaryService._store_results(results)
 
     @staticmethod
-    async def _summarize_and_store_concurrently(article: Article) -> None:
-        prompt = ArticleSummaryService._build_prompt(article)
-        async with ArticleSummaryService._semaphore:
-            try:
-                content = await asyncio.to_thread(
-                    ArticleSummaryService._llm_client.generate_response, prompt
+    async def _summarize(article: Article) -> Optional[SummaryResult]:
+        with_translations = configs.ARTICLE_SUMMARY_WITH_TRANSLATIONS
+        prompt = ArticleSummaryService._build_prompt(
+            article, with_translations
+        )
+        try:
+            llm_client = ArticleSummaryService._llm_client
+            if with_translations:
+                response = await llm_client.agenerate_typed_response(
+                    prompt, TranslatedArticleSummaryResponse
                 )
-                await ArticleSummaryService._process_and_store(
-                    article.id, content
+                return SummaryResult(
+                    article.id,
+                    ArticleSummaryService._to_data(response.model_dump()),
                 )
-            except Exception as e:
-                logger.error(
-                    f"Error summarizing article {article.id} concurrently: {e}"
+            content = await llm_client.agenerate_response(prompt)
+        except Exception as e:
+            logger.error(
+                f"Error summarizing article {article.id} concurrently: {e}"
+            )
+            return None
+        return ArticleSummaryService._to_result(article.id, content)
+
+    @staticmethod
+    async def _write_results(
+        queue: asyncio.Queue,
+        flush_size: int,
+        flush_interval: float,
+    ) -> int:
+        """
+        Buffer summary results from ``queue`` and store them every
+        ``flush_size`` results or ``flush_interval`` seconds, until a None
+        sentinel arrives.
+
+        Returns:
+            int: Number of stored results.
+        """
+        loop = asyncio.get_running_loop()
+        buffer: List[SummaryResult] = []
+        stored = 0
+        deadline = loop.time() + flush_interval
+        done = False
+        while not done:
+            try:
+                result = await asyncio.wait_for(
+                    queue.get(), timeout=max(deadline - loop.time(), 0)
                 )
+                if result is None:
+                    done = True
+                else:
+                    buffer.append(result)
+            except asyncio.TimeoutError:
+                pass
+
+            if buffer and (
+                done or len(buffer) >= flush_size or loop.time() >= deadline
+            ):
+                await ArticleSummaryService._store_results(buffer)
+                stored += len(buffer)
+                buffer = []
+            if loop.time() >= deadline:
+                deadline = loop.time() + flush_interval
+        return stored
+
+    @staticmethod
+    async def _summarize_streaming(
+        page_size: int,
+        datetime_start: datetime,
+        max_in_flight: int,
+        flush_size: int,
+        flush_interval: float,
+    ) -> None:
+        """
+        Keep up to ``max_in_flight`` LLM calls running while reading
+        articles page by page, and hand finished results to a writer task
+        that stores them in bulk.
+        """
+        window = asyncio.Semaphore(max_in_flight)
+        queue: asyncio.Queue = asyncio.Queue()
+        writer = asyncio.create_task(
+            ArticleSummaryService._write_results(
+                queue, flush_size, flush_interval
+            )
+        )
+        tasks = set()
+
+        async def summarize(article: Article) -> None:
+            try:
+                result = await ArticleSummaryService._summarize(article)
+                if result is not None:
+                    queue.put_nowait(result)
+            finally:
+                window.release()
+
+        start = time.perf_counter()
+        try:
+            async for page in ArticleRepository.iter_articles_without_summary(
+                page_size=page_size, datetime_start=datetime_start
+            ):
+                logger.info(f"Queueing {len(page)} articles for summary")
+                for article in page:
+                    await window.acquire()
+                    task = asyncio.create_task(summarize(article))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+        finally:
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            queue.put_nowait(None)
+            stored = await writer
+            elapsed = time.perf_counter() - start
+            logger.info(f"Stored {stored} summaries in {elapsed:.1f}s")
 
     @staticmethod
     async def run(
@@ -169,35 +421,46 @@ class ArticleSummaryService:
         ),
         datetime_end: datetime = datetime.now(),
         use_batch_api: bool = False,
+        wait_for_batch: bool = True,
+        max_in_flight: int = 50,
+        flush_size: int = 100,
+        flush_interval_ms: int = 500,
     ) -> None:
         """
         Main entry point to summarize a list of articles and
         store their extracted entities.
-        """
-        articles = await ArticleRepository.list_articles_without_summary(
-            limit=page_size,
-            datetime_start=datetime_start,
-        )
-        while articles:
-            if use_batch_api:
-                logger.info(f"Processing batch with {len(articles)} articles")
-                await ArticleSummaryService._summarize_and_store_batch(
-                    articles
-                )
-            else:
-                logger.info(
-                    f"Processing {len(articles)} articles concurrently"
-                )
-                tasks = [
-                    ArticleSummaryService._summarize_and_store_concurrently(
-                        article
-                    )
-                    for article in articles
-                ]
-                await asyncio.gather(*tasks, return_exceptions=True)
 
-            articles = await ArticleRepository.list_articles_without_summary(
-                limit=page_size,
+        With the batch API, all articles are streamed into as many batches
+        as the provider limits require. Unless ``wait_for_batch`` is set,
+        the batches are only submitted and the LLMBatchReconciler stores
+        their results once they complete. Without the batch API, up to
+        ``max_in_flight`` articles are summarized at a time and results
+        are written every ``flush_size`` results or ``flush_interval_ms``
+        milliseconds.
+        """
+        if not use_batch_api:
+            await ArticleSummaryService._summarize_streaming(
+                page_size=page_size,
                 datetime_start=datetime_start,
+                max_in_flight=max_in_flight,
+                flush_size=flush_size,
+                flush_interval=flush_interval_ms / 1000,
             )
-        logger.info("No more articles to summarize")
+            logger.info("No more articles to summarize")
+            return
+
+        requests = ArticleSummaryService._summary_requests(
+            page_size, datetime_start
+        )
+        if not wait_for_batch:
+            await BatchRunner().submit_all(
+                requests, LLMBatchPurpose.ARTICLE_SUMMARY
+            )
+            return
+
+        applied = await BatchRunner().run(
+            requests,
+            ArticleSummaryService.store_batch_output,
+            purpose=LLMBatchPurpose.ARTICLE_SUMMARY,
+        )
+        logger.info(f"Applied {applied} batch summary results")
@@ -1,24 +1,33 @@
+import asyncio
+import time
 import uuid
-from datetime import date, datetime
-from typing import List, Optional
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Sequence
 
 from langchain_core.documents import Document
 from langchain_openai import OpenAIEmbeddings
 from langchain_qdrant import FastEmbedSparse, QdrantVectorStore, RetrievalMode
 from pydantic import SecretStr
 from qdrant_client import models
-from qdrant_client.http.models import (
-    Distance,
-    SparseVectorParams,
-    VectorParams,
-)
 
 from app.core.config import get_configs
-from app.core.db import get_qdrant_connection
+from app.core.db import get_async_qdrant_connection, get_qdrant_connection
 from app.core.logger import get_logger
 from app.models import Article
 from app.models.article import ArticleStatus
 from app.repositories.article_repository import ArticleRepository
+from app.services.query_embedding_cache import (
+    CachedQueryEmbeddings,
+    get_query_embedding_cache,
+)
+from app.services.vector_collection_manager import (
+    FULL_DENSE_SIZE,
+    LANGUAGE_FIELD,
+    PUBLISHED_AT_FIELD,
+    SUBSCRIPTION_ID_FIELD,
+    VectorCollectionManager,
+    get_collection_schema,
+)
 
 configs = get_configs()
 logger = get_logger(__name__)
@@ -28,13 +37,26 @@ class ArticleVectorService:
     """Service for managing article vectors in Qdrant."""
 
     def __init__(self):
-        self._dense_embeddings = OpenAIEmbeddings(
-            model="text-embedding-3-large",
-            api_key=SecretStr(configs.OPENAI_API_KEY),
+        self._dense_embeddings = CachedQueryEmbeddings(
+            OpenAIEmbeddings(
+                model="text-embedding-3-large",
+                api_key=SecretStr(configs.OPENAI_API_KEY),
+                dimensions=(
+                    configs.ARTICLE_VECTOR_DIMENSIONS
+                    if configs.ARTICLE_VECTOR_DIMENSIONS < FULL_DENSE_SIZE
+                    else None
+                ),
+            ),
+            get_query_embedding_cache(),
         )
         self._sparse_embeddings = FastEmbedSparse(model_name="Qdrant/bm25")
         self.collection_name = configs.ARTICLE_VECTORS_COLLECTION
         self._qdrant_client = get_qdrant_connection()
+        self._async_qdrant_client = get_async_qdrant_connection()
+        self._collection_schema = get_collection_schema(
+            dimensions=configs.ARTICLE_VECTOR_DIMENSIONS
+        )
+        self._collection_manager = VectorCollectionManager(self._qdrant_client)
         self.create_collection(self.collection_name)
         self.vector_store: QdrantVectorStore = QdrantVectorStore(
             client=self._qdrant_client,
@@ -53,19 +75,15 @@ class ArticleVectorService:
     def create_collection(self, collection_name: str) -> None:
         """
         Create a Qdrant collection for storing vectors.
+
+        The collection is created with the current schema version under a
+        versioned name and served through an alias called
+        ``collection_name``. Existing collections are left untouched; use
+        VectorCollectionManager.migrate to move them to a newer schema.
         """
-        if not self._qdrant_client.collection_exists(collection_name):
-            self._qdrant_client.create_collection(
-                collection_name=collection_name,
-                vectors_config={
-                    "dense": VectorParams(size=3072, distance=Distance.COSINE)
-                },
-                sparse_vectors_config={
-                    "sparse": SparseVectorParams(
-                        index=models.SparseIndexParams(on_disk=False)
-                    )
-                },
-            )
+        self._collection_manager.ensure_collection(
+            collection_name, self._collection_schema
+        )
 
     def delete_collection(self, collection_name: str):
         """
@@ -82,49 +100,329 @@ class ArticleVectorService:
         """
         return self._qdrant_client.get_collections()
 
-    async def add_articles(self, articles: List[Article]) -> None:
+    @staticmethod
+    def _article_metadata(article: Article) -> dict:
+        return {
+            "id": str(article.id),
+            "subscription_id": str(article.subscription_id),
+            "title": article.title,
+            "published_at": (
+                article.published_at.isoformat()
+                if article.published_at
+                else None
+            ),
+            "language": article.language,
+        }
+
+    @staticmethod
+    def build_filter(
+        subscription_ids: Optional[Sequence[uuid.UUID]] = None,
+        published_after: Optional[datetime] = None,
+        published_before: Optional[datetime] = None,
+        language: Optional[str] = None,
+    ) -> Optional[models.Filter]:
+        """
+        Translate article filters into a Qdrant filter on the indexed
+        payload fields. Returns None if no filter is given.
+        Args:
+            subscription_ids: Only articles of these subscriptions.
+            published_after: Only articles published at or after this time.
+            published_before: Only articles published at or before this
+                time.
+            language: Only articles in this language.
+        """
+        conditions: List[models.Condition] = []
+        if subscription_ids:
+            conditions.append(
+                models.FieldCondition(
+                    key=SUBSCRIPTION_ID_FIELD,
+                    match=models.MatchAny(
+                        any=[str(s_id) for s_id in subscription_ids]
+                    ),
+                )
+            )
+        if published_after is not None or published_before is not None:
+            conditions.append(
+                models.FieldCondition(
+                    key=PUBLISHED_AT_FIELD,
+                    range=models.DatetimeRange(
+                        gte=published_after, lte=published_before
+                    ),
+                )
+            )
+        if language:
+            conditions.append(
+                models.FieldCondition(
+                    key=LANGUAGE_FIELD,
+                    match=models.MatchValue(value=language),
+                )
+            )
+        return models.Filter(must=conditions) if conditions else None
+
+    async def add_articles(
+        self, articles: List[Article], chunk_size: int = 64
+    ) -> None:
         """
         Add a list of articles to the vector store.
+
+        Articles are embedded in chunks, with at most
+        ARTICLE_EMBEDDING_CONCURRENCY chunks in flight, and upserted
+        through the async Qdrant client. Each upsert waits until Qdrant
+        has applied the points, so that articles marked EMBEDDED can be
+        retrieved right away. The status of all successfully upserted
+        articles is then flipped to EMBEDDED with a single UPDATE.
         Args:
             articles(List[Article]): Articles to index.
+            chunk_size(int): Number of articles per embedding request.
 
         """
+        if not articles:
+            return
 
-        documents = []
-        uuids = []
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(configs.ARTICLE_EMBEDDING_CONCURRENCY)
+        chunks = [
+            articles[i : i + chunk_size]
+            for i in range(0, len(articles), chunk_size)
+        ]
+        results = await asyncio.gather(
+            *(self._embed_and_upsert(chunk, semaphore) for chunk in chunks),
+            return_exceptions=True,
+        )
 
-        for article in articles:
-            documents.append(
-                Document(
-                    page_content=article.summary,
-                    metadata={
-                        "id": str(article.id),
-                        "subscription_id": str(article.subscription_id),
-                        "title": article.title,
-                    },
+        embedded: List[Article] = []
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Error embedding {len(chunk)} articles "
+                    f"starting at {chunk[0].id}: {result}"
                 )
-            )
-            uuids.append(str(article.id))
+            else:
+                embedded.extend(chunk)
+
+        embedded_at = datetime.now(timezone.utc)
+        await ArticleRepository.mark_articles_embedded(
+            [article.id for article in embedded], embedded_at
+        )
+        for article in embedded:
             article.status = ArticleStatus.EMBEDDED
-            await ArticleRepository.update_article(article)
+            article.embedded_at = embedded_at
+
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"Embedded {len(embedded)}/{len(articles)} articles in "
+            f"{elapsed:.2f}s ({len(embedded) / elapsed:.1f} articles/s)"
+        )
 
-        self.vector_store.add_documents(documents=documents, ids=uuids)
+    async def _embed_and_upsert(
+        self, articles: List[Article], semaphore: asyncio.Semaphore
+    ) -> None:
+        """
+        Embed one chunk of articles (dense and sparse) and upsert the
+        resulting points into Qdrant.
+        """
+        texts = [article.summary for article in articles]
+        async with semaphore:
+            dense_vectors = await self._dense_embeddings.aembed_documents(
+                texts
+            )
+            sparse_vectors = await asyncio.to_thread(
+                self._sparse_embeddings.embed_documents, texts
+            )
+            points = [
+                models.PointStruct(
+                    id=str(article.id),
+                    vector={
+                        "dense": dense_vector,
+                        "sparse": models.SparseVector(
+                            indices=sparse_vector.indices,
+                            values=sparse_vector.values,
+                        ),
+                    },
+                    payload={
+                        "page_content": article.summary,
+                        "metadata": self._article_metadata(article),
+                    },
+                )
+                for article, dense_vector, sparse_vector in zip(
+                    articles, dense_vectors, sparse_vectors
+                )
+            ]
+            await self._async_qdrant_client.upsert(
+                collection_name=self.collection_name,
+                points=points,
+                wait=True,
+            )
 
     async def retrieve_by_similarity(
-        self, query: str, score_threshold: float = 0.7
+        self,
+        query: str,
+        score_threshold: float = 0.7,
+        subscription_ids: Optional[Sequence[uuid.UUID]] = None,
+        published_after: Optional[datetime] = None,
+        published_before: Optional[datetime] = None,
+        language: Optional[str] = None,
     ) -> list[tuple[Document, float]]:
         """
         Retrieve query-relevant documents from the vector store.
+
+        The optional filters are applied by Qdrant during the search,
+        see ``build_filter``.
         Args:
             query (str): The query string to search for.
             score_threshold (float): Minimum score threshold for results.
+            subscription_ids: Only articles of these subscriptions.
+            published_after: Only articles published at or after this time.
+            published_before: Only articles published at or before this
+                time.
+            language: Only articles in this language.
 
         Returns:
             List[Document]: List of documents that match the query.
         """
 
         return self.vector_store.similarity_search_with_score(
-            query=query, score_threshold=score_threshold
+            query=query,
+            score_threshold=score_threshold,
+            filter=self.build_filter(
+                subscription_ids, published_after, published_before, language
+            ),
+            search_params=self._collection_schema.search_params(),
+        )
+
+    def embed_queries(self, queries: Sequence[str]) -> List[List[float]]:
+        """
+        Embed query strings with the (cached) dense embedding model.
+        """
+        return self._dense_embeddings.embed_queries(queries)
+
+    def retrieve_vectors(
+        self, article_ids: Sequence[uuid.UUID]
+    ) -> Dict[uuid.UUID, List[float]]:
+        """
+        Fetch the stored dense vectors of the given articles.
+        Args:
+            article_ids: IDs of the articles to fetch.
+
+        Returns:
+            Dict[UUID, List[float]]: Map of article ID to dense vector.
+            Articles missing from the collection are left out.
+        """
+        if not article_ids:
+            return {}
+
+        records = self._qdrant_client.retrieve(
+            collection_name=self.collection_name,
+            ids=[str(article_id) for article_id in article_ids],
+            with_payload=False,
+            with_vectors=["dense"],
+        )
+        return {
+            uuid.UUID(str(record.id)): record.vector["dense"]
+            for record in records
+            if record.vector and "dense" in record.vector
+        }
+
+    async def retrieve_by_similarity_batch(
+        self,
+        queries: Sequence[str],
+        score_thresholds: Sequence[float] | float = 0.7,
+        k: int = 4,
+        query_filter: Optional[models.Filter] = None,
+    ) -> list[list[tuple[Document, float]]]:
+        """
+        Retrieve query-relevant documents for several queries at once.
+
+        All queries are embedded with a single embeddings call and sent to
+        Qdrant as one batch of hybrid (dense + sparse, RRF-fused) queries.
+        Args:
+            queries (Sequence[str]): The query strings to search for.
+            score_thresholds (Sequence[float] | float): Minimum score per
+                query, or one threshold shared by all queries.
+            k (int): Maximum number of results per query.
+            query_filter (Optional[models.Filter]): Filter applied to every
+                query, e.g. from ``build_filter``.
+
+        Returns:
+            list[list[tuple[Document, float]]]: One result list per query,
+            in the same order as ``queries``.
+        """
+        if not queries:
+            return []
+
+        if isinstance(score_thresholds, (int, float)):
+            score_thresholds = [float(score_thresholds)] * len(queries)
+        if len(score_thresholds) != len(queries):
+            raise ValueError("score_thresholds must match queries in length")
+
+        # Both embedding models block, keep them off the event loop. BM25
+        # encodes queries differently from documents, as in the
+        # langchain search used by retrieve_by_similarity.
+        dense_vectors, sparse_vectors = await asyncio.gather(
+            asyncio.to_thread(self._dense_embeddings.embed_queries, queries),
+            asyncio.to_thread(
+                lambda: [
+                    self._sparse_embeddings.embed_query(query)
+                    for query in queries
+                ]
+            ),
+        )
+
+        search_params = self._collection_schema.search_params()
+        requests = [
+            models.QueryRequest(
+                prefetch=[
+                    models.Prefetch(
+                        query=dense_vector,
+                        using="dense",
+                        filter=query_filter,
+                        limit=k,
+                        params=search_params,
+                    ),
+                    models.Prefetch(
+                        query=models.SparseVector(
+                            indices=sparse_vector.indices,
+                            values=sparse_vector.values,
+                        ),
+                        using="sparse",
+                        filter=query_filter,
+                        limit=k,
+                    ),
+                ],
+                query=models.FusionQuery(fusion=models.Fusion.RRF),
+                limit=k,
+                score_threshold=threshold,
+                with_payload=True,
+            )
+            for dense_vector, sparse_vector, threshold in zip(
+                dense_vectors, sparse_vectors, score_thresholds
+            )
+        ]
+
+        responses = await self._async_qdrant_client.query_batch_points(
+            collection_name=self.collection_name, requests=requests
+        )
+
+        return [
+            [
+                (self._document_from_point(point), point.score)
+                for point in response.points
+            ]
+            for response in responses
+        ]
+
+    @staticmethod
+    def _document_from_point(point: models.ScoredPoint) -> Document:
+        """
+        Convert a Qdrant point into a Document, using the payload layout
+        written by QdrantVectorStore.
+        """
+        payload = point.payload or {}
+        metadata = dict(payload.get("metadata") or {})
+        metadata["_id"] = point.id
+        return Document(
+            page_content=payload.get("page_content", ""),
+            metadata=metadata,
         )
 
     async def index_summarized_articles_to_vector_store(
@@ -133,25 +431,47 @@ class ArticleVectorService:
         datetime_start: datetime = datetime.combine(
             date.today(), datetime.min.time()
         ),
-        datetime_end: datetime = datetime.now(),
+        datetime_end: Optional[datetime] = None,
+        queue_size: int = 2,
+        workers: int = 2,
     ) -> None:
         """
         Run the functionality to read articles from the database and
         add them to the vector store.
+
+        A producer reads pages of articles into a bounded queue while
+        `workers` consumers embed and upsert them, so database reads,
+        embedding and Qdrant upserts overlap.
         """
-        try:
-            articles: List[Article] = (
-                await ArticleRepository.list_articles_with_summary(
-                    limit=page_size, date_start=datetime_start
-                )
-            )
+        queue: asyncio.Queue[Optional[List[Article]]] = asyncio.Queue(
+            maxsize=queue_size
+        )
 
-            while len(articles) > 0:
-                await self.add_articles(articles)
+        async def produce() -> None:
+            try:
+                async for page in ArticleRepository.iter_articles_with_summary(
+                    page_size=page_size,
+                    datetime_start=datetime_start,
+                    datetime_end=datetime_end,
+                ):
+                    await queue.put(page)
+            finally:
+                for _ in range(workers):
+                    await queue.put(None)
 
-                articles = await ArticleRepository.list_articles_with_summary(
-                    limit=page_size, date_start=datetime_start
-                )
+        async def consume() -> None:
+            while (page := await queue.get()) is not None:
+                try:
+                    await self.add_articles(page)
+                except Exception as e:
+                    logger.error(
+                        f"Error indexing page of {len(page)} articles: {e}"
+                    )
+
+        try:
+            await asyncio.gather(
+                produce(), *(consume() for _ in range(workers))
+            )
         except Exception as e:
             logger.error(
                 f"Error indexing summarized articles to vector store: {e}"
@@ -177,20 +497,62 @@ class ArticleVectorService:
                 f"Article with ID {article_id} not found or has no summary."
             )
             return
+        if article.duplicate_of_id:
+            logger.info(
+                f"Article {article_id} is a near-duplicate of article "
+                f"{article.duplicate_of_id}, not adding it."
+            )
+            return
 
         document = Document(
             page_content=article.summary,
-            metadata={
-                "id": str(article.id),
-                "subscription_id": str(article.subscription_id),
-                "title": article.title,
-            },
+            metadata=self._article_metadata(article),
         )
 
         self.vector_store.add_documents(
             documents=[document], ids=[str(article.id)]
         )
 
+    async def sync_payloads(self, page_size: int = 500) -> int:
+        """
+        Rewrite the metadata payload of every stored article from the
+        database, e.g. after new filter fields were added to it.
+
+        Returns:
+            int: Number of updated points.
+        """
+        updated = 0
+        offset = None
+        while True:
+            records, offset = self._qdrant_client.scroll(
+                collection_name=self.collection_name,
+                limit=page_size,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False,
+            )
+            articles = await ArticleRepository.get_articles_by_ids(
+                [uuid.UUID(str(record.id)) for record in records]
+            )
+            if articles:
+                self._qdrant_client.batch_update_points(
+                    collection_name=self.collection_name,
+                    update_operations=[
+                        models.SetPayloadOperation(
+                            set_payload=models.SetPayload(
+                                payload=self._article_metadata(article),
+                                points=[str(article.id)],
+                                key="metadata",
+                            )
+                        )
+                        for article in articles
+                    ],
+                )
+                updated += len(articles)
+            if offset is None:
+                logger.info(f"Synced payloads of {updated} articles")
+                return updated
+
     def delete_articles_by_ids(self, article_ids: List[str]) -> int:
         """
         Delete articles from the vector store by their IDs.
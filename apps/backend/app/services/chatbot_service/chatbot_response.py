@@ -1,4 +1,3 @@
-import asyncio
 from io import BytesIO
 from uuid import UUID
 
@@ -96,8 +95,7 @@ resolve the user's query.
 
         llm_client = LLMClient(TaskModelMapping.CHATBOT)
         try:
-            llm_response = await asyncio.to_thread(
-                llm_client.generate_response,
+            llm_response = await llm_client.agenerate_response(
                 prompt=prompt,
                 file=report_file,
                 temperature=0.7,
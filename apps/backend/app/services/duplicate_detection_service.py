@@ -0,0 +1,239 @@
+"""
+Duplicate Detection
+
+The same story reaches us through several sources: with different URLs,
+as AMP pages and as syndicated copies. Right after scraping, each article
+is compared with the articles of the same subscription scraped in the
+last ``ARTICLE_DUPLICATE_WINDOW_DAYS`` days, and marked as a duplicate of
+the first of them that
+
+- has the same canonical URL, or
+- has a content fingerprint within ``MAX_DISTANCE`` bits of its own.
+
+The fingerprint is a 64-bit SimHash of the word shingles of the content.
+Near-duplicates keep their status and get ``duplicate_of_id`` set, which
+excludes them from summarization, translation and embedding. Articles
+of different subscriptions are never duplicates of each other, since
+search profiles only match the articles of their own subscriptions.
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from app.core.config import get_configs
+from app.core.db import async_session
+from app.core.logger import get_logger
+from app.repositories.article_repository import ArticleRepository
+from app.services.web_harvester.utils.url_utils import canonicalize_url
+
+configs = get_configs()
+logger = get_logger(__name__)
+
+FINGERPRINT_BITS = 64
+# Words per shingle
+SHINGLE_SIZE = 3
+# Maximum number of differing bits between the fingerprints of duplicates
+MAX_DISTANCE = 3
+# Shorter contents (teasers, paywall notices) are too similar to compare
+MIN_CONTENT_CHARS = 500
+
+# Fingerprints within MAX_DISTANCE bits share at least one of
+# MAX_DISTANCE + 1 bands, so only articles sharing a band are compared
+_BANDS = MAX_DISTANCE + 1
+_BAND_BITS = FINGERPRINT_BITS // _BANDS
+_MASK = (1 << FINGERPRINT_BITS) - 1
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def _to_signed(value: int) -> int:
+    """Fit an unsigned 64-bit value into a BIGINT column."""
+    return value - (1 << FINGERPRINT_BITS) if value >> 63 else value
+
+
+def content_fingerprint(text: Optional[str]) -> int:
+    """
+    SimHash of the word shingles of a text, as a signed 64-bit integer.
+    Texts that differ in a few words get fingerprints that differ in a
+    few bits.
+    """
+    words = _WORD_RE.findall((text or "").lower())
+    if not words:
+        return 0
+    size = min(SHINGLE_SIZE, len(words))
+    hashes = b"".join(
+        hashlib.blake2b(
+            " ".join(words[i : i + size]).encode(), digest_size=8
+        ).digest()
+        for i in range(len(words) - size + 1)
+    )
+    # One row of bits per shingle; a bit of the fingerprint is set if it
+    # is set in most shingle hashes
+    bits = np.unpackbits(
+        np.frombuffer(hashes, dtype=np.uint8).reshape(-1, 8), axis=1
+    )
+    majority = 2 * bits.sum(axis=0, dtype=np.int64) > len(bits)
+    fingerprint = int.from_bytes(np.packbits(majority).tobytes(), "big")
+    return _to_signed(fingerprint)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits of two fingerprints."""
+    return bin((a ^ b) & _MASK).count("1")
+
+
+def _bands(fingerprint: int) -> List[Tuple[int, int]]:
+    fingerprint &= _MASK
+    return [
+        (band, fingerprint >> (band * _BAND_BITS) & ((1 << _BAND_BITS) - 1))
+        for band in range(_BANDS)
+    ]
+
+
+class DuplicateIndex:
+    """
+    In-memory index of the canonical URLs and content fingerprints of
+    articles, to find the article a new article duplicates.
+    """
+
+    def __init__(self):
+        self._urls: Dict[str, UUID] = {}
+        self._fingerprints: Dict[UUID, int] = {}
+        self._bands: Dict[Tuple[int, int], List[UUID]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def add(
+        self,
+        article_id: UUID,
+        urls: Iterable[Optional[str]],
+        fingerprint: Optional[int] = None,
+    ) -> None:
+        """
+        Add an article by its URLs and, if its content is long enough to
+        compare, its fingerprint. The first article added for a URL is
+        kept.
+        """
+        for url in urls:
+            if url:
+                self._urls.setdefault(canonicalize_url(url), article_id)
+        if fingerprint is not None:
+            self._fingerprints[article_id] = fingerprint
+            for band in _bands(fingerprint):
+                self._bands[band].append(article_id)
+
+    def find(
+        self,
+        article_id: UUID,
+        urls: Iterable[Optional[str]],
+        fingerprint: Optional[int] = None,
+    ) -> Optional[UUID]:
+        """
+        Find an earlier article with one of the given URLs, or with a
+        fingerprint within MAX_DISTANCE bits of the given one.
+        """
+        for url in urls:
+            if not url:
+                continue
+            found = self._urls.get(canonicalize_url(url))
+            if found is not None and found != article_id:
+                return found
+        if fingerprint is None:
+            return None
+        seen: Set[UUID] = set()
+        for band in _bands(fingerprint):
+            for candidate in self._bands.get(band, ()):
+                if candidate == article_id or candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = hamming_distance(
+                    fingerprint, self._fingerprints[candidate]
+                )
+                if distance <= MAX_DISTANCE:
+                    return candidate
+        return None
+
+
+class DuplicateDetectionService:
+    @staticmethod
+    async def _load_indexes(since: datetime) -> Dict[UUID, DuplicateIndex]:
+        """Index the recent articles of each subscription."""
+        indexes: Dict[UUID, DuplicateIndex] = defaultdict(DuplicateIndex)
+        candidates = await ArticleRepository.list_duplicate_candidates(since)
+        for (
+            article_id,
+            subscription_id,
+            url,
+            canonical_url,
+            fingerprint,
+            length,
+        ) in candidates:
+            indexes[subscription_id].add(
+                article_id,
+                (url, canonical_url),
+                fingerprint if length >= MIN_CONTENT_CHARS else None,
+            )
+        logger.info(
+            f"Loaded {len(candidates)} recent articles to check for "
+            "duplicates"
+        )
+        return indexes
+
+    @staticmethod
+    async def run(
+        page_size: int = 500,
+        datetime_start: Optional[datetime] = None,
+    ) -> int:
+        """
+        Fingerprint the scraped articles that have not been checked yet
+        and mark the duplicates of recent articles of the same
+        subscription.
+
+        Returns:
+            int: Number of articles marked as duplicates.
+        """
+        since = (datetime_start or datetime.now(timezone.utc)) - timedelta(
+            days=configs.ARTICLE_DUPLICATE_WINDOW_DAYS
+        )
+        indexes = await DuplicateDetectionService._load_indexes(since)
+
+        checked = 0
+        duplicates = 0
+        iterate = ArticleRepository.iter_articles_without_fingerprint
+        async for articles in iterate(
+            page_size=page_size, datetime_start=datetime_start
+        ):
+            fingerprints: Dict[UUID, Tuple[int, Optional[UUID]]] = {}
+            for article in articles:
+                urls = (article.url, article.canonical_url)
+                fingerprint = content_fingerprint(article.content)
+                comparable = (
+                    fingerprint
+                    if len(article.content or "") >= MIN_CONTENT_CHARS
+                    else None
+                )
+                index = indexes[article.subscription_id]
+                duplicate_of_id = index.find(article.id, urls, comparable)
+                if duplicate_of_id is None:
+                    index.add(article.id, urls, comparable)
+                else:
+                    duplicates += 1
+                fingerprints[article.id] = (fingerprint, duplicate_of_id)
+
+            async with async_session() as session:
+                await ArticleRepository.update_article_fingerprints(
+                    session, fingerprints
+                )
+                await session.commit()
+            checked += len(fingerprints)
+        logger.info(
+            f"Checked {checked} articles for duplicates, found {duplicates}"
+        )
+        return duplicates
@@ -0,0 +1,199 @@
+"""
+Language Detection
+
+Detects the language of each article once, right after scraping, and
+stores it in ``Article.language`` and, per text field, in
+``Article.field_languages``. Later stages (translation, summarization,
+reports) read the stored languages instead of detecting them again.
+
+Detection counts function words of the languages our sources publish in,
+which is fast and deterministic. Texts without enough function words
+(mostly short titles) fall back to langdetect with a fixed seed.
+"""
+
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from babel import Locale, UnknownLocaleError
+from langdetect import DetectorFactory, LangDetectException
+from langdetect import detect as langdetect_detect
+
+from app.core.db import async_session
+from app.core.logger import get_logger
+from app.repositories.article_repository import ArticleRepository
+
+logger = get_logger(__name__)
+
+# Make the langdetect fallback deterministic
+DetectorFactory.seed = 0
+
+DETECTED_FIELDS = ("title", "content")
+
+# Only the start of long texts is looked at
+SAMPLE_CHARS = 2000
+# Function words needed to decide without the fallback
+MIN_STOPWORD_HITS = 3
+
+STOPWORDS = {
+    "en": (
+        "the and of to in is that for it with as was on are be by this "
+        "from at have has not but or an which they their will would "
+        "been were its who more said"
+    ),
+    "de": (
+        "der die das und ist nicht ein eine zu den mit sich des auf für "
+        "im dem von auch es als nach bei wird sind wie aus oder noch "
+        "einer werden hat über sie"
+    ),
+    "fr": (
+        "le la les et des du une est dans pour que qui pas sur au par "
+        "plus avec ce sont ont cette aux été mais leur il elle"
+    ),
+    "es": (
+        "el los las del y en que por con para una es se al lo como más "
+        "pero sus su ha fue este esta son entre también"
+    ),
+    "it": (
+        "il di che della per non una sono del con gli le nel alla più "
+        "anche dei si ha ma come questo delle è stato"
+    ),
+    "nl": (
+        "de het een van en in is dat op te zijn voor met niet aan er "
+        "ook als bij maar om door wordt naar dan"
+    ),
+}
+
+_STOPWORD_LANGUAGES: Dict[str, Tuple[str, ...]] = {}
+for _language, _words in STOPWORDS.items():
+    for _word in _words.split():
+        _STOPWORD_LANGUAGES[_word] = _STOPWORD_LANGUAGES.get(_word, ()) + (
+            _language,
+        )
+
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+# ISO 639-2 and names used by sources, mapped to ISO 639-1
+_LANGUAGE_ALIASES = {
+    "eng": "en",
+    "english": "en",
+    "deu": "de",
+    "ger": "de",
+    "german": "de",
+    "deutsch": "de",
+    "fra": "fr",
+    "fre": "fr",
+    "spa": "es",
+    "ita": "it",
+    "nld": "nl",
+    "dut": "nl",
+}
+
+
+def normalize_language(language: Optional[str]) -> Optional[str]:
+    """
+    Normalize a language given by a source (e.g. "deu", "de-AT",
+    "English") to an ISO 639-1 code, or None if it is not recognized.
+    """
+    if not language:
+        return None
+    code = re.split(r"[-_]", language.strip().lower())[0]
+    code = _LANGUAGE_ALIASES.get(code, code)
+    return code if len(code) == 2 and code.isalpha() else None
+
+
+def language_name(language: Optional[str]) -> Optional[str]:
+    """English name of a language code, e.g. "German" for "de"."""
+    if not language:
+        return None
+    try:
+        return Locale.parse(language).english_name
+    except (UnknownLocaleError, TypeError, ValueError):
+        return None
+
+
+def detect_language(text: Optional[str]) -> Optional[str]:
+    """
+    Detect the ISO 639-1 language code of a text, or None if the text
+    has no words or its language cannot be determined.
+    """
+    if not text:
+        return None
+    sample = text[:SAMPLE_CHARS].lower()
+    words = _WORD_RE.findall(sample)
+    if not words:
+        return None
+
+    hits = Counter()
+    for word in words:
+        for language in _STOPWORD_LANGUAGES.get(word, ()):
+            hits[language] += 1
+    ranked = hits.most_common(2)
+    if ranked and ranked[0][1] >= MIN_STOPWORD_HITS:
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0
+        if ranked[0][1] >= 2 * runner_up:
+            return ranked[0][0]
+
+    try:
+        return langdetect_detect(sample)
+    except LangDetectException:
+        return None
+
+
+def detect_article_languages(
+    article,
+) -> Tuple[Optional[str], Dict[str, Optional[str]]]:
+    """
+    Detect the language of the text fields of an article.
+
+    Returns:
+        tuple: The article language (that of its content, else that of
+        its title, else the normalized language given by the source) and
+        the language of each field.
+    """
+    field_languages = {
+        field: detect_language(getattr(article, field, None))
+        for field in DETECTED_FIELDS
+    }
+    language = (
+        field_languages["content"]
+        or field_languages["title"]
+        or normalize_language(article.language)
+    )
+    return language, field_languages
+
+
+class LanguageDetectionService:
+    @staticmethod
+    async def run(
+        page_size: int = 500,
+        datetime_start: Optional[datetime] = None,
+    ) -> int:
+        """
+        Detect and store the languages of all scraped articles whose
+        languages have not been detected yet.
+
+        Returns:
+            int: Number of updated articles.
+        """
+        updated = 0
+        iterate = ArticleRepository.iter_articles_without_field_languages
+        async for articles in iterate(
+            page_size=page_size, datetime_start=datetime_start
+        ):
+            languages: Dict[
+                UUID, Tuple[Optional[str], Dict[str, Optional[str]]]
+            ] = {
+                article.id: detect_article_languages(article)
+                for article in articles
+            }
+            async with async_session() as session:
+                await ArticleRepository.update_article_languages(
+                    session, languages
+                )
+                await session.commit()
+            updated += len(languages)
+        logger.info(f"Detected the languages of {updated} articles")
+        return updated
@@ -0,0 +1,71 @@
+from functools import partial
+
+from app.core.logger import get_logger
+from app.models.llm_batch_job import LLMBatchPurpose
+from app.repositories.article_repository import ArticleRepository
+from app.repositories.entity_translation_repository import (
+    EntityTranslationRepository,
+)
+from app.repositories.llm_batch_job_repository import LLMBatchJobRepository
+from app.services.article_summary_service import ArticleSummaryService
+from app.services.llm_service.batch_runner import (
+    FINAL_STATUSES,
+    STALE_APPLY_AFTER,
+    BatchRunner,
+)
+from app.services.translation_service import ArticleTranslationService
+
+logger = get_logger(__name__)
+
+
+class LLMBatchReconciler:
+    """
+    Applies the results of recorded batch API jobs that finished after the
+    run that submitted them stopped waiting, e.g. because the process was
+    restarted or the batches were submitted without waiting.
+    """
+
+    _handlers = {
+        LLMBatchPurpose.ARTICLE_SUMMARY: (
+            ArticleSummaryService.store_batch_output
+        ),
+        LLMBatchPurpose.ARTICLE_TRANSLATION: partial(
+            ArticleTranslationService.store_batch_output,
+            repository=ArticleRepository,
+        ),
+        LLMBatchPurpose.ENTITY_TRANSLATION: partial(
+            ArticleTranslationService.store_batch_output,
+            repository=EntityTranslationRepository,
+        ),
+    }
+
+    @staticmethod
+    async def run() -> int:
+        """
+        Check every unapplied job once and apply the finalized ones.
+
+        Returns:
+            int: Number of applied jobs.
+        """
+        runner = BatchRunner()
+        jobs = await LLMBatchJobRepository.get_unapplied_jobs(
+            STALE_APPLY_AFTER
+        )
+        applied = 0
+        for job in jobs:
+            try:
+                batch = await runner.retrieve(job.batch_id)
+                if batch.status not in FINAL_STATUSES:
+                    logger.info(f"Batch {job.batch_id} status: {batch.status}")
+                    continue
+                lines = await runner.apply_job(
+                    batch, LLMBatchReconciler._handlers[job.purpose]
+                )
+                logger.info(
+                    f"Applied {lines} results of {job.purpose.value} "
+                    f"batch {job.batch_id}"
+                )
+                applied += 1
+            except Exception as e:
+                logger.error(f"Error applying batch {job.batch_id}: {e}")
+        return applied
@@ -0,0 +1,359 @@
+"""
+LLM Batch Runner
+
+Runs large jobs through OpenAI's batch API without holding them in memory:
+
+- requests are written as they are produced to uniquely named temporary
+  JSONL files, starting a new file whenever the provider's request or
+  byte limit per batch would be exceeded
+- each file is uploaded and submitted as soon as it is complete, and up to
+  ``max_concurrent_batches`` batches run at the same time
+- batches are polled with exponential backoff
+- output files are downloaded to a temporary file and parsed line by line,
+  handing the parsed lines to a store callback in chunks
+
+Batches submitted with a purpose are recorded in the llm_batch_jobs table.
+Their results are applied either by the run that submitted them or, if
+that run does not wait or does not survive, by the LLMBatchReconciler.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from litellm import acreate_batch, acreate_file, aretrieve_batch
+from openai import AsyncOpenAI
+
+from app.core.config import get_configs
+from app.core.logger import get_logger
+from app.models.llm_batch_job import LLMBatchJobStatus, LLMBatchPurpose
+from app.repositories.llm_batch_job_repository import LLMBatchJobRepository
+from app.services.llm_service.llm_client import get_async_http_client
+
+configs = get_configs()
+logger = get_logger(__name__)
+
+FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+# A job being applied for longer than this is assumed to be abandoned
+STALE_APPLY_AFTER = timedelta(hours=1)
+
+ResultsCallback = Callable[[List[dict]], Awaitable[Any]]
+
+
+class BatchRunner:
+    """
+    Parameters:
+        max_requests (int): Maximum number of requests per batch file
+        max_bytes (int): Maximum size of a batch file in bytes
+        max_concurrent_batches (int): Batches that run at the same time
+        poll_interval (float): First wait between status checks, seconds
+        max_poll_interval (float): Longest wait between status checks
+        chunk_size (int): Parsed output lines per store callback call
+
+    Examples:
+        >>> runner = BatchRunner()
+        >>> await runner.run(requests, store_results)
+    """
+
+    def __init__(
+        self,
+        max_requests: int = configs.LLM_BATCH_MAX_REQUESTS,
+        max_bytes: int = configs.LLM_BATCH_MAX_BYTES,
+        max_concurrent_batches: int = configs.LLM_BATCH_MAX_CONCURRENT,
+        poll_interval: float = 10.0,
+        max_poll_interval: float = 300.0,
+        chunk_size: int = 500,
+    ):
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self.max_concurrent_batches = max_concurrent_batches
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def _new_file() -> Path:
+        fd, path = tempfile.mkstemp(prefix="llm_batch_", suffix=".jsonl")
+        os.close(fd)
+        return Path(path)
+
+    async def write_batch_files(
+        self, requests: AsyncIterable[dict]
+    ) -> AsyncIterator[Tuple[Path, List[str]]]:
+        """
+        Write requests to temporary JSONL files, yielding each file and the
+        custom_ids of its requests once it is complete. Callers delete the
+        files.
+        """
+        path = None
+        f = None
+        custom_ids = []
+        size = 0
+        try:
+            async for request in requests:
+                line = (json.dumps(request, ensure_ascii=False) + "\n").encode(
+                    "utf-8"
+                )
+                if f is not None and (
+                    len(custom_ids) >= self.max_requests
+                    or size + len(line) > self.max_bytes
+                ):
+                    f.close()
+                    f = None
+                    yield path, custom_ids
+                if f is None:
+                    path = self._new_file()
+                    f = path.open("wb")
+                    custom_ids = []
+                    size = 0
+                f.write(line)
+                custom_ids.append(request["custom_id"])
+                size += len(line)
+            if f is not None:
+                f.close()
+                f = None
+                yield path, custom_ids
+        finally:
+            if f is not None:
+                f.close()
+                path.unlink(missing_ok=True)
+
+    @staticmethod
+    async def submit(
+        path: Path,
+        custom_ids: List[str],
+        purpose: Optional[LLMBatchPurpose] = None,
+    ) -> str:
+        """
+        Upload a batch file and create its batch job, recording the job if
+        a purpose is given.
+
+        Returns:
+            str: The ID of the batch job.
+        """
+        with path.open("rb") as f:
+            file_obj = await acreate_file(
+                file=f, purpose="batch", custom_llm_provider="openai"
+            )
+        batch = await acreate_batch(
+            completion_window="24h",
+            endpoint="/v1/chat/completions",
+            input_file_id=file_obj.id,
+            custom_llm_provider="openai",
+            litellm_logging=False,
+        )
+        logger.info(f"Batch {batch.id} created from {path.name}")
+        if purpose is not None:
+            await LLMBatchJobRepository.create_job(
+                batch.id, purpose, custom_ids
+            )
+        return batch.id
+
+    @staticmethod
+    async def retrieve(batch_id: str):
+        return await aretrieve_batch(
+            batch_id=batch_id, custom_llm_provider="openai"
+        )
+
+    async def wait(self, batch_id: str):
+        """
+        Poll a batch job with exponential backoff until it finalizes.
+
+        Returns:
+            Batch: The final state of the batch job.
+        """
+        interval = self.poll_interval
+        while True:
+            batch = await self.retrieve(batch_id)
+            if batch.status in FINAL_STATUSES:
+                return batch
+            logger.info(f"Batch {batch_id} status: {batch.status}")
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, self.max_poll_interval)
+
+    @staticmethod
+    async def _download(file_id: str, path: Path) -> None:
+        client = AsyncOpenAI(
+            api_key=configs.OPENAI_API_KEY,
+            http_client=get_async_http_client(),
+        )
+        async with client.files.with_streaming_response.content(
+            file_id
+        ) as response:
+            await response.stream_to_file(path)
+
+    async def apply_output(
+        self, file_id: Optional[str], on_results: ResultsCallback
+    ) -> int:
+        """
+        Download an output or error file of a batch and hand its parsed
+        lines to ``on_results`` in chunks of ``chunk_size``.
+
+        Returns:
+            int: Number of parsed lines.
+        """
+        if not file_id:
+            return 0
+        path = self._new_file()
+        parsed = 0
+        try:
+            await self._download(file_id, path)
+            chunk = []
+            with path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        chunk.append(json.loads(line))
+                    except ValueError as e:
+                        logger.error(f"Invalid batch output line: {e}")
+                        continue
+                    if len(chunk) >= self.chunk_size:
+                        await on_results(chunk)
+                        parsed += len(chunk)
+                        chunk = []
+            if chunk:
+                await on_results(chunk)
+                parsed += len(chunk)
+        finally:
+            path.unlink(missing_ok=True)
+        return parsed
+
+    async def apply_batch(self, batch, on_results: ResultsCallback) -> int:
+        """
+        Apply the output and error lines of a finalized batch.
+
+        Returns:
+            int: Number of parsed lines.
+        """
+        if batch.status != "completed":
+            logger.error(f"Batch {batch.id} was not completed: {batch.status}")
+        parsed = await self.apply_output(batch.output_file_id, on_results)
+        parsed += await self.apply_output(
+            getattr(batch, "error_file_id", None), on_results
+        )
+        return parsed
+
+    async def apply_job(self, batch, on_results: ResultsCallback) -> int:
+        """
+        Apply a finalized batch recorded in the llm_batch_jobs table and
+        record the outcome. Does nothing if another process applies it.
+
+        Returns:
+            int: Number of parsed lines.
+        """
+        claimed = await LLMBatchJobRepository.claim_job(
+            batch.id, STALE_APPLY_AFTER
+        )
+        if not claimed:
+            logger.info(f"Batch {batch.id} is already being applied")
+            return 0
+        try:
+            parsed = await self.apply_batch(batch, on_results)
+        except Exception as e:
+            await LLMBatchJobRepository.set_status(
+                batch.id, LLMBatchJobStatus.FAILED, error=str(e)
+            )
+            raise
+        if batch.status == "completed":
+            await LLMBatchJobRepository.set_status(
+                batch.id, LLMBatchJobStatus.APPLIED
+            )
+        else:
+            await LLMBatchJobRepository.set_status(
+                batch.id,
+                LLMBatchJobStatus.FAILED,
+                error=f"Batch {batch.status}",
+            )
+        return parsed
+
+    async def _run_file(
+        self,
+        path: Path,
+        custom_ids: List[str],
+        on_results: ResultsCallback,
+        slots: asyncio.Semaphore,
+        purpose: Optional[LLMBatchPurpose],
+    ) -> int:
+        async with slots:
+            try:
+                try:
+                    batch_id = await self.submit(path, custom_ids, purpose)
+                finally:
+                    path.unlink(missing_ok=True)
+                batch = await self.wait(batch_id)
+                if purpose is not None:
+                    return await self.apply_job(batch, on_results)
+                return await self.apply_batch(batch, on_results)
+            except Exception as e:
+                logger.error(f"Error during batch process: {e}")
+                return 0
+
+    async def run(
+        self,
+        requests: AsyncIterable[dict],
+        on_results: ResultsCallback,
+        purpose: Optional[LLMBatchPurpose] = None,
+    ) -> int:
+        """
+        Execute the complete lifecycle of a batch job of any size.
+
+        Args:
+            requests: Request payloads, see ``LLMClient.build_request_jsonl``
+            on_results: Coroutine receiving chunks of parsed output lines
+            purpose: Record the batches, so that the reconciler applies
+            them if this run is interrupted
+
+        Returns:
+            int: Number of output lines handed to ``on_results``.
+        """
+        slots = asyncio.Semaphore(self.max_concurrent_batches)
+        tasks = []
+        async for path, custom_ids in self.write_batch_files(requests):
+            tasks.append(
+                asyncio.create_task(
+                    self._run_file(
+                        path, custom_ids, on_results, slots, purpose
+                    )
+                )
+            )
+        if not tasks:
+            return 0
+        results = await asyncio.gather(*tasks)
+        logger.info(
+            f"Applied {sum(results)} results from {len(tasks)} batches"
+        )
+        return sum(results)
+
+    async def submit_all(
+        self, requests: AsyncIterable[dict], purpose: LLMBatchPurpose
+    ) -> List[str]:
+        """
+        Submit and record batches without waiting for them. Their results
+        are applied by the LLMBatchReconciler.
+
+        Returns:
+            List[str]: The IDs of the submitted batch jobs.
+        """
+        batch_ids = []
+        async for path, custom_ids in self.write_batch_files(requests):
+            try:
+                batch_ids.append(await self.submit(path, custom_ids, purpose))
+            finally:
+                path.unlink(missing_ok=True)
+        logger.info(f"Submitted {len(batch_ids)} {purpose.value} batches")
+        return batch_ids
@@ -1,26 +1,52 @@
 import asyncio
 import json
 from io import BytesIO
-from pathlib import Path
 from typing import List, Type, TypeVar
 
-from litellm import (
-    acreate_batch,
-    acreate_file,
-    afile_content,
-    aretrieve_batch,
-    completion,
-    create_file,
-)
+import httpx
+import litellm
+from litellm import acompletion, acreate_file, completion, create_file
 
 from app.core.config import get_configs
 from app.core.logger import get_logger
 from app.services.llm_service.llm_models import TaskModelMapping
+from app.services.llm_service.rate_limiter import (
+    estimate_tokens,
+    get_rate_limiter,
+)
+from app.services.llm_service.response_cache import (
+    build_cache_key,
+    get_response_cache,
+)
 
 configs = get_configs()
 logger = get_logger(__name__)
 
 
+_http_client: httpx.AsyncClient | None = None
+_http_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Get the pooled HTTP client shared by all async LLM calls of the
+    running event loop, and register it with litellm.
+    """
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=configs.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=configs.LLM_MAX_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(600.0, connect=10.0),
+        )
+        _http_client_loop = loop
+        litellm.aclient_session = _http_client
+    return _http_client
+
+
 class LLMClient:
     """
     This takes the LiteLLM Gateway to communicate to any LLM provider
@@ -31,16 +57,31 @@ class LLMClient:
         api_key (Optional[str]): API key for authentication. If None, assumes
         that environment variable is set accordingly
         https://docs.litellm.ai/docs/
+        use_cache (bool): Answer repeated text prompts from the LLM
+        response cache (see response_cache.py), if one is configured
+
+    Async calls go through the rate limiter of the model (see
+    rate_limiter.py). Its locks belong to an event loop, so the sync
+    methods bypass it; they are meant for scripts and tools that run
+    outside an event loop, and application code should use the async
+    methods.
 
     Examples:
         >>> service = LLMClient(LLMModels.GPT_4)
         >>> response = service.generate_response("Tell me a joke")
+        >>> response = await service.agenerate_response("Tell me a joke")
     """
 
-    def __init__(self, model: TaskModelMapping, max_retries: int = 1):
+    def __init__(
+        self,
+        model: TaskModelMapping,
+        max_retries: int = 1,
+        use_cache: bool = False,
+    ):
         self.model = model.value
         self.api_key = configs.OPENAI_API_KEY
         self.max_retries = max_retries
+        self.cache = get_response_cache() if use_cache else None
 
     def generate_response(
         self,
@@ -71,17 +112,41 @@ class LLMClient:
         data = json.loads(output)
         return resp_format_type(**data)
 
-    def __prompt(
+    async def agenerate_response(
         self,
         prompt: str,
-        resp_format=None,
         temperature: float = 0.1,
         image_url: str | None = None,
         file: BytesIO | None = None,
-    ):
-        messages = []
+    ) -> str:
+        return await self.__aprompt(
+            prompt, temperature=temperature, image_url=image_url, file=file
+        )
+
+    async def agenerate_typed_response(
+        self,
+        prompt: str,
+        resp_format_type: Type[T],
+        temperature: float = 0.1,
+        image_url: str = None,
+    ) -> T:
+        output = await self.__aprompt(
+            prompt,
+            resp_format=resp_format_type,
+            temperature=temperature,
+            image_url=image_url,
+        )
+        data = json.loads(output)
+        return resp_format_type(**data)
+
+    @staticmethod
+    def __build_messages(
+        prompt: str,
+        image_url: str | None = None,
+        file_id: str | None = None,
+    ) -> List[dict]:
         if image_url is not None:
-            messages.append(
+            return [
                 {
                     "role": "user",
                     "content": [
@@ -89,29 +154,25 @@ class LLMClient:
                         {"type": "image_url", "image_url": {"url": image_url}},
                     ],
                 }
-            )
-        elif file is not None:
-            uploaded_file = create_file(
-                file=file,
-                purpose="user_data",
-                custom_llm_provider="openai",
-                api_key=self.api_key,
-            )
-            messages = [
+            ]
+        if file_id is not None:
+            return [
                 {
                     "role": "user",
                     "content": [
                         {"type": "text", "text": prompt},
                         {
                             "type": "file",
-                            "file": {"file_id": uploaded_file.id},
+                            "file": {"file_id": file_id},
                         },
                     ],
                 }
             ]
-        else:
-            messages.append({"role": "user", "content": prompt})
+        return [{"role": "user", "content": prompt}]
 
+    def __build_kwargs(
+        self, messages: List[dict], resp_format, temperature: float
+    ) -> dict:
         kwargs = {
             "model": self.model,
             "messages": messages,
@@ -125,9 +186,111 @@ class LLMClient:
         if self.api_key:
             kwargs["api_key"] = self.api_key
 
+        return kwargs
+
+    def __cache_key(
+        self,
+        prompt: str,
+        resp_format,
+        temperature: float,
+        image_url: str | None,
+        file: BytesIO | None,
+    ) -> str | None:
+        # Requests with images or files are not cached
+        if self.cache is None or image_url is not None or file is not None:
+            return None
+        return build_cache_key(self.model, temperature, resp_format, prompt)
+
+    def __prompt(
+        self,
+        prompt: str,
+        resp_format=None,
+        temperature: float = 0.1,
+        image_url: str | None = None,
+        file: BytesIO | None = None,
+    ):
+        # Not rate limited, see the class docstring
+        cache_key = self.__cache_key(
+            prompt, resp_format, temperature, image_url, file
+        )
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        file_id = None
+        if image_url is None and file is not None:
+            uploaded_file = create_file(
+                file=file,
+                purpose="user_data",
+                custom_llm_provider="openai",
+                api_key=self.api_key,
+            )
+            file_id = uploaded_file.id
+
+        kwargs = self.__build_kwargs(
+            self.__build_messages(prompt, image_url, file_id),
+            resp_format,
+            temperature,
+        )
+
         try:
             response = completion(**kwargs)
-            return response.choices[0].message.content
+            content = response.choices[0].message.content
+            if cache_key is not None and content:
+                self.cache.set(cache_key, content)
+            return content
+
+        except Exception as e:
+            logger.exception(
+                f"Error occurred while generating response with model \
+                '{self.model}': {e}"
+            )
+            raise
+
+    async def __aprompt(
+        self,
+        prompt: str,
+        resp_format=None,
+        temperature: float = 0.1,
+        image_url: str | None = None,
+        file: BytesIO | None = None,
+    ):
+        cache_key = self.__cache_key(
+            prompt, resp_format, temperature, image_url, file
+        )
+        if cache_key is not None:
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                return cached
+
+        get_async_http_client()
+        file_id = None
+        if image_url is None and file is not None:
+            uploaded_file = await acreate_file(
+                file=file,
+                purpose="user_data",
+                custom_llm_provider="openai",
+                api_key=self.api_key,
+            )
+            file_id = uploaded_file.id
+
+        kwargs = self.__build_kwargs(
+            self.__build_messages(prompt, image_url, file_id),
+            resp_format,
+            temperature,
+        )
+
+        try:
+            limiter = get_rate_limiter(self.model)
+            async with limiter.slot(estimate_tokens(prompt)) as usage:
+                response = await acompletion(**kwargs)
+                if getattr(response, "usage", None) is not None:
+                    usage["used_tokens"] = response.usage.total_tokens
+            content = response.choices[0].message.content
+            if cache_key is not None and content:
+                await asyncio.to_thread(self.cache.set, cache_key, content)
+            return content
 
         except Exception as e:
             logger.exception(
@@ -166,168 +329,3 @@ class LLMClient:
                 "temperature": temperature,
             },
         }
-
-    @staticmethod
-    def generate_batch(
-        custom_ids: List[str],
-        prompts: List[str],
-        model: str,
-        temperature: float = 0.1,
-        output_filename: str = "batch.jsonl",
-    ) -> Path | None:
-        """
-        Generates a batch of request payloads in JSONL format and writes them
-        to a file for use with OpenAI's batch API.
-
-        Args:
-            custom_ids (List[str]): List of unique identifiers for each prompt.
-            prompts (List[str]): List of prompts to send to the model.
-            model (str): The name of the LLM model to be used.
-            temperature (float, optional): randomness.
-            output_filename (Optional[str): Name of the output .jsonl file.
-
-        Returns:
-            Path: Path object pointing to the created .jsonl file.
-        """
-        if len(custom_ids) != len(prompts):
-            logger.error("custom_ids must be the same length as prompts")
-            return None
-
-        lines = []
-        for i in range(len(prompts)):
-            request = LLMClient.build_request_jsonl(
-                custom_id=custom_ids[i],
-                model=model,
-                prompt=prompts[i],
-                temperature=temperature,
-            )
-            lines.append(request)
-
-        output_path = Path(output_filename)
-        with output_path.open("w", encoding="utf-8") as f:
-            for line in lines:
-                f.write(json.dumps(line, ensure_ascii=False) + "\n")
-
-        logger.info(f"Batch written to {output_path}")
-        return output_path
-
-    @staticmethod
-    async def upload_batch_file(jsonl_path: str):
-        """
-        Uploads a .jsonl file (batch) to OpenAI for use with the batch API.
-
-        Args:
-            jsonl_path (str): path to the .jsonl file containing
-            batch requests.
-
-        Returns:
-            File: the uploaded file object.
-        """
-        with open(jsonl_path, "rb") as f:
-            file_obj = await acreate_file(
-                file=f, purpose="batch", custom_llm_provider="openai"
-            )
-        logger.info(f"Batch uploaded to OpenAI: {file_obj.id}")
-        return file_obj
-
-    @staticmethod
-    async def create_batch_job(file_id: str):
-        """
-        Creates a new batch job in OpenAI using the ID of the uploaded file.
-
-        Args:
-            file_id (str): The ID of the uploaded .jsonl file containing
-            the batch requests.
-
-        Returns:
-            Batch: The created OpenAI batch job object.
-        """
-        batch = await acreate_batch(
-            completion_window="24h",
-            endpoint="/v1/chat/completions",
-            input_file_id=file_id,
-            custom_llm_provider="openai",
-            litellm_logging=False,
-        )
-        logger.info(f"Batch work created: {batch.id}")
-        return batch
-
-    @staticmethod
-    async def wait_for_batch_completion(batch_id: str) -> bool:
-        """
-        Checks the status of a batch job until it
-        finalizes (with error or not).
-
-        Args:
-            batch_id (str): The ID of the batch job to monitor.
-
-        Returns:
-            bool: True if the batch was completed successfully,
-            False otherwise.
-        """
-        current = await aretrieve_batch(
-            batch_id=batch_id, custom_llm_provider="openai"
-        )
-        while current.status not in (
-            "completed",
-            "failed",
-            "expired",
-            "cancelled",
-        ):
-            logger.info(f"Batch status: {current.status}")
-            await asyncio.sleep(10)
-            current = await aretrieve_batch(
-                batch_id=batch_id, custom_llm_provider="openai"
-            )
-        return current.status == "completed"
-
-    @staticmethod
-    async def retrieve_batch_output(batch_id: str) -> List[dict]:
-        """
-        Retrieves the results of a completed batch job from OpenAI.
-
-        Args:
-            batch_id (str): The ID of the completed batch job.
-
-        Returns:
-            List[dict]: A list of parsed JSON lines representing the responses
-            from the batch job.
-        """
-        current = await aretrieve_batch(
-            batch_id=batch_id, custom_llm_provider="openai"
-        )
-        batch_output = await afile_content(
-            file_id=current.output_file_id, custom_llm_provider="openai"
-        )
-        lines = batch_output.text.strip().splitlines()
-
-        return lines
-
-    @staticmethod
-    async def run_batch_api(jsonl_path: str):
-        """
-        Executes the complete lifecycle of a batch request to OpenAI
-
-        Args:
-            jsonl_path (str): Path to the JSONL file containing the
-            batch prompts.
-
-        Returns:
-            List[dict] | None: The list of response objects if successful,
-            or None if an error occurred.
-        """
-        try:
-            file = await LLMClient.upload_batch_file(jsonl_path)
-            batch = await LLMClient.create_batch_job(file.id)
-            completed = await LLMClient.wait_for_batch_completion(batch.id)
-
-            if not completed:
-                logger.error(f"The batch was not completed: {batch.id}")
-                return None
-
-            batch_output = await LLMClient.retrieve_batch_output(batch.id)
-            return batch_output
-
-        except Exception as e:
-            logger.error(f"Error during batch process: {e}")
-            return None
@@ -0,0 +1,255 @@
+"""
+LLM Rate Limiter
+
+Per-model limits shared by every async LLM caller of the running event
+loop:
+
+- token buckets for requests per minute and (estimated) tokens per minute,
+  refilled continuously up to one minute of budget
+- an AIMD concurrency limit that grows by about one slot per round of
+  requests while latency stays below a target (one slot per request until
+  the first back-off) and is halved on rate limit errors and timeouts
+- counters that show where the time goes (waiting for the limiter versus
+  waiting for the provider)
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+
+import litellm
+
+from app.core.config import get_configs
+from app.core.logger import get_logger
+
+configs = get_configs()
+logger = get_logger(__name__)
+
+# Allowance for the completion when estimating the tokens of a request
+COMPLETION_TOKEN_ESTIMATE = 1024
+
+
+def estimate_tokens(prompt: str) -> int:
+    """
+    Cheap estimate of the tokens a request consumes: about four
+    characters per prompt token plus an allowance for the completion.
+    """
+    return len(prompt) // 4 + COMPLETION_TOKEN_ESTIMATE
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate_per_minute`` up to one minute."""
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = float(rate_per_minute)
+        self.rate = rate_per_minute / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self, amount: float) -> None:
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def adjust(self, amount: float) -> None:
+        """
+        Give back (positive) or take (negative) tokens, e.g. once the
+        real usage of a request is known. May go below zero.
+        """
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class AdaptiveConcurrency:
+    """Concurrency limit with additive increase, multiplicative decrease."""
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        target_latency: float,
+        backoff_factor: float = 0.5,
+        backoff_cooldown: float = 5.0,
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff_factor = backoff_factor
+        self.backoff_cooldown = backoff_cooldown
+        self.in_flight = 0
+        self._slow_start = True
+        self._last_backoff = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self.in_flight < int(self.limit)
+            )
+            self.in_flight += 1
+
+    async def release(self, latency: float, overloaded: bool) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if overloaded:
+                # Back off once per cooldown, not once per failed request
+                if now - self._last_backoff >= self.backoff_cooldown:
+                    self.limit = max(
+                        self.min_limit, self.limit * self.backoff_factor
+                    )
+                    self._last_backoff = now
+                    self._slow_start = False
+                    logger.warning(
+                        f"LLM concurrency reduced to {int(self.limit)}"
+                    )
+            elif latency <= self.target_latency:
+                step = 1 if self._slow_start else 1 / self.limit
+                self.limit = min(self.max_limit, self.limit + step)
+            self._condition.notify_all()
+
+
+class ModelRateLimiter:
+    """Request, token and concurrency limits of one model, with metrics."""
+
+    def __init__(
+        self,
+        model: str,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        min_concurrency: int,
+        max_concurrency: int,
+        target_latency: float,
+    ):
+        self.model = model
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.concurrency = AdaptiveConcurrency(
+            initial=min_concurrency,
+            min_limit=min_concurrency,
+            max_limit=max_concurrency,
+            target_latency=target_latency,
+        )
+        self.metrics: Dict[str, float] = {
+            "requests": 0,
+            "failures": 0,
+            "rate_limited": 0,
+            "timeouts": 0,
+            "estimated_tokens": 0,
+            "used_tokens": 0,
+            "wait_seconds": 0.0,
+            "latency_seconds": 0.0,
+        }
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int) -> AsyncIterator[dict]:
+        """
+        Wait for capacity to send one request, then hold a concurrency
+        slot while it runs.
+
+        The yielded dict may be given the real token usage of the request
+        as ``used_tokens``, which corrects the token bucket.
+        """
+        start = time.monotonic()
+        await self.concurrency.acquire()
+        try:
+            await self.requests.acquire(1)
+            await self.tokens.acquire(estimated_tokens)
+        except BaseException:
+            await self.concurrency.release(0.0, overloaded=False)
+            raise
+
+        sent = time.monotonic()
+        self.metrics["wait_seconds"] += sent - start
+        self.metrics["requests"] += 1
+        self.metrics["estimated_tokens"] += estimated_tokens
+        usage = {}
+        overloaded = False
+        try:
+            yield usage
+        except Exception as e:
+            self.metrics["failures"] += 1
+            if isinstance(e, litellm.RateLimitError):
+                self.metrics["rate_limited"] += 1
+                overloaded = True
+            elif isinstance(
+                e, (litellm.Timeout, asyncio.TimeoutError, TimeoutError)
+            ):
+                self.metrics["timeouts"] += 1
+                overloaded = True
+            raise
+        finally:
+            latency = time.monotonic() - sent
+            self.metrics["latency_seconds"] += latency
+            used_tokens = usage.get("used_tokens")
+            if used_tokens is not None:
+                self.metrics["used_tokens"] += used_tokens
+                self.tokens.adjust(estimated_tokens - used_tokens)
+            await self.concurrency.release(latency, overloaded)
+
+    def snapshot(self) -> dict:
+        requests = self.metrics["requests"] or 1
+        return {
+            **self.metrics,
+            "avg_wait_seconds": self.metrics["wait_seconds"] / requests,
+            "avg_latency_seconds": self.metrics["latency_seconds"] / requests,
+            "in_flight": self.concurrency.in_flight,
+            "concurrency_limit": int(self.concurrency.limit),
+            "available_requests": int(self.requests.tokens),
+            "available_tokens": int(self.tokens.tokens),
+        }
+
+
+_rate_limiters: Dict[str, ModelRateLimiter] = {}
+_rate_limiters_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_rate_limiter(model: str) -> ModelRateLimiter:
+    """
+    Get the rate limiter of a model for the running event loop.
+
+    The limiters hold asyncio locks, which cannot be shared between event
+    loops, so they are created again when a new loop starts (e.g. for
+    each ``asyncio.run`` of a scheduler job or script).
+    """
+    global _rate_limiters_loop
+    loop = asyncio.get_running_loop()
+    if _rate_limiters_loop is not loop:
+        _rate_limiters.clear()
+        _rate_limiters_loop = loop
+    if model not in _rate_limiters:
+        _rate_limiters[model] = ModelRateLimiter(
+            model=model,
+            requests_per_minute=configs.LLM_REQUESTS_PER_MINUTE,
+            tokens_per_minute=configs.LLM_TOKENS_PER_MINUTE,
+            min_concurrency=configs.LLM_MIN_CONCURRENCY,
+            max_concurrency=configs.LLM_MAX_CONCURRENCY,
+            target_latency=configs.LLM_TARGET_LATENCY_SECONDS,
+        )
+    return _rate_limiters[model]
+
+
+def get_llm_metrics() -> Dict[str, dict]:
+    """
+    Get the current metrics of every model used so far in the running
+    event loop.
+    """
+    return {
+        model: limiter.snapshot() for model, limiter in _rate_limiters.items()
+    }
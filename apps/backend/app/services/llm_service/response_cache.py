@@ -0,0 +1,242 @@
+"""
+LLM Response Cache
+
+Opt-in cache for LLM responses, keyed by model, temperature, response
+format and the SHA-256 of the prompt. Pipeline runs look back over days
+that were already processed and some prompts (breaking news translations,
+keyword suggestions) repeat verbatim, so identical requests are answered
+from the cache instead of the provider.
+
+Two backends are available, selected by LLM_RESPONSE_CACHE_BACKEND:
+
+- "disk": one JSON file per entry in LLM_RESPONSE_CACHE_DIR
+- "redis": one key per entry plus a sorted set ordering them by age
+
+Both expire entries after LLM_RESPONSE_CACHE_TTL seconds and evict the
+oldest entries beyond LLM_RESPONSE_CACHE_MAX_ENTRIES.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Optional
+
+import redis
+
+from app.core.config import get_configs
+from app.core.db import get_redis_connection
+from app.core.logger import get_logger
+
+configs = get_configs()
+logger = get_logger(__name__)
+
+
+def build_cache_key(
+    model: str, temperature: float, resp_format, prompt: str
+) -> str:
+    """
+    Build the cache key of a request. Structured response formats are
+    identified by name and JSON schema, so a changed schema misses.
+    """
+    format_id = ""
+    if resp_format is not None:
+        schema = getattr(resp_format, "model_json_schema", None)
+        schema_json = json.dumps(
+            schema() if callable(schema) else str(resp_format),
+            sort_keys=True,
+        )
+        format_id = (
+            f"{getattr(resp_format, '__qualname__', '')}:"
+            f"{hashlib.sha256(schema_json.encode()).hexdigest()}"
+        )
+    prompt_hash = hashlib.sha256(prompt.encode()).hexdigest()
+    raw_key = json.dumps([model, temperature, format_id, prompt_hash])
+    return hashlib.sha256(raw_key.encode()).hexdigest()
+
+
+class ResponseCache(ABC):
+    """Base class of the response cache backends."""
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get the cached response of a key, or None if it is missing or
+        expired. Counts a hit or a miss.
+        """
+        raise NotImplementedError(
+            "This method should be implemented by subclasses."
+        )
+
+    @abstractmethod
+    def set(self, key: str, content: str) -> None:
+        """Cache the response of a key."""
+        raise NotImplementedError(
+            "This method should be implemented by subclasses."
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "ttl_seconds": self.ttl_seconds,
+            "max_entries": self.max_entries,
+        }
+
+
+class DiskResponseCache(ResponseCache):
+    """
+    Stores each response as a JSON file named after its key. Expired and
+    excess entries are removed every tenth of ``max_entries`` writes.
+    """
+
+    def __init__(self, directory: Path, ttl_seconds: int, max_entries: int):
+        super().__init__(ttl_seconds, max_entries)
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with self._path(key).open("r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if time.time() - entry["created"] > self.ttl_seconds:
+            self._path(key).unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["content"]
+
+    def set(self, key: str, content: str) -> None:
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump({"created": time.time(), "content": content}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"LLM response cache write failed: {e}")
+            return
+
+        with self._lock:
+            self._writes += 1
+            if self._writes < max(1, self.max_entries // 10):
+                return
+            self._writes = 0
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        now = time.time()
+        for path in self.directory.glob("*.json"):
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            if now - mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+            else:
+                entries.append((mtime, path))
+        excess = len(entries) - self.max_entries
+        if excess > 0:
+            for _, path in sorted(entries)[:excess]:
+                path.unlink(missing_ok=True)
+
+
+class RedisResponseCache(ResponseCache):
+    """
+    Stores each response under its own key with a TTL, and tracks the keys
+    in a sorted set by creation time to evict the oldest ones.
+    """
+
+    KEY_PREFIX = "llm_response"
+    INDEX_KEY = "llm_response:index"
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        max_entries: int,
+        client: redis.Redis | None = None,
+    ):
+        super().__init__(ttl_seconds, max_entries)
+        self._client = client or get_redis_connection()
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            raw = self._client.get(f"{self.KEY_PREFIX}:{key}")
+        except redis.RedisError as e:
+            logger.warning(f"LLM response cache read failed: {e}")
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return raw.decode() if isinstance(raw, bytes) else raw
+
+    def set(self, key: str, content: str) -> None:
+        full_key = f"{self.KEY_PREFIX}:{key}"
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            pipe.set(full_key, content, ex=self.ttl_seconds)
+            pipe.zadd(self.INDEX_KEY, {full_key: time.time()})
+            pipe.zcard(self.INDEX_KEY)
+            size = pipe.execute()[-1]
+            excess = size - self.max_entries
+            if excess > 0:
+                evicted = self._client.zpopmin(self.INDEX_KEY, excess)
+                if evicted:
+                    self._client.delete(*[k for k, _ in evicted])
+        except redis.RedisError as e:
+            logger.warning(f"LLM response cache write failed: {e}")
+
+
+_response_cache: ResponseCache | None = None
+_response_cache_loaded = False
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the process-wide LLM response cache, or None if it is disabled or
+    its backend is unavailable.
+    """
+    global _response_cache, _response_cache_loaded
+    if _response_cache_loaded:
+        return _response_cache
+    _response_cache_loaded = True
+
+    backend = configs.LLM_RESPONSE_CACHE_BACKEND.lower()
+    ttl = configs.LLM_RESPONSE_CACHE_TTL
+    max_entries = configs.LLM_RESPONSE_CACHE_MAX_ENTRIES
+    try:
+        if backend == "disk":
+            directory = configs.LLM_RESPONSE_CACHE_DIR or os.path.join(
+                tempfile.gettempdir(), "llm_response_cache"
+            )
+            _response_cache = DiskResponseCache(
+                Path(directory), ttl, max_entries
+            )
+        elif backend == "redis":
+            _response_cache = RedisResponseCache(ttl, max_entries)
+        elif backend not in ("", "none"):
+            logger.warning(f"Unknown LLM response cache backend: {backend}")
+    except (OSError, RuntimeError) as e:
+        logger.warning(f"LLM response cache disabled: {e}")
+        _response_cache = None
+    return _response_cache
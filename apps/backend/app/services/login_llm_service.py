@@ -420,8 +420,8 @@ class LoginLLM:
                     f"work, return new and different ones.\n\n"
                     f"\nHTML Content:\n{html_chunk}\n"
                 )
-                return await asyncio.to_thread(
-                    client.generate_response, prompt, 0.1, website_image
+                return await client.agenerate_response(
+                    prompt, 0.1, website_image
                 )
         except Exception as e:
             logger.warning(f"LLM call failed for chunk: {e}")
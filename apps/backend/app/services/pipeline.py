@@ -7,7 +7,9 @@ from app.services.article_cleanup_service import ArticleCleanupService
 from app.services.article_matching_service import ArticleMatchingService
 from app.services.article_summary_service import ArticleSummaryService
 from app.services.article_vector_service import ArticleVectorService
+from app.services.duplicate_detection_service import DuplicateDetectionService
 from app.services.email_service import EmailService
+from app.services.language_detection_service import LanguageDetectionService
 from app.services.report_service import ReportService
 from app.services.translation_service import ArticleTranslationService
 from app.services.web_harvester.crawler import CrawlerType
@@ -61,6 +63,12 @@ async def run(
     # the filter does not work properly
     datetime_start = datetime_start - timedelta(days=2)
 
+    logger.info("Running duplicate detection")
+    await DuplicateDetectionService.run(datetime_start=datetime_start)
+
+    logger.info("Running language detection")
+    await LanguageDetectionService.run(datetime_start=datetime_start)
+
     logger.info("Running Summarization and Entity Extraction")
     await ArticleSummaryService.run(
         datetime_start=datetime_start, datetime_end=datetime_end
@@ -83,6 +91,11 @@ async def run(
     matching_service = ArticleMatchingService()
     await matching_service.run()
 
+    logger.info("Running Translation for the content of matched articles")
+    await ArticleTranslationService.run_for_matched_articles(
+        matched_since=datetime_start
+    )
+
     logger.info("Report generation")
     # Returns the Report, presigned URL, dashboard URL and search profile
     reports_info = await ReportService.run(
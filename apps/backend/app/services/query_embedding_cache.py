@@ -0,0 +1,271 @@
+"""
+Query Embedding Cache
+
+Keyword and topic strings recur across many search profiles and are
+embedded again on every matching run, keyword suggestion and keyword
+assignment. This module puts a two-tier cache in front of the dense
+embedding model so that a query string is embedded once per model version:
+
+- an in-process LRU tier (bounded number of entries)
+- a shared Redis tier (entries expire after a configurable TTL)
+
+Only query embeddings are cached. Article documents pass straight through
+to the wrapped model, since they are embedded once and stored in Qdrant.
+"""
+
+import hashlib
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import redis
+from langchain_core.embeddings import Embeddings
+
+from app.core.config import get_configs
+from app.core.db import get_redis_connection
+from app.core.logger import get_logger
+
+configs = get_configs()
+logger = get_logger(__name__)
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize a query string for cache lookups: unicode NFKC and
+    collapsed whitespace. Case is kept, since it affects the embedding.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+class _LRUTier:
+    """In-process LRU tier with hit/miss/eviction counters."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: OrderedDict[str, List[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: List[float]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class _RedisTier:
+    """
+    Shared Redis tier. Vectors are stored as packed float32 bytes and
+    expire after ``ttl_seconds``. The connection is opened lazily; if
+    Redis is unreachable the tier disables itself and the cache keeps
+    working with the LRU tier only.
+    """
+
+    def __init__(self, ttl_seconds: int, client: redis.Redis | None = None):
+        self.ttl_seconds = ttl_seconds
+        self._client = client
+        self._enabled = ttl_seconds > 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _get_client(self) -> Optional[redis.Redis]:
+        if not self._enabled:
+            return None
+        if self._client is None:
+            try:
+                self._client = get_redis_connection()
+            except RuntimeError as e:
+                logger.warning(
+                    f"Query embedding cache running without Redis: {e}"
+                )
+                self._enabled = False
+                return None
+        return self._client
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[List[float]]]:
+        client = self._get_client()
+        if client is None or not keys:
+            return [None] * len(keys)
+        try:
+            raw_values = client.mget(keys)
+        except redis.RedisError as e:
+            self.errors += 1
+            logger.warning(f"Query embedding cache read failed: {e}")
+            return [None] * len(keys)
+
+        values: List[Optional[List[float]]] = []
+        for raw in raw_values:
+            if raw is None:
+                self.misses += 1
+                values.append(None)
+            else:
+                self.hits += 1
+                values.append(array("f", raw).tolist())
+        return values
+
+    def set_many(self, items: Dict[str, List[float]]) -> None:
+        client = self._get_client()
+        if client is None or not items:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, vector in items.items():
+                pipe.set(
+                    key, array("f", vector).tobytes(), ex=self.ttl_seconds
+                )
+            pipe.execute()
+        except redis.RedisError as e:
+            self.errors += 1
+            logger.warning(f"Query embedding cache write failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "enabled": self._enabled,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
+
+
+class QueryEmbeddingCache:
+    """
+    Two-tier cache for query embeddings, keyed by model and
+    normalized query text.
+    """
+
+    KEY_PREFIX = "query_embedding"
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl_seconds: int = 30 * 24 * 3600,
+        redis_client: redis.Redis | None = None,
+    ):
+        self.local = _LRUTier(max_size)
+        self.shared = _RedisTier(ttl_seconds, client=redis_client)
+
+    @classmethod
+    def build_key(cls, model: str, text: str) -> str:
+        digest = hashlib.sha256(normalize_query(text).encode()).hexdigest()
+        return f"{cls.KEY_PREFIX}:{model}:{digest}"
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[List[float]]]:
+        values = [self.local.get(key) for key in keys]
+        missing = [i for i, value in enumerate(values) if value is None]
+        if missing:
+            shared_values = self.shared.get_many([keys[i] for i in missing])
+            for i, value in zip(missing, shared_values):
+                if value is not None:
+                    self.local.set(keys[i], value)
+                    values[i] = value
+        return values
+
+    def set_many(self, items: Dict[str, List[float]]) -> None:
+        for key, vector in items.items():
+            self.local.set(key, vector)
+        self.shared.set_many(items)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {"local": self.local.stats(), "shared": self.shared.stats()}
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves ``embed_query`` from a
+    QueryEmbeddingCache and embeds all cache misses of a batch with one
+    call to the wrapped model.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: QueryEmbeddingCache):
+        self._embeddings = embeddings
+        self._cache = cache
+        model = getattr(embeddings, "model", embeddings.__class__.__name__)
+        dimensions = getattr(embeddings, "dimensions", None)
+        self.model_key = f"{model}@{dimensions}" if dimensions else model
+
+    @property
+    def cache(self) -> QueryEmbeddingCache:
+        return self._cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self._embeddings.aembed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_queries([text])[0]
+
+    def embed_queries(self, texts: Sequence[str]) -> List[List[float]]:
+        """
+        Embed several query strings, only sending cache misses (once per
+        distinct normalized text) to the wrapped model.
+        """
+        keys = [
+            QueryEmbeddingCache.build_key(self.model_key, t) for t in texts
+        ]
+        vectors = self._cache.get_many(keys)
+
+        missing: Dict[str, str] = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None and key not in missing:
+                missing[key] = normalize_query(text)
+
+        if missing:
+            embedded = self._embeddings.embed_documents(list(missing.values()))
+            new_items = dict(zip(missing.keys(), embedded))
+            self._cache.set_many(new_items)
+            vectors = [
+                vector if vector is not None else new_items[key]
+                for key, vector in zip(keys, vectors)
+            ]
+        return vectors
+
+
+_query_embedding_cache: QueryEmbeddingCache | None = None
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """
+    Get the process-wide query embedding cache.
+    """
+    global _query_embedding_cache
+    if _query_embedding_cache is None:
+        _query_embedding_cache = QueryEmbeddingCache(
+            max_size=configs.QUERY_EMBEDDING_CACHE_SIZE,
+            ttl_seconds=configs.QUERY_EMBEDDING_CACHE_TTL,
+        )
+    return _query_embedding_cache
@@ -18,7 +18,6 @@ from app.core.logger import get_logger
 from app.models import SearchProfile, Topic
 from app.models.match import Match
 from app.models.user import UserRole
-from app.repositories.article_repository import ArticleRepository
 from app.repositories.email_repository import EmailRepository
 from app.repositories.entity_repository import ArticleEntityRepository
 from app.repositories.keyword_repository import KeywordRepository
@@ -57,6 +56,7 @@ from app.services.llm_service.prompts.keyword_suggestion_prompts import (
     KEYWORD_SUGGESTION_PROMPT_DE,
     KEYWORD_SUGGESTION_PROMPT_EN,
 )
+from app.services.translation_service import ArticleTranslationService
 
 logger = get_logger(__name__)
 
@@ -340,6 +340,10 @@ class SearchProfileService:
 
             all_matches = await MatchRepository.get_matches_by_search_profile(
                 search_profile_id,
+                start_date=request.startDate,
+                end_date=request.endDate,
+                subscription_ids=request.subscriptions,
+                topic_ids=request.topics,
             )
             matches = []
             for m in all_matches:
@@ -358,41 +362,18 @@ class SearchProfileService:
                         if match_count >= min_match:
                             found = True
                             break
-                if (
-                    found
-                    and request.startDate
-                    <= m.article.published_at.date()
-                    <= request.endDate
-                ):
+                if found:
                     matches.append(m)
         else:
             # no search term: get all matches for the profile
             matches = await MatchRepository.get_matches_by_search_profile(
                 search_profile_id,
+                start_date=request.startDate,
+                end_date=request.endDate,
+                subscription_ids=request.subscriptions,
+                topic_ids=request.topics,
             )
-            matches = [
-                m
-                for m in matches
-                if m.article
-                and request.startDate
-                <= m.article.published_at.date()
-                <= request.endDate
-            ]
-
-        if request.subscriptions:
-            matches = [
-                m
-                for m in matches
-                if await ArticleRepository.get_subscription_id_for_article(
-                    m.article_id
-                )
-                in request.subscriptions
-            ]
-
-        # filter matches by requested topics
-        if request.topics:
-            requested_topic_ids = set(request.topics)
-            matches = [m for m in matches if m.topic_id in requested_topic_ids]
+            matches = [m for m in matches if m.article]
 
         # sorting
         if request.sorting == "RELEVANCE":
@@ -413,14 +394,32 @@ class SearchProfileService:
             all_topic_ids
         )
 
+        subscription_access: dict[UUID, bool] = {}
+        for article_id, match_group in article_match_map.items():
+            subscription_access[article_id] = (
+                await SubscriptionRepository.has_organization_subscription_access(
+                    search_profile.organization_id,
+                    match_group[0].article.subscription_id,
+                )
+            )
+        # Full content is translated in the background, the listing returns
+        # the stored translations
+        ArticleTranslationService.schedule_content_translation(
+            [
+                article_match_map[article_id][0].article
+                for article_id, has_access in subscription_access.items()
+                if has_access
+            ]
+        )
+
         match_items = []
         for article_id, match_group in article_match_map.items():
             topics_dict = {}
             total_score = 0.0
             article = match_group[0].article
-            has_organization_subscription_access = await SubscriptionRepository.has_organization_subscription_access(
-                search_profile.organization_id, article.subscription_id
-            )
+            has_organization_subscription_access = subscription_access[
+                article_id
+            ]
 
             for m in match_group:
                 topic_id = m.topic_id
@@ -549,6 +548,8 @@ class SearchProfileService:
 
         # Check if organization has subscription access and modify content accordingly
         if has_organization_subscription_access:
+            # Full content is translated on first read
+            await ArticleTranslationService.translate_content([article])
             article_text = {
                 "de": article.content_de or "",
                 "en": article.content_en or "",
@@ -667,10 +668,14 @@ class SearchProfileService:
                 related_topics=format_related_topics(related_topics),
             )
 
-            llm = LLMClient(TaskModelMapping.KEYWORD_SUGGESTION, max_retries=1)
+            llm = LLMClient(
+                TaskModelMapping.KEYWORD_SUGGESTION,
+                max_retries=1,
+                use_cache=True,
+            )
 
             try:
-                response = llm.generate_typed_response(
+                response = await llm.agenerate_typed_response(
                     prompt, KeywordSuggestionResponse
                 )
             except Exception as e:
@@ -0,0 +1,112 @@
+"""
+Translation Chunker
+
+Splits long texts into segments of a bounded number of tokens so that they
+can be translated separately, preferring paragraph boundaries, then
+sentence boundaries, then word boundaries.
+"""
+
+import re
+from typing import List, NamedTuple
+
+# Rough number of characters per token, as in the LLM rate limiter
+CHARS_PER_TOKEN = 4
+
+PARAGRAPH_BREAK = "\n\n"
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+class Chunk(NamedTuple):
+    """A segment of a text and the separator that follows it."""
+
+    text: str
+    separator: str = ""
+
+
+def estimate_text_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+def _split_long(text: str, max_chars: int) -> List[str]:
+    """Split a paragraph into sentences, or words, of at most max_chars."""
+    pieces = []
+    for sentence in _SENTENCE_RE.split(text):
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        words = sentence.split()
+        current = ""
+        for word in words:
+            while len(word) > max_chars:
+                if current:
+                    pieces.append(current)
+                    current = ""
+                pieces.append(word[:max_chars])
+                word = word[max_chars:]
+            if current and len(current) + 1 + len(word) > max_chars:
+                pieces.append(current)
+                current = word
+            else:
+                current = f"{current} {word}" if current else word
+        if current:
+            pieces.append(current)
+    return pieces
+
+
+def split_into_chunks(text: str, max_tokens: int) -> List[Chunk]:
+    """
+    Split a text into chunks of about ``max_tokens`` tokens at most.
+
+    Paragraphs are kept together as long as they fit. Joining the chunks
+    with ``join_chunks`` gives back the text, with paragraphs separated by
+    one blank line.
+    """
+    max_chars = max(max_tokens * CHARS_PER_TOKEN, 1)
+    chunks: List[Chunk] = []
+    current: List[str] = []
+    current_size = 0
+    current_sep = PARAGRAPH_BREAK
+
+    def flush(separator: str) -> None:
+        nonlocal current, current_size
+        if current:
+            chunks.append(Chunk(current_sep.join(current), separator))
+        current = []
+        current_size = 0
+
+    for paragraph in _PARAGRAPH_RE.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) > max_chars:
+            flush(PARAGRAPH_BREAK)
+            # Pieces of one paragraph are rejoined with a space
+            current_sep = " "
+            for piece in _split_long(paragraph, max_chars):
+                if current and current_size + 1 + len(piece) > max_chars:
+                    flush(" ")
+                current.append(piece)
+                current_size += len(piece) + 1
+            flush(PARAGRAPH_BREAK)
+            current_sep = PARAGRAPH_BREAK
+            continue
+        if current and current_size + 2 + len(paragraph) > max_chars:
+            flush(PARAGRAPH_BREAK)
+        current.append(paragraph)
+        current_size += len(paragraph) + 2
+    flush("")
+
+    if chunks:
+        chunks[-1] = Chunk(chunks[-1].text, "")
+    return chunks
+
+
+def join_chunks(texts: List[str], chunks: List[Chunk]) -> str:
+    """
+    Join the (translated) texts of chunks in order, with the separators
+    of the original chunks.
+    """
+    return "".join(
+        text.strip() + chunk.separator for text, chunk in zip(texts, chunks)
+    )
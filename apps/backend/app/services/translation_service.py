@@ -1,19 +1,33 @@
 import asyncio
-import json
 import os
 import uuid
 from datetime import date, datetime
-from typing import Callable
+from typing import Callable, NamedTuple, Optional, Sequence
 
 from babel.messages.pofile import read_po
-from langdetect import detect
 
+from app.core.config import get_configs
+from app.core.db import async_session
 from app.core.logger import get_logger
+from app.models.article import Article
+from app.models.llm_batch_job import LLMBatchPurpose
 from app.repositories.article_repository import ArticleRepository
-from app.repositories.entity_repository import ArticleEntityRepository
+from app.repositories.entity_translation_repository import (
+    EntityTranslationRepository,
+)
+from app.repositories.llm_batch_job_repository import LLMBatchJobRepository
+from app.services.language_detection_service import detect_language
+from app.services.llm_service.batch_runner import BatchRunner
 from app.services.llm_service.llm_client import LLMClient
 from app.services.llm_service.llm_models import TaskModelMapping
+from app.services.translation_chunker import (
+    Chunk,
+    estimate_text_tokens,
+    join_chunks,
+    split_into_chunks,
+)
 
+configs = get_configs()
 logger = get_logger(__name__)
 base_prompt = (
     "You are a professional translator. Translate "
@@ -27,14 +41,28 @@ base_prompt = (
 )
 
 
+class Segment(NamedTuple):
+    """A chunk of a long text and its prompt, None if not translated."""
+
+    chunk: Chunk
+    prompt: Optional[str]
+
+
 class ArticleTranslationService:
     _translators_cache = {}
-    _llm_client = LLMClient(TaskModelMapping.TRANSLATION, max_retries=1)
+    _llm_client = LLMClient(
+        TaskModelMapping.TRANSLATION, max_retries=1, use_cache=True
+    )
     _semaphore = asyncio.Semaphore(50)
 
     _completed_count = 0
     _completed_count_lock = asyncio.Lock()
 
+    # Running background content translations, and the articles they
+    # translate
+    _content_tasks: set[asyncio.Task] = set()
+    _content_article_ids: set[uuid.UUID] = set()
+
     @staticmethod
     def get_translator(language: str) -> Callable[[str], str]:
         """
@@ -96,22 +124,55 @@ class ArticleTranslationService:
 
         return all_ids, all_texts
 
+    @staticmethod
+    def _stored_languages(items, field_name) -> list[Optional[str]]:
+        """
+        Returns the language detected after scraping for the specified
+        field of each item, or None where it is unknown. Summaries are in
+        the language of the content.
+        """
+        source_field = "content" if field_name == "summary" else field_name
+        languages = []
+        for item in items:
+            field_languages = getattr(item, "field_languages", None) or {}
+            languages.append(field_languages.get(source_field))
+        return languages
+
+    @staticmethod
+    def _detect_language(text: str) -> Optional[str]:
+        """
+        Detects the language of a text, or None if it is too short for an
+        accurate detection or not valid for it.
+        """
+        if len(text) < 50:
+            return None
+        return detect_language(text)
+
     @staticmethod
     def _prepare_translation_content(
-        ids: list[str], texts: list[str]
-    ) -> tuple[list[str], list[str], list[dict]]:
+        ids: list[str],
+        texts: list[str],
+        chunk_tokens: Optional[int] = None,
+        languages: Optional[list[Optional[str]]] = None,
+    ) -> tuple[list[str], list[str | list[Segment]], list[dict]]:
         """
         Prepares prompts and auto-responses for a translation batch.
 
         Args:
             ids (list[str]): unique identifiers for each text.
             texts (list[str]): list of raw texts to translate.
+            chunk_tokens (int, optional): split texts longer than this
+            number of tokens into segments, each with its own prompt.
+            Segments already in the target language get no prompt.
+            languages (list[str], optional): language of each text
+            detected after scraping. Texts without one are detected here.
 
         Returns:
             tuple: A tuple containing:
             - custom_ids (list[str]): IDs for requests that require
               translation.
-            - prompts (list[str]): Prompts to send to the LLM.
+            - prompts (list[str | list[Segment]]): Prompts to send to the
+              LLM, or segments of a long text.
             - auto_responses (list[dict]): Pre-filled responses for texts
               already in the target language.
         """
@@ -122,23 +183,39 @@ class ArticleTranslationService:
         target_langs = {"en": "English", "de": "German"}
         custom_ids, prompts, auto_responses = [], [], []
 
-        for id_, text in zip(ids, texts):
+        if languages is None or len(languages) != len(texts):
+            languages = [None] * len(texts)
+
+        for id_, text, language in zip(ids, texts, languages):
             if not text or not text.strip():
                 logger.warning(f"Empty text for id {id_}, skipping.")
                 continue
 
             translation_required = True
-            detected_lang = None
+            detected_lang = language
             #  Above certain number of characters for accurate detection
-            if len(text) >= 50:
-                try:
-                    detected_lang = detect(text)
-                except Exception:
+            if not detected_lang and len(text) >= 50:
+                detected_lang = detect_language(text)
+                if not detected_lang:
                     logger.warning(
                         f"Text '{text}' is not valid for language detection"
                     )
                     translation_required = False
 
+            segments = None
+            if (
+                translation_required
+                and chunk_tokens
+                and estimate_text_tokens(text) > chunk_tokens
+            ):
+                segments = [
+                    (
+                        chunk,
+                        ArticleTranslationService._detect_language(chunk.text),
+                    )
+                    for chunk in split_into_chunks(text, chunk_tokens)
+                ]
+
             for lang_code, lang_name in target_langs.items():
                 full_id = f"{id_}_{lang_code}"
                 if detected_lang == lang_code or not translation_required:
@@ -152,6 +229,24 @@ class ArticleTranslationService:
                             },
                         }
                     )
+                elif segments:
+                    prompts.append(
+                        [
+                            Segment(
+                                chunk,
+                                (
+                                    None
+                                    if chunk_lang == lang_code
+                                    else base_prompt.format(
+                                        target_lang=lang_name,
+                                        content=chunk.text,
+                                    )
+                                ),
+                            )
+                            for chunk, chunk_lang in segments
+                        ]
+                    )
+                    custom_ids.append(full_id)
                 else:
                     prompts.append(
                         base_prompt.format(target_lang=lang_name, content=text)
@@ -160,14 +255,38 @@ class ArticleTranslationService:
 
         return custom_ids, prompts, auto_responses
 
+    @staticmethod
+    async def _generate(prompt: str) -> str:
+        llm_client = ArticleTranslationService._llm_client
+        async with ArticleTranslationService._semaphore:
+            return await llm_client.agenerate_response(prompt)
+
+    @staticmethod
+    async def _translate_segments(segments: list[Segment]) -> str:
+        """
+        Translates the segments of a long text concurrently and joins the
+        translations in order.
+        """
+
+        async def translate(segment: Segment) -> str:
+            if segment.prompt is None:
+                return segment.chunk.text
+            return await ArticleTranslationService._generate(segment.prompt)
+
+        texts = await asyncio.gather(
+            *[translate(segment) for segment in segments]
+        )
+        return join_chunks(texts, [segment.chunk for segment in segments])
+
     @staticmethod
     async def _translate_one(custom_id, prompt):
         try:
-            async with ArticleTranslationService._semaphore:
-                content = await asyncio.to_thread(
-                    ArticleTranslationService._llm_client.generate_response,
-                    prompt,
+            if isinstance(prompt, list):
+                content = await ArticleTranslationService._translate_segments(
+                    prompt
                 )
+            else:
+                content = await ArticleTranslationService._generate(prompt)
 
             async with ArticleTranslationService._completed_count_lock:
                 ArticleTranslationService._completed_count += 1
@@ -189,36 +308,44 @@ class ArticleTranslationService:
 
     @staticmethod
     async def _execute_translation_batch(
-        custom_ids: list[str], prompts: list[str], auto_responses: list[dict]
-    ) -> list[dict]:
+        custom_ids: list[str],
+        prompts: list[str],
+        repository,
+        purpose: LLMBatchPurpose,
+    ) -> int:
         """
-        Executes the LLM batch translation process and combines results.
+        Executes the LLM batch translation process, storing the results
+        as they are parsed. Requests of batches that are still pending
+        are not submitted again.
 
         Args:
             custom_ids (list[str]): identifiers for the translation requests.
             prompts (list[str]): prompts to send to the model.
-            auto_responses (list[dict]): responses for texts already in the
-            target language.
+            repository: Repository class with update method
+            purpose (LLMBatchPurpose): purpose the batches are recorded with
 
         Returns:
-            list[dict]: All responses, including LLM completions
-            and auto-responses.
+            int: Number of stored responses.
         """
-        batch_responses = []
+        pending = await LLMBatchJobRepository.get_pending_custom_ids(purpose)
 
-        output_path = LLMClient.generate_batch(
-            custom_ids=custom_ids,
-            prompts=prompts,
-            model=TaskModelMapping.TRANSLATION.value,
-            temperature=0.1,
-            output_filename="openai_batch_translation.jsonl",
-        )
-        raw_lines = await LLMClient.run_batch_api(output_path)
+        async def requests():
+            for custom_id, prompt in zip(custom_ids, prompts):
+                if custom_id in pending:
+                    continue
+                yield LLMClient.build_request_jsonl(
+                    custom_id=custom_id,
+                    model=TaskModelMapping.TRANSLATION.value,
+                    prompt=prompt,
+                    temperature=0.1,
+                )
 
-        if raw_lines:
-            batch_responses = [json.loads(line) for line in raw_lines]
+        async def store(lines: list[dict]):
+            await ArticleTranslationService.store_batch_output(
+                lines, repository
+            )
 
-        return batch_responses + auto_responses
+        return await BatchRunner().run(requests(), store, purpose=purpose)
 
     @staticmethod
     async def _execute_concurrent_translations(
@@ -251,34 +378,54 @@ class ArticleTranslationService:
         ids: list[str],
         texts: list[str],
         use_batch_api: bool,
-    ):
+        repository,
+        purpose: LLMBatchPurpose,
+        languages: Optional[list[Optional[str]]] = None,
+    ) -> bool:
         """
         Translates all texts from the input using the batch API
-        or concurrent calls
+        or concurrent calls, and stores the translations
 
         Args:
             ids (list[str]): unique identifiers for each text.
             texts (list[str]): list of raw texts to translate.
             use_batch_api: indicates if run using batch api or
             concurrent calls
+            repository: Repository class with update method
+            purpose (LLMBatchPurpose): purpose batches are recorded with
+            languages (list[str], optional): known language of each text
 
         Returns:
-            list[dict]: List of translation responses.
+            bool: False if none of the texts requiring a translation
+            could be translated.
         """
+        # Batch requests are not split, the batch API has no latency tail
+        chunk_tokens = (
+            None if use_batch_api else configs.TRANSLATION_CHUNK_TOKENS
+        )
         custom_ids, prompts, auto_responses = (
-            ArticleTranslationService._prepare_translation_content(ids, texts)
+            ArticleTranslationService._prepare_translation_content(
+                ids, texts, chunk_tokens, languages
+            )
         )
         if use_batch_api:
-            responses = (
+            translated = (
                 await ArticleTranslationService._execute_translation_batch(
-                    custom_ids, prompts, auto_responses
+                    custom_ids, prompts, repository, purpose
                 )
             )
+            responses = auto_responses
         else:
             concur = ArticleTranslationService._execute_concurrent_translations
             responses = await concur(custom_ids, prompts, auto_responses)
+            translated = len(responses) - len(auto_responses)
 
-        return responses
+        if not translated and (custom_ids or not responses):
+            return False
+        await ArticleTranslationService.store_batch_output(
+            responses, repository
+        )
+        return True
 
     @staticmethod
     async def _parse_translation_responses(responses):
@@ -334,25 +481,56 @@ class ArticleTranslationService:
 
         return translations_map
 
+    @staticmethod
+    def _flatten_translations(translations_map) -> dict:
+        """
+        Turns {id: {lang: {field: value}}} into {id: {field_lang: value}}.
+        """
+        return {
+            object_id: {
+                f"{field}_{lang_code}": value
+                for lang_code, fields in langs.items()
+                for field, value in fields.items()
+            }
+            for object_id, langs in translations_map.items()
+        }
+
     @staticmethod
     async def _store_translations(translations_map, repository):
         """
-        Stores translation responses back into the database.
+        Stores translation responses back into the database with one
+        bulk update.
 
         Args:
             translations_map (dict): Dictionary with
             structure {id: {lang: {field: value}}}
+            repository: Repository class with update_translations_many
+        """
+        translations = ArticleTranslationService._flatten_translations(
+            translations_map
+        )
+        updated = await repository.update_translations_many(translations)
+        if updated < len(translations):
+            logger.warning(
+                f"{len(translations) - updated} translated objects "
+                f"no longer exist"
+            )
+
+    @staticmethod
+    async def store_batch_output(responses: list[dict], repository) -> None:
+        """
+        Stores parsed translation responses, e.g. the output lines of a
+        batch.
+
+        Args:
+            responses (list[dict]): responses in the batch API format
             repository: Repository class with update method
         """
-        for object_id, langs in translations_map.items():
-            for lang_code, fields in langs.items():
-                translated_fields = {
-                    f"{field}_{lang_code}": value
-                    for field, value in fields.items()
-                }
-                await repository.update_translations(
-                    object_id, **translated_fields
-                )
+        parse = ArticleTranslationService._parse_translation_responses
+        translations_map = await parse(responses)
+        await ArticleTranslationService._store_translations(
+            translations_map, repository
+        )
 
     @staticmethod
     async def run(
@@ -376,6 +554,7 @@ class ArticleTranslationService:
                 await ArticleRepository.get_articles_without_translations(
                     limit=page_size,
                     datetime_start=datetime_start,
+                    include_content=configs.TRANSLATE_CONTENT_EAGERLY,
                 )
             )
             while articles:
@@ -386,38 +565,53 @@ class ArticleTranslationService:
 
                 article_ids = []
                 article_texts = []
-                fields_to_translate = ["title", "content", "summary"]
+                article_languages = []
+                fields_to_translate = ["title", "summary"]
+                if configs.TRANSLATE_CONTENT_EAGERLY:
+                    fields_to_translate.insert(1, "content")
                 for field in fields_to_translate:
+                    # Titles and summaries may already be translated by
+                    # the summary call (summarize+translate mode)
+                    untranslated = [
+                        article
+                        for article in articles
+                        if not getattr(article, f"{field}_en")
+                        or not getattr(article, f"{field}_de")
+                    ]
                     ids, texts = (
                         await ArticleTranslationService._process_fields(
-                            articles, field
+                            untranslated, field
                         )
                     )
                     article_ids.extend(ids)
                     article_texts.extend(texts)
+                    article_languages.extend(
+                        ArticleTranslationService._stored_languages(
+                            untranslated, field
+                        )
+                    )
 
-                responses = (
+                translated = (
                     await ArticleTranslationService._translate_all_fields(
-                        article_ids, article_texts, use_batch_api
+                        article_ids,
+                        article_texts,
+                        use_batch_api,
+                        ArticleRepository,
+                        LLMBatchPurpose.ARTICLE_TRANSLATION,
+                        article_languages,
                     )
                 )
-                if not responses:
+                if not translated:
                     logger.error(f"Translation failed for page {page + 1}")
                     break
 
-                parse = ArticleTranslationService._parse_translation_responses
-                articles_map = await parse(responses)
-
-                await ArticleTranslationService._store_translations(
-                    articles_map, ArticleRepository
-                )
-
                 page += 1
 
                 articles = (
                     await ArticleRepository.get_articles_without_translations(
                         limit=page_size,
                         datetime_start=datetime_start,
+                        include_content=configs.TRANSLATE_CONTENT_EAGERLY,
                     )
                 )
             logger.info("No more articles without translation found")
@@ -426,23 +620,152 @@ class ArticleTranslationService:
             logger.exception(f"Error running translation workflow: {e}")
             return None
 
+    @staticmethod
+    async def translate_content(articles: Sequence[Article]) -> int:
+        """
+        Translates the full content of the given articles on demand, with
+        concurrent calls, for those that are not translated yet. The
+        translations are stored without changing the article status and
+        set on the given article objects.
+
+        Returns:
+            int: Number of articles whose translations were stored.
+        """
+        missing = [
+            article
+            for article in articles
+            if not (article.content_en and article.content_de)
+            and article.content
+        ]
+        if not missing:
+            return 0
+        try:
+            ids, texts = await ArticleTranslationService._process_fields(
+                missing, "content"
+            )
+            custom_ids, prompts, auto_responses = (
+                ArticleTranslationService._prepare_translation_content(
+                    ids,
+                    texts,
+                    configs.TRANSLATION_CHUNK_TOKENS,
+                    ArticleTranslationService._stored_languages(
+                        missing, "content"
+                    ),
+                )
+            )
+            concur = ArticleTranslationService._execute_concurrent_translations
+            responses = await concur(custom_ids, prompts, auto_responses)
+            parse = ArticleTranslationService._parse_translation_responses
+            translations = ArticleTranslationService._flatten_translations(
+                await parse(responses)
+            )
+            async with async_session() as session:
+                await ArticleRepository.update_article_translations(
+                    session, translations
+                )
+                await session.commit()
+        except Exception as e:
+            logger.exception(f"Error translating article content: {e}")
+            return 0
+
+        articles_by_id = {article.id: article for article in missing}
+        for article_id, fields in translations.items():
+            for field, value in fields.items():
+                setattr(articles_by_id[article_id], field, value)
+        return len(translations)
+
+    @staticmethod
+    def schedule_content_translation(
+        articles: Sequence[Article],
+    ) -> Optional[asyncio.Task]:
+        """
+        Translates the full content of the given articles in a background
+        task, skipping those that are translated or already being
+        translated by an earlier call.
+
+        Returns:
+            asyncio.Task: The scheduled task, or None if there is nothing
+            to translate.
+        """
+        pending = ArticleTranslationService._content_article_ids
+        missing = [
+            article
+            for article in articles
+            if not (article.content_en and article.content_de)
+            and article.content
+            and article.id not in pending
+        ]
+        if not missing:
+            return None
+        article_ids = {article.id for article in missing}
+        pending.update(article_ids)
+
+        async def translate():
+            try:
+                await ArticleTranslationService.translate_content(missing)
+            finally:
+                pending.difference_update(article_ids)
+
+        task = asyncio.create_task(translate())
+        # The event loop only keeps weak references to tasks
+        ArticleTranslationService._content_tasks.add(task)
+        task.add_done_callback(
+            ArticleTranslationService._content_tasks.discard
+        )
+        return task
+
+    @staticmethod
+    async def run_for_matched_articles(
+        matched_since: datetime, page_size: int = 50
+    ) -> int:
+        """
+        Translates the content of articles matched to a search profile
+        since ``matched_since``, which are the ones readers open.
+
+        Returns:
+            int: Number of articles whose content was translated.
+        """
+        get = (
+            ArticleRepository.get_matched_articles_without_content_translations
+        )
+        translated = 0
+        articles = await get(matched_since, limit=page_size)
+        while articles:
+            stored = await ArticleTranslationService.translate_content(
+                articles
+            )
+            if not stored:
+                logger.error("Content translation of matched articles failed")
+                break
+            translated += stored
+            articles = await get(matched_since, limit=page_size)
+        logger.info(f"Translated the content of {translated} matched articles")
+        return translated
+
     @staticmethod
     async def run_for_entities(limit: int = 100, use_batch_api: bool = False):
         """
         Orchestrates the full entity translation pipeline.
 
+        Each distinct entity value is translated once, in the entity
+        translation dictionary, and entities copy the translations of
+        their value from it.
+
         Args:
-            limit (int, optional): Number of entities to process per batch.
+            limit (int, optional): Number of values to process per batch.
         """
         try:
+            added = await EntityTranslationRepository.add_missing_values()
+            logger.info(f"Added {added} entity values to the dictionary")
+
             page = 0
-            get = ArticleEntityRepository.get_entities_without_translations
+            get = EntityTranslationRepository.get_values_without_translations
             entities = await get(limit=limit)
 
             while entities:
                 logger.info(
                     f"Translating page {page + 1} with "
-                    f"{len(entities)} entities"
+                    f"{len(entities)} entity values"
                 )
 
                 entity_ids, entity_texts = (
@@ -451,27 +774,27 @@ class ArticleTranslationService:
                     )
                 )
 
-                responses = (
+                translated = (
                     await ArticleTranslationService._translate_all_fields(
-                        entity_ids, entity_texts, use_batch_api
+                        entity_ids,
+                        entity_texts,
+                        use_batch_api,
+                        EntityTranslationRepository,
+                        LLMBatchPurpose.ENTITY_TRANSLATION,
                     )
                 )
 
-                if not responses:
+                if not translated:
                     logger.error(f"Translation failed for page {page + 1}")
                     break
 
-                parse = ArticleTranslationService._parse_translation_responses
-                entities_map = await parse(responses)
-
-                await ArticleTranslationService._store_translations(
-                    entities_map, ArticleEntityRepository
-                )
-
                 page += 1
                 entities = await get(limit=limit)
 
-            logger.info("No more entities without translation found")
+            logger.info("No more entity values without translation found")
+
+            updated = await EntityTranslationRepository.backfill_entities()
+            logger.info(f"Copied translations to {updated} entities")
 
         except Exception as e:
             logger.exception(f"Error running entity translation workflow: {e}")
@@ -510,10 +833,9 @@ class ArticleTranslationService:
         # Call LLM for translation
         logger.info(f" {breaking_news.id} Call LLM for translation")
         responses = []
+        llm_client = ArticleTranslationService._llm_client
         for prompt in prompts:
-            resp = ArticleTranslationService._llm_client.generate_response(
-                prompt
-            )
+            resp = await llm_client.agenerate_response(prompt)
             responses.append(
                 resp["choices"][0]["message"]["content"]
                 if "choices" in resp and resp["choices"]
@@ -0,0 +1,383 @@
+"""
+Vector Collection Manager
+
+Versioned schemas for the article vector collection in Qdrant.
+
+Physical collections are named ``<collection>_v<version>`` and served
+through an alias with the configured ARTICLE_VECTORS_COLLECTION name, so
+a new schema can be built next to the live one and switched over
+atomically. A collection created directly under the configured name
+(before aliases were used) is migrated by copying its points, dropping it
+and creating the alias in its place.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+from qdrant_client import QdrantClient, models
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+FULL_DENSE_SIZE = 3072
+DENSE_VECTOR_NAME = "dense"
+SPARSE_VECTOR_NAME = "sparse"
+
+# Payload fields written by QdrantVectorStore live below "metadata"
+SUBSCRIPTION_ID_FIELD = "metadata.subscription_id"
+PUBLISHED_AT_FIELD = "metadata.published_at"
+LANGUAGE_FIELD = "metadata.language"
+
+
+@dataclass(frozen=True)
+class CollectionSchema:
+    """Storage and index settings of one version of the collection."""
+
+    version: int
+    dense_size: int = FULL_DENSE_SIZE
+    hnsw_m: Optional[int] = None
+    hnsw_ef_construct: Optional[int] = None
+    on_disk_vectors: bool = False
+    int8_quantization: bool = False
+    rescore_oversampling: float = 2.0
+
+    def collection_name(self, base_name: str) -> str:
+        if self.dense_size == FULL_DENSE_SIZE:
+            return f"{base_name}_v{self.version}"
+        return f"{base_name}_v{self.version}_{self.dense_size}d"
+
+    def vectors_config(self) -> dict:
+        hnsw_config = None
+        if self.hnsw_m is not None or self.hnsw_ef_construct is not None:
+            hnsw_config = models.HnswConfigDiff(
+                m=self.hnsw_m, ef_construct=self.hnsw_ef_construct
+            )
+        return {
+            DENSE_VECTOR_NAME: models.VectorParams(
+                size=self.dense_size,
+                distance=models.Distance.COSINE,
+                on_disk=self.on_disk_vectors,
+                hnsw_config=hnsw_config,
+            )
+        }
+
+    def sparse_vectors_config(self) -> dict:
+        return {
+            SPARSE_VECTOR_NAME: models.SparseVectorParams(
+                index=models.SparseIndexParams(on_disk=False)
+            )
+        }
+
+    def quantization_config(self) -> Optional[models.ScalarQuantization]:
+        if not self.int8_quantization:
+            return None
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8,
+                quantile=0.99,
+                always_ram=True,
+            )
+        )
+
+    def search_params(self) -> Optional[models.SearchParams]:
+        """
+        Search parameters for dense queries: search the int8 vectors,
+        then rescore the oversampled candidates with the originals.
+        """
+        if not self.int8_quantization:
+            return None
+        return models.SearchParams(
+            quantization=models.QuantizationSearchParams(
+                ignore=False,
+                rescore=True,
+                oversampling=self.rescore_oversampling,
+            )
+        )
+
+    def estimated_ram_bytes(self, points: int) -> int:
+        """
+        Rough estimate of the RAM held for the dense vectors and the
+        HNSW graph of ``points`` articles.
+        """
+        in_ram_bytes = 0 if self.on_disk_vectors else self.dense_size * 4
+        if self.int8_quantization:
+            in_ram_bytes += self.dense_size
+        hnsw_links = 2 * (self.hnsw_m or 16) * 4
+        return points * (in_ram_bytes + hnsw_links)
+
+
+COLLECTION_SCHEMAS = {
+    # Original layout: float32 vectors in RAM, default HNSW
+    1: CollectionSchema(version=1),
+    # int8 scalar quantization kept in RAM, originals on disk for
+    # rescoring, denser HNSW graph built with a larger candidate list
+    2: CollectionSchema(
+        version=2,
+        hnsw_m=32,
+        hnsw_ef_construct=256,
+        on_disk_vectors=True,
+        int8_quantization=True,
+    ),
+}
+CURRENT_SCHEMA_VERSION = 2
+
+
+def get_collection_schema(
+    version: int = CURRENT_SCHEMA_VERSION,
+    dimensions: Optional[int] = None,
+) -> CollectionSchema:
+    """
+    Get a collection schema, optionally with shortened dense vectors.
+
+    text-embedding-3-large is trained so that a prefix of its embedding is
+    an embedding itself (Matryoshka representation), so ``dimensions`` may
+    be any size up to the full 3072.
+    """
+    if version not in COLLECTION_SCHEMAS:
+        raise ValueError(f"Unknown collection schema version: {version}")
+    schema = COLLECTION_SCHEMAS[version]
+    if dimensions is None or dimensions == schema.dense_size:
+        return schema
+    if not 0 < dimensions <= FULL_DENSE_SIZE:
+        raise ValueError(f"Unsupported vector dimensions: {dimensions}")
+    return replace(schema, dense_size=dimensions)
+
+
+def reduce_dimensions(vector: Sequence[float], dimensions: int) -> List[float]:
+    """
+    Shorten a text-embedding-3 vector to its first ``dimensions`` values
+    and rescale it to unit length, which is what the API returns when
+    asked for fewer dimensions.
+    """
+    prefix = np.asarray(vector[:dimensions], dtype=np.float32)
+    norm = np.linalg.norm(prefix)
+    if norm > 0:
+        prefix = prefix / norm
+    return prefix.tolist()
+
+
+def reduce_dimensions_transform(
+    dimensions: int,
+) -> Callable[[List[models.Record]], List[models.PointStruct]]:
+    """
+    Build a ``migrate`` transform that shortens the dense vectors of the
+    copied points and keeps their sparse vectors and payloads.
+    """
+
+    def transform(records: List[models.Record]) -> List[models.PointStruct]:
+        points = []
+        for record in records:
+            vectors = dict(record.vector or {})
+            if DENSE_VECTOR_NAME in vectors:
+                vectors[DENSE_VECTOR_NAME] = reduce_dimensions(
+                    vectors[DENSE_VECTOR_NAME], dimensions
+                )
+            points.append(
+                models.PointStruct(
+                    id=record.id, vector=vectors, payload=record.payload
+                )
+            )
+        return points
+
+    return transform
+
+
+class VectorCollectionManager:
+    """Creates, inspects and migrates versioned vector collections."""
+
+    def __init__(self, client: QdrantClient):
+        self._client = client
+
+    def alias_target(self, alias: str) -> Optional[str]:
+        """
+        Return the collection behind ``alias``, or None if it is not an
+        alias.
+        """
+        for item in self._client.get_aliases().aliases:
+            if item.alias_name == alias:
+                return item.collection_name
+        return None
+
+    def exists(self, name: str) -> bool:
+        """Check if ``name`` is an existing collection or alias."""
+        return (
+            self._client.collection_exists(name)
+            or self.alias_target(name) is not None
+        )
+
+    def ensure_collection(self, alias: str, schema: CollectionSchema) -> None:
+        """
+        Create the versioned collection for ``schema`` and the alias
+        pointing at it, unless ``alias`` already exists.
+        """
+        if self.exists(alias):
+            return
+        target = schema.collection_name(alias)
+        if not self._client.collection_exists(target):
+            self.create_collection(target, schema)
+        self._client.update_collection_aliases(
+            change_aliases_operations=[
+                models.CreateAliasOperation(
+                    create_alias=models.CreateAlias(
+                        collection_name=target, alias_name=alias
+                    )
+                )
+            ]
+        )
+
+    def create_collection(self, name: str, schema: CollectionSchema) -> None:
+        """
+        Create a collection with the given schema and its payload indexes.
+        """
+        self._client.create_collection(
+            collection_name=name,
+            vectors_config=schema.vectors_config(),
+            sparse_vectors_config=schema.sparse_vectors_config(),
+            quantization_config=schema.quantization_config(),
+        )
+        self.create_payload_indexes(name)
+        logger.info(f"Created collection {name} with schema v{schema.version}")
+
+    def create_payload_indexes(self, name: str) -> None:
+        """
+        Index the payload fields used to filter searches.
+        """
+        self._client.create_payload_index(
+            collection_name=name,
+            field_name=SUBSCRIPTION_ID_FIELD,
+            field_schema=models.PayloadSchemaType.KEYWORD,
+        )
+        self._client.create_payload_index(
+            collection_name=name,
+            field_name=PUBLISHED_AT_FIELD,
+            field_schema=models.PayloadSchemaType.DATETIME,
+        )
+        self._client.create_payload_index(
+            collection_name=name,
+            field_name=LANGUAGE_FIELD,
+            field_schema=models.PayloadSchemaType.KEYWORD,
+        )
+
+    def migrate(
+        self,
+        alias: str,
+        schema: CollectionSchema,
+        batch_size: int = 256,
+        transform: Optional[
+            Callable[[List[models.Record]], List[models.PointStruct]]
+        ] = None,
+        with_vectors: bool | List[str] = True,
+        switch_alias: bool = True,
+    ) -> str:
+        """
+        Build the collection for ``schema`` from the one currently served
+        under ``alias`` and point the alias at it.
+
+        Args:
+            alias: Name under which the collection is served.
+            schema: Target schema.
+            batch_size: Number of points copied per request.
+            transform: Optional function turning a batch of source records
+                into target points, e.g. to shorten or re-embed their
+                vectors. By default vectors and payloads are copied
+                unchanged.
+            with_vectors: Vectors loaded from the source collection and
+                handed to ``transform``.
+            switch_alias: Whether to point the alias at the new collection.
+                Pass False to build it side by side for evaluation and
+                switch later with ``switch_alias``.
+
+        Returns:
+            str: Name of the new physical collection.
+        """
+        source = self.alias_target(alias)
+        if source is None:
+            if not self._client.collection_exists(alias):
+                raise ValueError(f"Collection {alias} does not exist")
+            source = alias
+
+        target = schema.collection_name(alias)
+        if target == source:
+            logger.info(f"{alias} already uses schema v{schema.version}")
+            return target
+        if self._client.collection_exists(target):
+            self._client.delete_collection(collection_name=target)
+        self.create_collection(target, schema)
+
+        copied = self._copy_points(
+            source, target, batch_size, transform, with_vectors
+        )
+        logger.info(f"Copied {copied} points from {source} to {target}")
+
+        if switch_alias:
+            self.switch_alias(alias, target)
+        return target
+
+    def switch_alias(self, alias: str, target: str) -> None:
+        """
+        Point ``alias`` at the collection ``target``. A collection named
+        like the alias, created before aliases were used, is dropped.
+        """
+        if not self._client.collection_exists(target):
+            raise ValueError(f"Collection {target} does not exist")
+
+        operations = []
+        if self.alias_target(alias) is not None:
+            operations.append(
+                models.DeleteAliasOperation(
+                    delete_alias=models.DeleteAlias(alias_name=alias)
+                )
+            )
+        elif self._client.collection_exists(alias):
+            # An alias cannot share its name with a collection
+            self._client.delete_collection(collection_name=alias)
+        operations.append(
+            models.CreateAliasOperation(
+                create_alias=models.CreateAlias(
+                    collection_name=target, alias_name=alias
+                )
+            )
+        )
+        self._client.update_collection_aliases(
+            change_aliases_operations=operations
+        )
+        logger.info(f"Alias {alias} now points to {target}")
+
+    def _copy_points(
+        self,
+        source: str,
+        target: str,
+        batch_size: int,
+        transform: Optional[
+            Callable[[List[models.Record]], List[models.PointStruct]]
+        ],
+        with_vectors: bool | List[str],
+    ) -> int:
+        copied = 0
+        offset = None
+        while True:
+            records, offset = self._client.scroll(
+                collection_name=source,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=with_vectors,
+            )
+            if records:
+                if transform is None:
+                    points = [
+                        models.PointStruct(
+                            id=record.id,
+                            vector=record.vector,
+                            payload=record.payload,
+                        )
+                        for record in records
+                    ]
+                else:
+                    points = transform(records)
+                self._client.upsert(collection_name=target, points=points)
+                copied += len(points)
+            if offset is None:
+                return copied
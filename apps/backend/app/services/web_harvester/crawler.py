@@ -1,10 +1,13 @@
+import asyncio
 from abc import ABC, abstractmethod
 from datetime import datetime
 from enum import Enum
-from typing import Any, List
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional
 from urllib.parse import urlparse
 
 import feedparser
+import httpx
 import requests
 from eventregistry import (
     ArticleInfoFlags,
@@ -16,11 +19,89 @@ from eventregistry import (
 from app.core.config import get_configs
 from app.core.logger import BufferedLogger, get_logger
 from app.models.article import Article
+from app.models.rss_feed_state import RSSFeedState
 from app.models.subscription import Subscription
+from app.repositories.rss_feed_state_repository import RSSFeedStateRepository
 
 configs = get_configs()
 logger = get_logger(__name__)
 
+NEWSAPI_ARTICLES_URL = "https://eventregistry.org/api/v1/article/getArticles"
+# Maximum number of articles NewsAPI.ai returns per page
+NEWSAPI_PAGE_SIZE = 100
+
+# Pooled HTTP clients and per-host limits of the running event loop
+_clients_loop: asyncio.AbstractEventLoop | None = None
+_http_clients: Dict[str, httpx.AsyncClient] = {}
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+@lru_cache
+def get_event_registry() -> EventRegistry:
+    """Get the EventRegistry client shared by all NewsAPI crawlers."""
+    return EventRegistry(apiKey=configs.NEWSAPIAI_API_KEY)
+
+
+def _reset_on_new_loop() -> None:
+    """Drop the clients and limits of a previous event loop."""
+    global _clients_loop
+    loop = asyncio.get_running_loop()
+    if _clients_loop is not loop:
+        _http_clients.clear()
+        _host_semaphores.clear()
+        _clients_loop = loop
+
+
+def _get_http_client(
+    name: str, max_connections: int, timeout: httpx.Timeout
+) -> httpx.AsyncClient:
+    _reset_on_new_loop()
+    if name not in _http_clients:
+        _http_clients[name] = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=timeout,
+            follow_redirects=True,
+        )
+    return _http_clients[name]
+
+
+def get_newsapi_http_client() -> httpx.AsyncClient:
+    """
+    Get the pooled HTTP client shared by all NewsAPI crawlers of the
+    running event loop.
+    """
+    return _get_http_client(
+        "newsapi",
+        configs.NEWSAPI_MAX_CONCURRENT_SOURCES,
+        httpx.Timeout(60.0, connect=10.0),
+    )
+
+
+def get_rss_http_client() -> httpx.AsyncClient:
+    """
+    Get the pooled HTTP client shared by all RSS crawlers of the running
+    event loop.
+    """
+    return _get_http_client(
+        "rss", configs.RSS_MAX_CONNECTIONS, httpx.Timeout(30.0, connect=10.0)
+    )
+
+
+def get_host_semaphore(host: str) -> asyncio.Semaphore:
+    """
+    Limit the number of concurrent requests to one host, across all
+    crawlers of the running event loop.
+    """
+    _reset_on_new_loop()
+    if host not in _host_semaphores:
+        _host_semaphores[host] = asyncio.Semaphore(
+            configs.RSS_MAX_CONNECTIONS_PER_HOST
+        )
+    return _host_semaphores[host]
+
 
 class Crawler(ABC):
     """
@@ -80,7 +161,7 @@ class NewsAPICrawler(Crawler):
             )
 
         try:
-            self.er = EventRegistry(apiKey=configs.NEWSAPIAI_API_KEY)
+            self.er = get_event_registry()
         except Exception as e:
             self.logger.error(f"Failed to initialize EventRegistry: {e}")
             raise
@@ -108,50 +189,12 @@ class NewsAPICrawler(Crawler):
             )
         )
 
-        articles = []
-        for article in articles_query_iter.execQuery(
-            self.er, maxItems=limit, sortBy="rel", returnInfo=returnInfo
-        ):
-            category_list = (
-                [
-                    category.get("uri")
-                    for category in article.get("categories", [])
-                ]
-                if article.get("categories")
-                else []
-            )
-
-            author_list = (
-                [author.get("name") for author in article.get("authors", [])]
-                if article.get("authors")
-                else []
-            )
-
-            published_at_str = article.get("dateTimePub")
-            published_at = None
-            if published_at_str:
-                try:
-                    published_at = datetime.strptime(
-                        published_at_str, "%Y-%m-%dT%H:%M:%SZ"
-                    )
-                except ValueError:
-                    self.logger.warning(
-                        f"Could not parse dateTimePub: {published_at_str}"
-                    )
-
-            articles.append(
-                Article(
-                    title=article.get("title"),
-                    url=article.get("url"),
-                    published_at=published_at,
-                    authors=author_list,
-                    subscription_id=self.subscription.id,
-                    categories=category_list,
-                    relevance=article.get("relevance", 0),
-                    image_url=article.get("image"),
-                    language=self._parse_language(article.get("lang")),
-                )
+        articles = [
+            self._to_article(article)
+            for article in articles_query_iter.execQuery(
+                self.er, maxItems=limit, sortBy="rel", returnInfo=returnInfo
             )
+        ]
 
         self.logger.info(
             f"Found {len(articles)} for {self.subscription.name}."
@@ -164,6 +207,100 @@ class NewsAPICrawler(Crawler):
 
         return articles
 
+    async def crawl_pages(
+        self,
+        date_start: datetime | None = None,
+        date_end: datetime | None = None,
+        limit: int = -1,
+    ) -> AsyncIterator[List[Article]]:
+        """
+        Like ``crawl_urls``, but queries the NewsAPI.ai REST API with the
+        shared async HTTP client and yields the articles page by page, as
+        they arrive.
+        """
+        client = get_newsapi_http_client()
+        query = self._build_query(date_start, date_end)
+        found = 0
+        page = 1
+        while limit == -1 or found < limit:
+            count = NEWSAPI_PAGE_SIZE
+            if limit != -1:
+                count = min(count, limit - found)
+            try:
+                response = await client.post(
+                    NEWSAPI_ARTICLES_URL,
+                    json={
+                        "apiKey": configs.NEWSAPIAI_API_KEY,
+                        "query": query,
+                        "resultType": "articles",
+                        "articlesSortBy": "rel",
+                        "articlesPage": page,
+                        "articlesCount": count,
+                        "includeArticleCategories": True,
+                        "includeArticleAuthors": True,
+                        "includeArticleImage": True,
+                    },
+                )
+                response.raise_for_status()
+                data = response.json().get("articles", {})
+            except (httpx.HTTPError, ValueError) as e:
+                self.logger.error(
+                    f"Failed to fetch page {page} for "
+                    f"{self.subscription.name}: {e}"
+                )
+                break
+
+            results = data.get("results", [])
+            if not results:
+                break
+            found += len(results)
+            yield [self._to_article(article) for article in results]
+            if page >= data.get("pages", page):
+                break
+            page += 1
+
+        self.logger.info(f"Found {found} for {self.subscription.name}.")
+
+    def _to_article(self, article: dict) -> Article:
+        """
+        Builds an Article from an article returned by NewsAPI.ai.
+        """
+        category_list = (
+            [category.get("uri") for category in article.get("categories", [])]
+            if article.get("categories")
+            else []
+        )
+
+        author_list = (
+            [author.get("name") for author in article.get("authors", [])]
+            if article.get("authors")
+            else []
+        )
+
+        published_at_str = article.get("dateTimePub")
+        published_at = None
+        if published_at_str:
+            try:
+                published_at = datetime.strptime(
+                    published_at_str, "%Y-%m-%dT%H:%M:%SZ"
+                )
+            except ValueError:
+                self.logger.warning(
+                    f"Could not parse dateTimePub: {published_at_str}"
+                )
+
+        return Article(
+            title=article.get("title"),
+            url=article.get("url"),
+            published_at=published_at,
+            authors=author_list,
+            subscription_id=self.subscription.id,
+            categories=category_list,
+            relevance=article.get("relevance", 0),
+            image_url=article.get("image"),
+            language=self._parse_language(article.get("lang")),
+        )
+
     def _build_query(
         self, date_start: datetime | None, date_end: datetime | None
     ):
@@ -299,56 +436,165 @@ class RSSFeedCrawler(Crawler):
 
         for feed_url in self.feed_urls:
             feed = feedparser.parse(feed_url)
-            for entry in feed.entries:
-                if limit != -1 and len(articles) >= limit:
-                    break
+            remaining = -1 if limit == -1 else limit - len(articles)
+            articles.extend(
+                self._feed_articles(feed, date_start, date_end, remaining)
+            )
 
-                published = None
-                if "published_parsed" in entry and entry.published_parsed:
-                    published = datetime(*entry.published_parsed[:6])
-                elif "updated_parsed" in entry and entry.updated_parsed:
-                    published = datetime(*entry.updated_parsed[:6])
-                else:
-                    # If no date, skip
-                    continue
+            if limit != -1 and len(articles) >= limit:
+                break
+        return articles
 
-                # Filter by date range if specified
-                if date_start and published < date_start:
-                    continue
-                if date_end and published > date_end:
+    async def crawl_pages(
+        self,
+        date_start: datetime | None = None,
+        date_end: datetime | None = None,
+        limit: int = -1,
+    ) -> AsyncIterator[List[Article]]:
+        """
+        Like ``crawl_urls``, but downloads the feeds concurrently with the
+        shared async HTTP client and yields the articles of each feed as
+        soon as it is parsed.
+
+        Feeds are requested with the ETag and Last-Modified of their last
+        download, so unchanged feeds are answered with 304 Not Modified
+        and skipped. The validators of a feed are stored once all of its
+        articles, if any, have been yielded and consumed; feeds cut off by
+        ``limit`` are downloaded in full again next time.
+        """
+        states = await RSSFeedStateRepository.get_states(self.feed_urls)
+        fetches = [
+            asyncio.create_task(
+                self._fetch_feed(feed_url, states.get(feed_url))
+            )
+            for feed_url in self.feed_urls
+        ]
+        found = 0
+        try:
+            for fetch in asyncio.as_completed(fetches):
+                result = await fetch
+                if result is None:
                     continue
+                feed_url, feed, etag, last_modified = result
+                articles = self._feed_articles(feed, date_start, date_end, -1)
+                complete = limit == -1 or found + len(articles) <= limit
+                if not complete:
+                    articles = articles[: limit - found]
+                found += len(articles)
+                if articles:
+                    yield articles
+                if complete:
+                    await RSSFeedStateRepository.save_state(
+                        feed_url, etag, last_modified
+                    )
+                if limit != -1 and found >= limit:
+                    break
+        finally:
+            for fetch in fetches:
+                fetch.cancel()
 
-                # Extract authors (if any)
-                authors = []
-                if "authors" in entry:
-                    authors = [
-                        author.name
-                        for author in entry.authors
-                        if hasattr(author, "name")
-                    ]
-                elif "author" in entry:
-                    authors = [entry.author]
-
-                # Extract categories/tags (if any)
-                categories = []
-                if "tags" in entry:
-                    categories = [
-                        tag.term for tag in entry.tags if hasattr(tag, "term")
-                    ]
+    async def _fetch_feed(
+        self, feed_url: str, state: Optional[RSSFeedState]
+    ) -> Optional[tuple]:
+        """
+        Download and parse a feed, unless it has not changed since its
+        last download.
 
-                article = Article(
-                    title=entry.title,
-                    url=entry.link,
-                    authors=authors if authors else None,
-                    published_at=published,
-                    language=self.language,
-                    categories=categories if categories else None,
-                    subscription_id=self.subscription.id,
-                )
-                articles.append(article)
+        Returns:
+            tuple: The feed URL, the parsed feed and its ETag and
+            Last-Modified headers, or None if the feed has not changed or
+            could not be downloaded.
+        """
+        headers = {}
+        if state is not None and state.etag:
+            headers["If-None-Match"] = state.etag
+        if state is not None and state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+
+        client = get_rss_http_client()
+        try:
+            async with get_host_semaphore(urlparse(feed_url).netloc):
+                response = await client.get(feed_url, headers=headers)
+            if response.status_code == 304:
+                self.logger.info(f"Feed {feed_url} has not changed.")
+                return None
+            response.raise_for_status()
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
+            self.logger.error(f"Failed to download feed {feed_url}: {e}")
+            return None
+
+        # Parsing is CPU bound, keep it off the event loop
+        feed = await asyncio.to_thread(
+            feedparser.parse,
+            response.content,
+            response_headers=dict(response.headers),
+        )
+        return (
+            feed_url,
+            feed,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
 
+    def _feed_articles(
+        self,
+        feed,
+        date_start: datetime | None,
+        date_end: datetime | None,
+        limit: int = -1,
+    ) -> List[Article]:
+        """
+        Builds the articles of the entries of a parsed feed published
+        between ``date_start`` and ``date_end``.
+        """
+        articles: List[Article] = []
+        for entry in feed.entries:
             if limit != -1 and len(articles) >= limit:
                 break
+
+            published = None
+            if "published_parsed" in entry and entry.published_parsed:
+                published = datetime(*entry.published_parsed[:6])
+            elif "updated_parsed" in entry and entry.updated_parsed:
+                published = datetime(*entry.updated_parsed[:6])
+            else:
+                # If no date, skip
+                continue
+
+            # Filter by date range if specified
+            if date_start and published < date_start:
+                continue
+            if date_end and published > date_end:
+                continue
+
+            # Extract authors (if any)
+            authors = []
+            if "authors" in entry:
+                authors = [
+                    author.name
+                    for author in entry.authors
+                    if hasattr(author, "name")
+                ]
+            elif "author" in entry:
+                authors = [entry.author]
+
+            # Extract categories/tags (if any)
+            categories = []
+            if "tags" in entry:
+                categories = [
+                    tag.term for tag in entry.tags if hasattr(tag, "term")
+                ]
+
+            article = Article(
+                title=entry.title,
+                url=entry.link,
+                authors=authors if authors else None,
+                published_at=published,
+                language=self.language,
+                categories=categories if categories else None,
+                subscription_id=self.subscription.id,
+            )
+            articles.append(article)
         return articles
 
 
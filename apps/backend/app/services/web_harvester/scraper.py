@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
 from enum import Enum
+from urllib.parse import urljoin, urlsplit
 
 import trafilatura
 from newspaper import Article as NewspaperArticle
@@ -9,6 +10,7 @@ from app.core.languages import Language
 from app.core.logger import BufferedLogger, get_logger
 from app.models.article import Article
 from app.models.subscription import Subscription
+from app.services.web_harvester.utils.url_utils import canonicalize_url
 
 logger = get_logger(__name__)
 
@@ -65,6 +67,16 @@ class Scraper(ABC):
             article.image_url = metadata.get("image")
         if not article.content:
             article.content = content
+        # Syndicated copies and AMP pages link to the original page. Some
+        # sites link every page to their home page, which is ignored.
+        canonical_url = metadata.get("url")
+        if canonical_url:
+            canonical_url = canonicalize_url(
+                urljoin(article.url, canonical_url)
+            )
+            if urlsplit(canonical_url).path in ("", "/"):
+                canonical_url = None
+        article.canonical_url = canonical_url or article.url
         article.scraped_at = datetime.now(timezone.utc)
         article.status = article.status.SCRAPED
         self.logger.info(
@@ -187,6 +199,8 @@ class Newspaper4kScraper(Scraper):
             if newspaper_article.authors:
                 # Join authors with semicolon to match trafilatura format
                 metadata["author"] = ";".join(newspaper_article.authors)
+            if newspaper_article.canonical_link:
+                metadata["url"] = newspaper_article.canonical_link
             if newspaper_article.top_image:
                 metadata["image"] = newspaper_article.top_image
             if newspaper_article.meta_description:
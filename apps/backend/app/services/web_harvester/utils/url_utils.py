@@ -0,0 +1,92 @@
+import re
+from typing import Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.models.article import Article
+
+# Query parameters added by newsletters, social networks and ad networks
+TRACKING_PARAMS = {
+    "_ga",
+    "_gl",
+    "cmpid",
+    "dclid",
+    "fbclid",
+    "gclid",
+    "gclsrc",
+    "igshid",
+    "mkt_tok",
+    "msclkid",
+    "ncid",
+    "ocid",
+    "ref",
+    "ref_src",
+    "smid",
+    "sr_share",
+    "wt_mc",
+    "wt_zmc",
+    "xtor",
+    "yclid",
+}
+TRACKING_PARAM_PREFIXES = ("utm_", "mc_", "pk_", "hsa_", "at_", "itm_")
+
+# Query parameters requesting the AMP variant of a page
+AMP_PARAMS = {"amp", "outputtype"}
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_AMP_PATH_RE = re.compile(r"(/amp/?$|\.amp(?=\.html?$|$))", re.IGNORECASE)
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return (
+        name in TRACKING_PARAMS
+        or name in AMP_PARAMS
+        or name.startswith(TRACKING_PARAM_PREFIXES)
+    )
+
+
+def canonicalize_url(url: Optional[str]) -> Optional[str]:
+    """
+    Normalize an article URL so that the copies of a page reached through
+    different links get the same URL: the scheme and host are lowercased,
+    default ports, fragments and tracking parameters are removed, the
+    remaining parameters are sorted, and AMP variants are mapped to the
+    regular page.
+
+    URLs that are not http(s) URLs are returned unchanged.
+    """
+    if not url:
+        return url
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parts.hostname:
+        return url
+
+    host = parts.hostname.lower()
+    if host.startswith("amp."):
+        host = host[len("amp.") :]
+    if port and port != _DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    path = _AMP_PATH_RE.sub("", parts.path) or "/"
+    query = urlencode(
+        sorted(
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not _is_tracking_param(name)
+        )
+    )
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def canonicalize_articles(articles: Iterable[Article]) -> List[Article]:
+    """Canonicalize the URLs of crawled articles in place."""
+    articles = list(articles)
+    for article in articles:
+        article.url = canonicalize_url(article.url)
+    return articles
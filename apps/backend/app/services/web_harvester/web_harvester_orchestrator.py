@@ -1,11 +1,14 @@
 import asyncio
+import inspect
 import random
 import time
 from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import date, datetime, timedelta, timezone
 
 from selenium.webdriver.support.ui import WebDriverWait
 
+from app.core.config import get_configs
 from app.core.logger import get_logger
 from app.models.article import Article, ArticleStatus
 from app.models.crawl_stats import CrawlStats
@@ -23,6 +26,7 @@ from app.services.article_cleaner.article_valid_check import (
 from app.services.login_llm_service import LoginLLM
 from app.services.web_harvester.crawler import Crawler, CrawlerType
 from app.services.web_harvester.scraper import Scraper
+from app.services.web_harvester.utils.url_utils import canonicalize_articles
 from app.services.web_harvester.utils.web_utils import (
     create_driver,
     get_response_code,
@@ -32,6 +36,7 @@ from app.services.web_harvester.utils.web_utils import (
     safe_page_load,
 )
 
+configs = get_configs()
 logger = get_logger(__name__)
 
 
@@ -42,28 +47,59 @@ async def run_crawler(
     limit: int = 100,
 ):
     subscriptions = await get_subscriptions_with_crawlers(crawler)
+    # NewsAPI limits the concurrent requests of an API key. RSS feeds are
+    # bounded by their HTTP client, blocking crawlers by the thread pool
+    semaphore = (
+        asyncio.Semaphore(configs.NEWSAPI_MAX_CONCURRENT_SOURCES)
+        if crawler is CrawlerType.NewsAPICrawler
+        else nullcontext()
+    )
 
     async def run_crawler_runner(subscription, crawler):
         crawler: Crawler = subscription.crawlers[crawler.value]
-        crawl_result = crawler.crawl_urls(
-            date_start=date_start,
-            date_end=date_end,
-            limit=limit,
-        )
-
-        # Check if crawl_urls returned a coroutine (async method)
-        import inspect
+        async with semaphore:
+            # Crawlers that fetch pages asynchronously store each page as
+            # it arrives
+            if hasattr(crawler, "crawl_pages"):
+                async for articles in crawler.crawl_pages(
+                    date_start=date_start,
+                    date_end=date_end,
+                    limit=limit,
+                ):
+                    await ArticleRepository.create_articles_batch(
+                        canonicalize_articles(articles), logger=logger
+                    )
+                return
 
-        if inspect.iscoroutine(crawl_result):
-            articles = await crawl_result
-        else:
-            articles = crawl_result
+            if inspect.iscoroutinefunction(crawler.crawl_urls):
+                articles = await crawler.crawl_urls(
+                    date_start=date_start,
+                    date_end=date_end,
+                    limit=limit,
+                )
+            else:
+                # Keep blocking crawlers off the event loop
+                articles = await asyncio.to_thread(
+                    crawler.crawl_urls,
+                    date_start=date_start,
+                    date_end=date_end,
+                    limit=limit,
+                )
 
-        await ArticleRepository.create_articles_batch(articles, logger=logger)
+        await ArticleRepository.create_articles_batch(
+            canonicalize_articles(articles), logger=logger
+        )
 
-    await asyncio.gather(
-        *(run_crawler_runner(sub, crawler) for sub in subscriptions)
+    results = await asyncio.gather(
+        *(run_crawler_runner(sub, crawler) for sub in subscriptions),
+        return_exceptions=True,
     )
+    for subscription, result in zip(subscriptions, results):
+        if isinstance(result, Exception):
+            logger.error(
+                f"Crawler failed for subscription {subscription.name}: "
+                f"{result}"
+            )
 
 
 # Configure timeouts
@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+parser = argparse.ArgumentParser(prog="benchmark-language-detection.py")
+parser.add_argument(
+    "--app-dir", help="Directory containing the app", default=None
+)
+parser.add_argument(
+    "--limit", type=int, help="Number of articles to load", default=1000
+)
+
+
+async def load_texts(limit):
+    """
+    Load the titles and contents of the most recently scraped articles.
+    """
+    from sqlalchemy import select
+
+    from app.core.db import async_session
+    from app.models.article import Article
+
+    async with async_session() as session:
+        rows = await session.execute(
+            select(Article.title, Article.content)
+            .where(Article.scraped_at.isnot(None))
+            .order_by(Article.scraped_at.desc())
+            .limit(limit)
+        )
+        texts = []
+        for title, content in rows.all():
+            texts.extend(text for text in (title, content) if text)
+        return texts
+
+
+def benchmark(name, detect, texts):
+    languages = []
+    latencies = []
+    for text in texts:
+        start = time.perf_counter()
+        try:
+            languages.append(detect(text))
+        except LangDetectException:
+            languages.append(None)
+        latencies.append((time.perf_counter() - start) * 1_000_000)
+    print(
+        f"{name:<12} {statistics.mean(latencies):>10.1f} "
+        f"{statistics.median(latencies):>10.1f} "
+        f"{sum(latencies) / 1_000_000:>8.2f}"
+    )
+    return languages
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+
+    if args.app_dir is not None:
+        print(f"adding {args.app_dir} to sys.path")
+        sys.path.insert(0, args.app_dir)
+
+    from langdetect import LangDetectException
+    from langdetect import detect as langdetect_detect
+
+    from app.services.language_detection_service import detect_language
+
+    texts = asyncio.run(load_texts(args.limit))
+    if not texts:
+        print("no scraped articles")
+        sys.exit(0)
+    print(f"detecting the language of {len(texts)} texts")
+
+    print(f"{'detector':<12} {'mean µs':>10} {'median µs':>10} {'total s':>8}")
+    detected = benchmark("service", detect_language, texts)
+    reference = benchmark("langdetect", langdetect_detect, texts)
+    agreement = sum(a == b for a, b in zip(detected, reference)) / len(texts)
+    print(f"agreement with langdetect: {agreement:.1%}")
@@ -0,0 +1,120 @@
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+parser = argparse.ArgumentParser(prog="evaluate-vector-dimensions.py")
+parser.add_argument(
+    "collections",
+    nargs="+",
+    help="Collections to compare, e.g. articles_v2 articles_v2_1024d",
+)
+parser.add_argument(
+    "--app-dir", help="Directory containing the app", default=None
+)
+parser.add_argument("--k", type=int, help="Results per query", default=50)
+parser.add_argument(
+    "--min-matches",
+    type=int,
+    help="Skip topics with fewer stored matches",
+    default=3,
+)
+
+
+async def load_topic_matches(min_matches):
+    """
+    Map each topic query to the article IDs previously matched to it.
+    """
+    from sqlalchemy import select
+
+    from app.core.db import async_session
+    from app.models.match import Match
+    from app.repositories.search_profile_repository import (
+        SearchProfileRepository,
+    )
+    from app.services.article_matching_service import ArticleMatchingService
+
+    async with async_session() as session:
+        rows = await session.execute(
+            select(Match.topic_id, Match.article_id).where(
+                Match.topic_id.isnot(None)
+            )
+        )
+        matched = defaultdict(set)
+        for topic_id, article_id in rows.all():
+            matched[topic_id].add(str(article_id))
+
+    queries = {}
+    for profile in await SearchProfileRepository.fetch_profiles_with_topics():
+        for topic in profile.topics:
+            if len(matched.get(topic.id, ())) >= min_matches:
+                query = ArticleMatchingService._build_topic_query(topic)
+                queries.setdefault(query, set()).update(matched[topic.id])
+    return queries
+
+
+def evaluate(client, collection, queries, full_vectors, k):
+    info = client.get_collection(collection_name=collection)
+    dimensions = info.config.params.vectors[DENSE_VECTOR_NAME].size
+
+    recalls = []
+    latencies = []
+    for (query, expected), vector in zip(queries.items(), full_vectors):
+        start = time.perf_counter()
+        response = client.query_points(
+            collection_name=collection,
+            query=reduce_dimensions(vector, dimensions),
+            using=DENSE_VECTOR_NAME,
+            limit=k,
+            with_payload=False,
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        found = {str(point.id) for point in response.points}
+        recalls.append(len(expected & found) / len(expected))
+
+    vector_mb = info.points_count * dimensions * 4 / 1024 / 1024
+    print(
+        f"{collection:<32} {dimensions:>6} "
+        f"{statistics.mean(recalls):>10.3f} "
+        f"{statistics.median(latencies):>8.1f} {vector_mb:>10.1f}"
+    )
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+
+    if args.app_dir is not None:
+        print(f"adding {args.app_dir} to sys.path")
+        sys.path.insert(0, args.app_dir)
+
+    from langchain_openai import OpenAIEmbeddings
+    from pydantic import SecretStr
+
+    from app.core.config import get_configs
+    from app.core.db import get_qdrant_connection
+    from app.services.vector_collection_manager import (
+        DENSE_VECTOR_NAME,
+        reduce_dimensions,
+    )
+
+    queries = asyncio.run(load_topic_matches(args.min_matches))
+    if not queries:
+        print("no topics with enough stored matches")
+        sys.exit(0)
+    print(f"replaying {len(queries)} topic queries")
+
+    embeddings = OpenAIEmbeddings(
+        model="text-embedding-3-large",
+        api_key=SecretStr(get_configs().OPENAI_API_KEY),
+    )
+    full_vectors = embeddings.embed_documents(list(queries))
+
+    client = get_qdrant_connection()
+    print(
+        f"{'collection':<32} {'dims':>6} {'recall@' + str(args.k):>10} "
+        f"{'ms':>8} {'float MiB':>10}"
+    )
+    for collection in args.collections:
+        evaluate(client, collection, queries, full_vectors, args.k)
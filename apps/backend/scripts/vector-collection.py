@@ -0,0 +1,267 @@
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+from qdrant_client import models
+
+parser = argparse.ArgumentParser(prog="vector-collection.py")
+parser.add_argument(
+    "--app-dir", help="Directory containing the app", default=None
+)
+parser.add_argument(
+    "--collection",
+    help="Collection or alias name. Defaults to ARTICLE_VECTORS_COLLECTION",
+    default=None,
+)
+subparsers = parser.add_subparsers(dest="command", required=True)
+
+migrate_parser = subparsers.add_parser(
+    "migrate", help="Copy the collection into a new schema version"
+)
+migrate_parser.add_argument(
+    "--version", type=int, help="Target schema version", default=None
+)
+migrate_parser.add_argument(
+    "--batch-size", type=int, help="Points copied per request", default=256
+)
+
+reduce_parser = subparsers.add_parser(
+    "reduce",
+    help="Copy the collection into one with shorter dense vectors",
+)
+reduce_parser.add_argument(
+    "--dimensions", type=int, help="Target dense vector size", required=True
+)
+reduce_parser.add_argument(
+    "--version", type=int, help="Target schema version", default=None
+)
+reduce_parser.add_argument(
+    "--batch-size", type=int, help="Points copied per request", default=256
+)
+reduce_parser.add_argument(
+    "--reembed",
+    action="store_true",
+    help="Embed the stored summaries again instead of shortening vectors",
+)
+reduce_parser.add_argument(
+    "--no-switch",
+    action="store_true",
+    help="Build the new collection without pointing the alias at it",
+)
+
+switch_parser = subparsers.add_parser(
+    "switch", help="Point the alias at another collection"
+)
+switch_parser.add_argument(
+    "target", help="Name of the collection to serve under the alias"
+)
+
+subparsers.add_parser(
+    "sync-payloads",
+    help="Create missing payload indexes and rewrite article payloads",
+)
+
+benchmark_parser = subparsers.add_parser(
+    "benchmark", help="Measure recall and latency against exact search"
+)
+benchmark_parser.add_argument(
+    "--queries", type=int, help="Number of sampled queries", default=100
+)
+benchmark_parser.add_argument(
+    "--k", type=int, help="Results per query", default=10
+)
+benchmark_parser.add_argument(
+    "--ef",
+    type=int,
+    nargs="+",
+    help="hnsw_ef values to try",
+    default=[64, 128, 256],
+)
+benchmark_parser.add_argument(
+    "--oversampling",
+    type=float,
+    nargs="+",
+    help="Rescoring oversampling factors to try",
+    default=[1.0, 2.0, 4.0],
+)
+
+
+def search_ids(client, collection, vector, k, params):
+    response = client.query_points(
+        collection_name=collection,
+        query=vector,
+        using=DENSE_VECTOR_NAME,
+        limit=k,
+        search_params=params,
+        with_payload=False,
+    )
+    return [point.id for point in response.points]
+
+
+def reembed_transform(dimensions):
+    from langchain_openai import OpenAIEmbeddings
+    from pydantic import SecretStr
+
+    embeddings = OpenAIEmbeddings(
+        model="text-embedding-3-large",
+        api_key=SecretStr(get_configs().OPENAI_API_KEY),
+        dimensions=dimensions,
+    )
+
+    def transform(records):
+        dense_vectors = embeddings.embed_documents(
+            [record.payload.get("page_content", "") for record in records]
+        )
+        return [
+            models.PointStruct(
+                id=record.id,
+                vector={
+                    DENSE_VECTOR_NAME: dense_vector,
+                    SPARSE_VECTOR_NAME: record.vector[SPARSE_VECTOR_NAME],
+                },
+                payload=record.payload,
+            )
+            for record, dense_vector in zip(records, dense_vectors)
+        ]
+
+    return transform
+
+
+def benchmark(client, collection, args):
+    records, _ = client.scroll(
+        collection_name=collection,
+        limit=args.queries,
+        with_payload=False,
+        with_vectors=[DENSE_VECTOR_NAME],
+    )
+    vectors = [record.vector[DENSE_VECTOR_NAME] for record in records]
+    if not vectors:
+        print(f"{collection} has no points to sample")
+        return
+
+    exact = models.SearchParams(exact=True)
+    truth = [
+        set(search_ids(client, collection, vector, args.k, exact))
+        for vector in vectors
+    ]
+
+    configurations = []
+    for ef in args.ef:
+        configurations.append(
+            (
+                f"float32 ef={ef}",
+                models.SearchParams(
+                    hnsw_ef=ef,
+                    quantization=models.QuantizationSearchParams(ignore=True),
+                ),
+            )
+        )
+        configurations.append(
+            (
+                f"int8 ef={ef}",
+                models.SearchParams(
+                    hnsw_ef=ef,
+                    quantization=models.QuantizationSearchParams(
+                        rescore=False
+                    ),
+                ),
+            )
+        )
+        for oversampling in args.oversampling:
+            configurations.append(
+                (
+                    f"int8+rescore x{oversampling} ef={ef}",
+                    models.SearchParams(
+                        hnsw_ef=ef,
+                        quantization=models.QuantizationSearchParams(
+                            rescore=True, oversampling=oversampling
+                        ),
+                    ),
+                )
+            )
+
+    print(f"{'configuration':<32} {'recall@' + str(args.k):>10} {'ms':>8}")
+    for label, params in configurations:
+        recalls = []
+        latencies = []
+        for vector, expected in zip(vectors, truth):
+            start = time.perf_counter()
+            found = search_ids(client, collection, vector, args.k, params)
+            latencies.append((time.perf_counter() - start) * 1000)
+            recalls.append(len(expected.intersection(found)) / len(expected))
+        print(
+            f"{label:<32} {statistics.mean(recalls):>10.3f} "
+            f"{statistics.median(latencies):>8.1f}"
+        )
+
+    points = client.count(collection_name=collection, exact=True).count
+    print(f"\nestimated dense RAM for {points} points")
+    for version, schema in sorted(COLLECTION_SCHEMAS.items()):
+        ram_mb = schema.estimated_ram_bytes(points) / 1024 / 1024
+        print(f"schema v{version:<3} {ram_mb:>10.1f} MiB")
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+
+    if args.app_dir is not None:
+        print(f"adding {args.app_dir} to sys.path")
+        sys.path.insert(0, args.app_dir)
+
+    from app.core.config import get_configs
+    from app.core.db import get_qdrant_connection
+    from app.services.vector_collection_manager import (
+        COLLECTION_SCHEMAS,
+        CURRENT_SCHEMA_VERSION,
+        DENSE_VECTOR_NAME,
+        SPARSE_VECTOR_NAME,
+        VectorCollectionManager,
+        get_collection_schema,
+        reduce_dimensions_transform,
+    )
+
+    collection = args.collection or get_configs().ARTICLE_VECTORS_COLLECTION
+    client = get_qdrant_connection()
+
+    if args.command == "migrate":
+        schema = get_collection_schema(args.version or CURRENT_SCHEMA_VERSION)
+        manager = VectorCollectionManager(client)
+        target = manager.migrate(collection, schema, args.batch_size)
+        print(f"{collection} now points to {target}")
+    elif args.command == "reduce":
+        schema = get_collection_schema(
+            args.version or CURRENT_SCHEMA_VERSION, args.dimensions
+        )
+        if args.reembed:
+            transform = reembed_transform(args.dimensions)
+            with_vectors = [SPARSE_VECTOR_NAME]
+        else:
+            transform = reduce_dimensions_transform(args.dimensions)
+            with_vectors = True
+        manager = VectorCollectionManager(client)
+        target = manager.migrate(
+            collection,
+            schema,
+            args.batch_size,
+            transform=transform,
+            with_vectors=with_vectors,
+            switch_alias=not args.no_switch,
+        )
+        if args.no_switch:
+            print(f"built {target}")
+        else:
+            print(f"{collection} now points to {target}")
+            print(f"set ARTICLE_VECTOR_DIMENSIONS={args.dimensions}")
+    elif args.command == "switch":
+        VectorCollectionManager(client).switch_alias(collection, args.target)
+        print(f"{collection} now points to {args.target}")
+    elif args.command == "sync-payloads":
+        from app.services.article_vector_service import ArticleVectorService
+
+        VectorCollectionManager(client).create_payload_indexes(collection)
+        updated = asyncio.run(ArticleVectorService().sync_payloads())
+        print(f"updated payloads of {updated} articles")
+    else:
+        benchmark(client, collection, args)
@@ -1,3 +1,5 @@
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -36,3 +38,26 @@ def disable_auth(monkeypatch):
     Otherwise the pytest won't run locally without changing it.
     """
     monkeypatch.setattr(configs, "DISABLE_AUTH", False)
+
+
+@pytest.fixture
+def fake_async_session(monkeypatch):
+    """
+    Patch ``async_session`` of the given modules (module objects or dotted
+    paths) with a context manager yielding one mocked session, whose
+    ``commit`` and ``rollback`` can be awaited. Returns the session.
+    """
+    session = MagicMock(commit=AsyncMock(), rollback=AsyncMock())
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=session)
+    context.__aexit__ = AsyncMock(return_value=False)
+
+    def patch(*modules):
+        for module in modules:
+            if isinstance(module, str):
+                monkeypatch.setattr(f"{module}.async_session", lambda: context)
+            else:
+                monkeypatch.setattr(module, "async_session", lambda: context)
+        return session
+
+    return patch
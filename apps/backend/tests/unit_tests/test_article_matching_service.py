@@ -0,0 +1,148 @@
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from app.services.article_matching_service import ArticleMatchingService
+
+
+@pytest.fixture
+def matching_service(monkeypatch):
+    monkeypatch.setattr(
+        "app.services.article_matching_service.ArticleVectorService",
+        MagicMock,
+    )
+    return ArticleMatchingService()
+
+
+def make_profile():
+    keywords = [
+        SimpleNamespace(id=uuid.uuid4(), name="Tariffs"),
+        SimpleNamespace(id=uuid.uuid4(), name="ESG"),
+    ]
+    topic = SimpleNamespace(id=uuid.uuid4(), name="Trade", keywords=keywords)
+    return SimpleNamespace(id=uuid.uuid4(), topics=[topic])
+
+
+def test_build_query_matrix_deduplicates_queries(matching_service):
+    profiles = [make_profile(), make_profile()]
+    matching_service.article_vector_service.embed_queries.side_effect = (
+        lambda queries: [[float(i + 1), 0.0] for i in range(len(queries))]
+    )
+
+    rows, matrix = matching_service._build_query_matrix(profiles)
+
+    assert list(rows) == ["Topic Trade: Tariffs, ESG", "Tariffs", "ESG"]
+    assert matrix.shape == (3, 2)
+    np.testing.assert_allclose(np.linalg.norm(matrix, axis=1), 1.0)
+
+
+def test_accumulate_profile_scores_applies_thresholds(matching_service):
+    profile = make_profile()
+    topic = profile.topics[0]
+    tariffs, esg = topic.keywords
+    rows = {"Topic Trade: Tariffs, ESG": 0, "Tariffs": 1, "ESG": 2}
+    article_ids = [uuid.uuid4(), uuid.uuid4()]
+    scores = np.array(
+        [
+            [0.9, 0.2],  # topic: only the first article matches
+            [0.5, 0.9],
+            [0.1, 0.9],
+        ]
+    )
+    topic_scores = {topic.id: {}}
+    keyword_scores = {topic.id: {}}
+
+    matching_service._accumulate_profile_scores(
+        profile, scores, rows, article_ids, topic_scores, keyword_scores
+    )
+
+    assert topic_scores[topic.id] == {article_ids[0]: pytest.approx(0.9)}
+    assert keyword_scores[topic.id] == {
+        article_ids[0]: {tariffs.id: [pytest.approx(0.5)], esg.id: []}
+    }
+
+
+@pytest.mark.asyncio
+async def test_run_incremental_carries_over_missing_vectors(
+    matching_service, monkeypatch, fake_async_session
+):
+    module = "app.services.article_matching_service"
+    present, missing = uuid.uuid4(), uuid.uuid4()
+    fake_async_session(module)
+    monkeypatch.setattr(
+        f"{module}.MatchingRunRepository",
+        MagicMock(
+            get_last_matching_run=AsyncMock(return_value=None),
+            create_matching_run=AsyncMock(),
+        ),
+    )
+    monkeypatch.setattr(
+        f"{module}.SearchProfileRepository.fetch_profiles_with_topics",
+        AsyncMock(return_value=[make_profile()]),
+    )
+    mark_embedded = AsyncMock()
+    monkeypatch.setattr(
+        f"{module}.ArticleRepository",
+        MagicMock(
+            list_embedded_article_subscriptions=AsyncMock(
+                return_value={present: uuid.uuid4(), missing: uuid.uuid4()}
+            ),
+            mark_articles_embedded=mark_embedded,
+        ),
+    )
+    vector_service = matching_service.article_vector_service
+    vector_service.embed_queries.side_effect = lambda queries: [
+        [1.0, 0.0] for _ in queries
+    ]
+    vector_service.retrieve_vectors.return_value = {present: [0.0, 1.0]}
+
+    await matching_service.run_incremental()
+
+    mark_embedded.assert_awaited_once()
+    assert mark_embedded.await_args.args[0] == [missing]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_similarities_filters_profile_subscriptions(
+    matching_service,
+):
+    profile = make_profile()
+    subscription_id = uuid.uuid4()
+    profile.subscriptions = [SimpleNamespace(id=subscription_id)]
+    vector_service = matching_service.article_vector_service
+    vector_service.retrieve_by_similarity_batch = AsyncMock(
+        return_value=[[], [], []]
+    )
+
+    await matching_service._retrieve_similarities(profile)
+
+    vector_service.build_filter.assert_called_once_with(
+        subscription_ids={subscription_id}
+    )
+    kwargs = vector_service.retrieve_by_similarity_batch.await_args.kwargs
+    assert kwargs["query_filter"] is vector_service.build_filter.return_value
+
+
+def test_accumulate_profile_scores_skips_masked_articles(matching_service):
+    profile = make_profile()
+    topic = profile.topics[0]
+    rows = {"Topic Trade: Tariffs, ESG": 0, "Tariffs": 1, "ESG": 2}
+    article_ids = [uuid.uuid4(), uuid.uuid4()]
+    scores = np.full((3, 2), 0.9)
+    topic_scores = {topic.id: {}}
+    keyword_scores = {topic.id: {}}
+
+    matching_service._accumulate_profile_scores(
+        profile,
+        scores,
+        rows,
+        article_ids,
+        topic_scores,
+        keyword_scores,
+        article_mask=np.array([False, True]),
+    )
+
+    assert list(topic_scores[topic.id]) == [article_ids[1]]
@@ -0,0 +1,93 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.bloom_filter import BloomFilter
+from app.models.article import Article
+from app.repositories import article_repository
+from app.repositories.article_repository import ArticleRepository
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    urls = [f"https://example.com/{i}" for i in range(1000)]
+    bloom.update(urls)
+
+    assert all(url in bloom for url in urls)
+    false_positives = sum(
+        f"https://example.org/{i}" in bloom for i in range(10_000)
+    )
+    assert false_positives < 300
+
+
+@pytest.mark.asyncio
+async def test_create_articles_batch_skips_known_urls(
+    monkeypatch, fake_async_session
+):
+    subscription_id = uuid.uuid4()
+    articles = [
+        Article(
+            title=title,
+            url=f"https://example.com/{title}",
+            subscription_id=subscription_id,
+        )
+        for title in ["known", "new", "new", "raced"]
+    ]
+    bloom = BloomFilter(capacity=100)
+    bloom.add("https://example.com/known")
+    monkeypatch.setattr(
+        ArticleRepository, "_get_known_urls", AsyncMock(return_value=bloom)
+    )
+    session = fake_async_session(article_repository)
+    session.scalars = AsyncMock(
+        side_effect=[
+            ["https://example.com/known"],
+            ["https://example.com/new"],
+        ]
+    )
+
+    created = await ArticleRepository.create_articles_batch(articles)
+
+    assert [article.url for article in created] == ["https://example.com/new"]
+    select_statement = session.scalars.await_args_list[0].args[0]
+    sql = str(select_statement.compile(dialect=postgresql.dialect()))
+    assert "articles.url = ANY" in sql
+    insert_statement, rows = session.scalars.await_args_list[1].args
+    sql = str(insert_statement.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (url) DO NOTHING" in sql
+    assert [row["url"] for row in rows] == [
+        "https://example.com/new",
+        "https://example.com/raced",
+    ]
+    assert "https://example.com/raced" in bloom
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_iter_keyset_continues_after_last_row(fake_async_session):
+    first_page = [MagicMock(scraped_at=i, id=uuid.uuid4()) for i in range(2)]
+    results = [first_page, first_page[:1]]
+    session = fake_async_session(article_repository)
+    session.execute = AsyncMock(
+        side_effect=lambda statement: MagicMock(
+            scalars=lambda: MagicMock(all=lambda: results.pop(0))
+        )
+    )
+
+    pages = [
+        page
+        async for page in ArticleRepository.iter_articles_without_fingerprint(
+            page_size=2
+        )
+    ]
+
+    assert [len(page) for page in pages] == [2, 1]
+    first, second = (
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in session.execute.await_args_list
+    )
+    assert "(articles.scraped_at, articles.id) >" not in first
+    assert "(articles.scraped_at, articles.id) >" in second
+    assert "ORDER BY articles.scraped_at, articles.id" in second
@@ -0,0 +1,147 @@
+import json
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.entity import EntityType
+from app.schemas.articles_schemas import TranslatedArticleSummaryResponse
+from app.services.article_summary_service import ArticleSummaryService
+
+
+def make_content(summary):
+    return json.dumps(
+        {
+            "summary": summary,
+            "persons": ["Ada Lovelace"],
+            "industries": [],
+            "events": [],
+            "organizations": ["EU"],
+            "citations": [],
+        }
+    )
+
+
+def test_to_result_parses_fenced_json_and_reports_errors():
+    article_id = uuid.uuid4()
+
+    result = ArticleSummaryService._to_result(
+        article_id, f"```json\n{make_content('Short')}\n```"
+    )
+    failed = ArticleSummaryService._to_result(article_id, "not json")
+
+    assert result.error is None
+    assert result.data["summary"] == "Short"
+    assert result.data["entities"][EntityType.ORGANIZATION] == ["EU"]
+    assert failed.data is None
+    assert failed.error.startswith("Error processing summary")
+
+
+@pytest.mark.asyncio
+async def test_run_streams_results_to_bulk_writer(monkeypatch):
+    pages = [
+        [MagicMock(id=uuid.uuid4(), content=f"a{i}") for i in range(3)],
+        [MagicMock(id=uuid.uuid4(), content=f"b{i}") for i in range(2)],
+    ]
+
+    async def fake_iter(page_size, datetime_start):
+        for page in pages:
+            yield page
+
+    flushes = []
+
+    async def fake_store(results):
+        flushes.append(list(results))
+
+    monkeypatch.setattr(
+        "app.services.article_summary_service.ArticleRepository."
+        "iter_articles_without_summary",
+        fake_iter,
+    )
+    monkeypatch.setattr(ArticleSummaryService, "_store_results", fake_store)
+    llm_client = MagicMock()
+    llm_client.agenerate_response = AsyncMock(
+        side_effect=lambda prompt: make_content(prompt[-40:])
+    )
+    monkeypatch.setattr(ArticleSummaryService, "_llm_client", llm_client)
+
+    await ArticleSummaryService.run(
+        page_size=3, max_in_flight=2, flush_size=2, flush_interval_ms=1000
+    )
+
+    stored = [result.article_id for flush in flushes for result in flush]
+    assert sorted(stored) == sorted(a.id for page in pages for a in page)
+    assert all(len(flush) <= 2 for flush in flushes)
+    assert len(flushes) == 3
+
+
+@pytest.mark.asyncio
+async def test_summarize_and_translate_in_one_typed_call(monkeypatch):
+    monkeypatch.setattr(
+        "app.services.article_summary_service.configs."
+        "ARTICLE_SUMMARY_WITH_TRANSLATIONS",
+        True,
+    )
+    article = MagicMock(
+        id=uuid.uuid4(), title="Titel", content="Inhalt", language="de"
+    )
+    llm_client = MagicMock()
+    llm_client.agenerate_typed_response = AsyncMock(
+        return_value=TranslatedArticleSummaryResponse(
+            summary="Kurz",
+            organizations=["EU"],
+            title_en="Title",
+            title_de="Titel",
+            summary_en="Short",
+            summary_de="Kurz",
+        )
+    )
+    monkeypatch.setattr(ArticleSummaryService, "_llm_client", llm_client)
+
+    result = await ArticleSummaryService._summarize(article)
+
+    prompt, response_type = llm_client.agenerate_typed_response.await_args.args
+    assert "Article title:\nTitel" in prompt
+    assert '"summary_de"' in prompt
+    assert response_type is TranslatedArticleSummaryResponse
+    assert result.data["summary"] == "Kurz"
+    assert result.data["entities"][EntityType.ORGANIZATION] == ["EU"]
+    assert result.data["translations"] == {
+        "title_en": "Title",
+        "title_de": "Titel",
+        "summary_en": "Short",
+        "summary_de": "Kurz",
+    }
+
+
+@pytest.mark.asyncio
+async def test_failed_store_only_marks_the_bad_article(
+    monkeypatch, fake_async_session
+):
+    good = ArticleSummaryService._to_result(uuid.uuid4(), make_content("Ok"))
+    bad = ArticleSummaryService._to_result(uuid.uuid4(), make_content("Bad"))
+    stored = []
+
+    async def add_results(session, results):
+        if bad in results:
+            raise ValueError("value too long")
+        stored.extend(results)
+
+    monkeypatch.setattr(
+        ArticleSummaryService, "_add_results", staticmethod(add_results)
+    )
+    mark_error = AsyncMock()
+    monkeypatch.setattr(
+        "app.services.article_summary_service.ArticleRepository."
+        "mark_articles_error",
+        mark_error,
+    )
+    fake_async_session("app.services.article_summary_service")
+
+    await ArticleSummaryService._store_results([good, bad])
+
+    assert stored == [good]
+    mark_error.assert_awaited_once()
+    notes = mark_error.await_args.args[1]
+    assert list(notes) == [bad.article_id]
+    assert "value too long" in notes[bad.article_id]
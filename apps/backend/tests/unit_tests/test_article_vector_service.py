@@ -1,10 +1,12 @@
 import uuid
-from unittest.mock import MagicMock
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from langchain_core.documents import Document
 
 from app.models import Article
+from app.models.article import ArticleStatus
 from app.services.article_vector_service import ArticleVectorService
 
 
@@ -31,6 +33,10 @@ def patch_qdrant_and_store(monkeypatch):
         "app.services.article_vector_service.get_qdrant_connection",
         lambda: dummy_client,
     )
+    monkeypatch.setattr(
+        "app.services.article_vector_service.get_async_qdrant_connection",
+        lambda: MagicMock(upsert=AsyncMock(), query_batch_points=AsyncMock()),
+    )
     # Dummy vector store
     dummy_store = MagicMock()
     monkeypatch.setattr(
@@ -43,8 +49,11 @@ def patch_qdrant_and_store(monkeypatch):
 def test_create_collection_safe_when_missing(patch_qdrant_and_store):
     client, _ = patch_qdrant_and_store
     service = ArticleVectorService()
-    client.collection_exists.assert_called_with(service.collection_name)
+    client.collection_exists.assert_any_call(service.collection_name)
     client.create_collection.assert_called_once()
+    created = client.create_collection.call_args.kwargs["collection_name"]
+    assert created == f"{service.collection_name}_v2"
+    client.update_collection_aliases.assert_called_once()
 
 
 def test_create_collection_safe_when_exists(patch_qdrant_and_store):
@@ -79,18 +88,20 @@ def test_get_list_of_collections(patch_qdrant_and_store):
 
 
 @pytest.mark.asyncio
-async def test_add_articles_calls_vector_store(
+async def test_add_articles_upserts_points_and_marks_embedded(
     monkeypatch, patch_qdrant_and_store
 ):
-    _, store = patch_qdrant_and_store
+    marked = []
 
-    # Mock the ArticleRepository.update_article to avoid database calls
-    async def mock_update_article(article):
-        return None
+    # Mock the bulk status update to avoid database calls
+    async def mock_mark_articles_embedded(article_ids, embedded_at):
+        marked.extend(article_ids)
+        return len(article_ids)
 
     monkeypatch.setattr(
-        "app.repositories.article_repository.ArticleRepository.update_article",
-        mock_update_article,
+        "app.repositories.article_repository.ArticleRepository."
+        "mark_articles_embedded",
+        mock_mark_articles_embedded,
     )
 
     articles = [
@@ -100,15 +111,32 @@ async def test_add_articles_calls_vector_store(
         for i in range(1, 4)
     ]
     service = ArticleVectorService()
-    await service.add_articles(articles)
-    store.add_documents.assert_called_once()
-    docs = store.add_documents.call_args.kwargs["documents"]
-    ids = store.add_documents.call_args.kwargs["ids"]
-    for art, doc, id_ in zip(articles, docs, ids):
-        assert isinstance(doc, Document)
-        assert doc.page_content == art.summary
-        assert str(doc.metadata["id"]) == str(art.id)
-        assert str(id_) == str(art.id)
+    service._dense_embeddings = MagicMock(
+        aembed_documents=AsyncMock(
+            side_effect=lambda texts: [[0.1] for _ in texts]
+        )
+    )
+    service._sparse_embeddings = MagicMock()
+    service._sparse_embeddings.embed_documents.side_effect = lambda texts: [
+        MagicMock(indices=[1], values=[1.0]) for _ in texts
+    ]
+
+    await service.add_articles(articles, chunk_size=2)
+
+    upsert = service._async_qdrant_client.upsert
+    assert upsert.await_count == 2
+    points = [
+        point
+        for call in upsert.await_args_list
+        for point in call.kwargs["points"]
+    ]
+    assert all(call.kwargs["wait"] is True for call in upsert.await_args_list)
+    for art, point in zip(articles, points):
+        assert point.id == str(art.id)
+        assert point.payload["page_content"] == art.summary
+        assert point.payload["metadata"]["id"] == str(art.id)
+    assert marked == [art.id for art in articles]
+    assert all(art.status == ArticleStatus.EMBEDDED for art in articles)
 
 
 @pytest.mark.asyncio
@@ -126,6 +154,36 @@ async def test_retrieve_by_similarity_delegates_to_store(
     assert results == [(Document(page_content="x", metadata={}), 0.9)]
 
 
+@pytest.mark.asyncio
+async def test_retrieve_by_similarity_pushes_filters_to_qdrant(
+    patch_qdrant_and_store,
+):
+    _, store = patch_qdrant_and_store
+    store.similarity_search_with_score.return_value = []
+    subscription_id = uuid.uuid4()
+    published_after = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    service = ArticleVectorService()
+
+    await service.retrieve_by_similarity(
+        "query",
+        subscription_ids=[subscription_id],
+        published_after=published_after,
+        language="de",
+    )
+
+    query_filter = store.similarity_search_with_score.call_args.kwargs[
+        "filter"
+    ]
+    conditions = {c.key: c for c in query_filter.must}
+    assert conditions["metadata.subscription_id"].match.any == [
+        str(subscription_id)
+    ]
+    assert conditions["metadata.published_at"].range.gte == published_after
+    assert conditions["metadata.published_at"].range.lte is None
+    assert conditions["metadata.language"].match.value == "de"
+    assert ArticleVectorService.build_filter() is None
+
+
 @pytest.mark.asyncio
 async def test_add_article_with_valid_summary(
     monkeypatch, patch_qdrant_and_store
@@ -163,3 +221,74 @@ async def test_add_article_missing_or_empty_summary_logs_error(
     service = ArticleVectorService()
     await service.add_article(uuid.uuid4())
     assert "not found or has no summary" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_retrieve_by_similarity_batch_single_round_trip(
+    patch_qdrant_and_store,
+):
+    service = ArticleVectorService()
+    client = service._async_qdrant_client
+    service._dense_embeddings = MagicMock()
+    service._dense_embeddings.embed_queries.return_value = [
+        [0.1, 0.2],
+        [0.3, 0.4],
+    ]
+    service._sparse_embeddings = MagicMock()
+    service._sparse_embeddings.embed_query.side_effect = [
+        MagicMock(indices=[1], values=[0.5]),
+        MagicMock(indices=[2], values=[0.7]),
+    ]
+    article_id = str(uuid.uuid4())
+    point = MagicMock(
+        id=article_id,
+        score=0.8,
+        payload={"page_content": "x", "metadata": {"id": article_id}},
+    )
+    client.query_batch_points.return_value = [
+        MagicMock(points=[point]),
+        MagicMock(points=[]),
+    ]
+
+    results = await service.retrieve_by_similarity_batch(
+        ["first", "second"], [0.5, 0.1]
+    )
+
+    service._dense_embeddings.embed_queries.assert_called_once_with(
+        ["first", "second"]
+    )
+    service._sparse_embeddings.embed_documents.assert_not_called()
+    client.query_batch_points.assert_awaited_once()
+    requests = client.query_batch_points.await_args.kwargs["requests"]
+    assert [r.score_threshold for r in requests] == [0.5, 0.1]
+    assert len(results) == 2
+    doc, score = results[0][0]
+    assert doc.metadata["id"] == article_id
+    assert score == 0.8
+    assert results[1] == []
+
+
+@pytest.mark.asyncio
+async def test_index_summarized_articles_consumes_every_page(
+    monkeypatch, patch_qdrant_and_store
+):
+    pages = [[make_article()], [make_article(), make_article()]]
+
+    async def fake_iter(page_size, datetime_start, datetime_end):
+        for page in pages:
+            yield page
+
+    monkeypatch.setattr(
+        "app.repositories.article_repository.ArticleRepository."
+        "iter_articles_with_summary",
+        fake_iter,
+    )
+    service = ArticleVectorService()
+    service.add_articles = AsyncMock()
+
+    await service.index_summarized_articles_to_vector_store(
+        page_size=2, workers=2
+    )
+
+    indexed = [call.args[0] for call in service.add_articles.await_args_list]
+    assert sorted(map(len, indexed)) == [1, 2]
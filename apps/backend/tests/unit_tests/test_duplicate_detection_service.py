@@ -0,0 +1,215 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.repositories import article_repository
+from app.repositories.article_repository import ArticleRepository
+from app.services import duplicate_detection_service
+from app.services.duplicate_detection_service import (
+    MAX_DISTANCE,
+    DuplicateDetectionService,
+    content_fingerprint,
+    hamming_distance,
+)
+from app.services.web_harvester.utils.url_utils import canonicalize_url
+
+STORY = " ".join(
+    f"Sentence {i} of the story about the merger of company {i % 7}."
+    for i in range(60)
+)
+OTHER_STORY = " ".join(
+    f"Paragraph {i} reports on the election in region {i % 5} today."
+    for i in range(60)
+)
+
+
+def test_canonicalize_url_strips_tracking_and_amp():
+    assert (
+        canonicalize_url(
+            "HTTPS://Example.COM:443/News/Story/amp/"
+            "?utm_source=feed&b=2&fbclid=x&a=1#comments"
+        )
+        == "https://example.com/News/Story?a=1&b=2"
+    )
+    assert (
+        canonicalize_url("https://amp.example.com/story.amp.html?amp=1")
+        == "https://example.com/story.html"
+    )
+    assert canonicalize_url("mailto:news@example.com") == (
+        "mailto:news@example.com"
+    )
+
+
+def test_fingerprints_of_near_duplicates_are_close():
+    edited = STORY.replace("Sentence 30 of", "Sentence 30, as reported, of")
+
+    assert content_fingerprint(STORY) == content_fingerprint(STORY.upper())
+    assert (
+        hamming_distance(
+            content_fingerprint(STORY), content_fingerprint(edited)
+        )
+        <= MAX_DISTANCE
+    )
+    assert (
+        hamming_distance(
+            content_fingerprint(STORY), content_fingerprint(OTHER_STORY)
+        )
+        > MAX_DISTANCE
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_marks_duplicates_of_recent_articles(
+    monkeypatch, fake_async_session
+):
+    subscription_id = uuid.uuid4()
+    original_id = uuid.uuid4()
+    candidates = [
+        (
+            original_id,
+            subscription_id,
+            "https://example.com/original",
+            "https://example.com/original",
+            content_fingerprint(OTHER_STORY),
+            len(OTHER_STORY),
+        )
+    ]
+    syndicated = MagicMock(
+        id=uuid.uuid4(),
+        subscription_id=subscription_id,
+        url="https://partner.example.org/copy",
+        canonical_url="https://example.com/original",
+        content="A shortened copy.",
+    )
+    first = MagicMock(
+        id=uuid.uuid4(),
+        subscription_id=subscription_id,
+        url="https://example.net/first",
+        canonical_url="https://example.net/first",
+        content=STORY,
+    )
+    copy = MagicMock(
+        id=uuid.uuid4(),
+        subscription_id=subscription_id,
+        url="https://example.info/copy?utm_medium=rss",
+        canonical_url="https://example.info/copy",
+        content=STORY + " Published with permission.",
+    )
+    short = MagicMock(
+        id=uuid.uuid4(),
+        subscription_id=subscription_id,
+        url="https://example.de/teaser",
+        canonical_url=None,
+        content="Subscribe to read.",
+    )
+
+    async def pages(page_size, datetime_start):
+        yield [syndicated, first, copy, short]
+
+    monkeypatch.setattr(
+        ArticleRepository,
+        "list_duplicate_candidates",
+        AsyncMock(return_value=candidates),
+    )
+    monkeypatch.setattr(
+        ArticleRepository, "iter_articles_without_fingerprint", pages
+    )
+    update = AsyncMock()
+    monkeypatch.setattr(
+        ArticleRepository, "update_article_fingerprints", update
+    )
+    session = fake_async_session(duplicate_detection_service)
+
+    duplicates = await DuplicateDetectionService.run()
+
+    assert duplicates == 2
+    fingerprints = update.await_args.args[1]
+    assert fingerprints[syndicated.id][1] == original_id
+    assert fingerprints[first.id] == (content_fingerprint(STORY), None)
+    assert fingerprints[copy.id][1] == first.id
+    assert fingerprints[short.id][1] is None
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_run_compares_articles_of_the_same_subscription(
+    monkeypatch, fake_async_session
+):
+    subscription_id = uuid.uuid4()
+    other_subscription_id = uuid.uuid4()
+    original_id = uuid.uuid4()
+    candidates = [
+        (
+            original_id,
+            subscription_id,
+            "https://example.com/original",
+            "https://example.com/original",
+            content_fingerprint(STORY),
+            len(STORY),
+        )
+    ]
+    syndicated = MagicMock(
+        id=uuid.uuid4(),
+        subscription_id=other_subscription_id,
+        url="https://partner.example.org/copy",
+        canonical_url="https://example.com/original",
+        content=STORY,
+    )
+    copy = MagicMock(
+        id=uuid.uuid4(),
+        subscription_id=other_subscription_id,
+        url="https://example.info/copy",
+        canonical_url="https://example.info/copy",
+        content=STORY + " Published with permission.",
+    )
+
+    async def pages(page_size, datetime_start):
+        yield [syndicated, copy]
+
+    monkeypatch.setattr(
+        ArticleRepository,
+        "list_duplicate_candidates",
+        AsyncMock(return_value=candidates),
+    )
+    monkeypatch.setattr(
+        ArticleRepository, "iter_articles_without_fingerprint", pages
+    )
+    update = AsyncMock()
+    monkeypatch.setattr(
+        ArticleRepository, "update_article_fingerprints", update
+    )
+    fake_async_session(duplicate_detection_service)
+
+    duplicates = await DuplicateDetectionService.run()
+
+    # The original is in another subscription, so the first copy of the
+    # story in this subscription is kept and the second one marked
+    assert duplicates == 1
+    fingerprints = update.await_args.args[1]
+    assert fingerprints[syndicated.id][1] is None
+    assert fingerprints[copy.id][1] == syndicated.id
+
+
+@pytest.mark.asyncio
+async def test_near_duplicates_are_not_summarized_or_embedded(
+    fake_async_session,
+):
+    session = fake_async_session(article_repository)
+    session.execute = AsyncMock(
+        return_value=MagicMock(
+            scalars=MagicMock(return_value=MagicMock(all=lambda: []))
+        )
+    )
+
+    async for _ in ArticleRepository.iter_articles_without_summary():
+        pass
+    async for _ in ArticleRepository.iter_articles_with_summary():
+        pass
+    await ArticleRepository.get_articles_without_translations()
+
+    assert len(session.execute.await_args_list) == 3
+    for call in session.execute.await_args_list:
+        sql = str(call.args[0].compile(dialect=postgresql.dialect()))
+        assert "articles.duplicate_of_id IS NULL" in sql
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services import language_detection_service
+from app.services.language_detection_service import (
+    LanguageDetectionService,
+    detect_article_languages,
+    detect_language,
+    normalize_language,
+)
+
+
+def test_detect_language_by_function_words():
+    assert (
+        detect_language(
+            "The company said that it will increase the production of "
+            "its cars in the next year."
+        )
+        == "en"
+    )
+    assert (
+        detect_language(
+            "Das Unternehmen hat angekündigt, dass es die Produktion im "
+            "nächsten Jahr auf über eine Million Autos erhöhen wird."
+        )
+        == "de"
+    )
+    assert detect_language("") is None
+    assert detect_language("1234 5678") is None
+
+
+def test_normalize_language():
+    assert normalize_language("deu") == "de"
+    assert normalize_language("de-AT") == "de"
+    assert normalize_language("English") == "en"
+    assert normalize_language("unknown") is None
+    assert normalize_language(None) is None
+
+
+def test_detect_article_languages_per_field():
+    article = SimpleNamespace(
+        title="Autobauer erhöht die Produktion",
+        content=(
+            "The company said that it will increase the production of "
+            "its cars in the next year."
+        ),
+        language="deu",
+    )
+    language, field_languages = detect_article_languages(article)
+
+    assert language == "en"
+    assert field_languages["content"] == "en"
+    assert set(field_languages) == {"title", "content"}
+
+    article = SimpleNamespace(title=None, content=None, language="deu")
+    assert detect_article_languages(article)[0] == "de"
+
+
+@pytest.mark.asyncio
+async def test_run_stores_languages_per_page(monkeypatch, fake_async_session):
+    pages = [
+        [MagicMock(title="Titel", content="Der Text", language=None)],
+        [MagicMock(title="Title", content="The text", language=None)],
+    ]
+
+    async def iterate(page_size, datetime_start):
+        for page in pages:
+            yield page
+
+    repository = language_detection_service.ArticleRepository
+    monkeypatch.setattr(
+        repository, "iter_articles_without_field_languages", iterate
+    )
+    update = AsyncMock()
+    monkeypatch.setattr(repository, "update_article_languages", update)
+    session = fake_async_session(language_detection_service)
+
+    assert await LanguageDetectionService.run() == 2
+    assert update.await_count == 2
+    assert session.commit.await_count == 2
@@ -0,0 +1,156 @@
+import json
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.llm_batch_job import LLMBatchJobStatus, LLMBatchPurpose
+from app.services import llm_batch_reconciler
+from app.services.article_summary_service import ArticleSummaryService
+from app.services.llm_service import batch_runner
+from app.services.llm_service.batch_runner import BatchRunner
+
+
+async def make_requests(count, prompt="hello"):
+    for index in range(count):
+        yield {"custom_id": str(index), "body": {"prompt": prompt}}
+
+
+def read_ids(path):
+    with path.open("r", encoding="utf-8") as f:
+        return [json.loads(line)["custom_id"] for line in f]
+
+
+@pytest.mark.asyncio
+async def test_write_batch_files_splits_by_requests_and_bytes():
+    runner = BatchRunner(max_requests=3, max_bytes=10_000)
+    files = [f async for f in runner.write_batch_files(make_requests(7))]
+    paths = [path for path, _ in files]
+    try:
+        assert [ids for _, ids in files] == [read_ids(p) for p in paths]
+        assert [read_ids(p) for p in paths] == [
+            ["0", "1", "2"],
+            ["3", "4", "5"],
+            ["6"],
+        ]
+        assert all(p.parent == Path(tempfile.gettempdir()) for p in paths)
+        assert len({p.name for p in paths}) == 3
+    finally:
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    line_size = len(
+        json.dumps({"custom_id": "0", "body": {"prompt": "x" * 50}}) + "\n"
+    )
+    runner = BatchRunner(max_requests=100, max_bytes=line_size * 2 + 1)
+    requests = make_requests(5, prompt="x" * 50)
+    paths = [p async for p, _ in runner.write_batch_files(requests)]
+    try:
+        assert [len(read_ids(p)) for p in paths] == [2, 2, 1]
+    finally:
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+
+@pytest.mark.asyncio
+async def test_run_submits_batches_and_streams_output(monkeypatch):
+    runner = BatchRunner(max_requests=2, max_bytes=10_000, chunk_size=2)
+    submitted = {}
+
+    async def submit(path, custom_ids, purpose):
+        assert purpose is None
+        batch_id = f"batch_{len(submitted)}"
+        submitted[batch_id] = read_ids(path)
+        return batch_id
+
+    async def wait(batch_id):
+        return SimpleNamespace(
+            id=batch_id,
+            status="completed",
+            output_file_id=f"{batch_id}_output",
+            error_file_id=None,
+        )
+
+    async def download(file_id, path):
+        batch_id = file_id[: -len("_output")]
+        with path.open("w", encoding="utf-8") as f:
+            for custom_id in submitted[batch_id]:
+                f.write(json.dumps({"custom_id": custom_id}) + "\n")
+            f.write("not json\n")
+
+    monkeypatch.setattr(runner, "submit", submit)
+    monkeypatch.setattr(runner, "wait", wait)
+    monkeypatch.setattr(runner, "_download", download)
+    chunks = []
+
+    async def on_results(lines):
+        chunks.append([line["custom_id"] for line in lines])
+
+    applied = await runner.run(make_requests(5), on_results)
+
+    assert applied == 5
+    assert len(submitted) == 3
+    assert all(len(chunk) <= 2 for chunk in chunks)
+    assert sorted(i for chunk in chunks for i in chunk) == [
+        "0",
+        "1",
+        "2",
+        "3",
+        "4",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_apply_job_records_outcome_once_claimed(monkeypatch):
+    repository = MagicMock()
+    repository.claim_job = AsyncMock(side_effect=[True, False])
+    repository.set_status = AsyncMock()
+    monkeypatch.setattr(batch_runner, "LLMBatchJobRepository", repository)
+    runner = BatchRunner()
+    monkeypatch.setattr(runner, "apply_batch", AsyncMock(return_value=3))
+    batch = SimpleNamespace(id="batch_1", status="expired")
+
+    assert await runner.apply_job(batch, AsyncMock()) == 3
+    assert await runner.apply_job(batch, AsyncMock()) == 0
+
+    runner.apply_batch.assert_awaited_once()
+    repository.set_status.assert_awaited_once_with(
+        "batch_1", LLMBatchJobStatus.FAILED, error="Batch expired"
+    )
+
+
+@pytest.mark.asyncio
+async def test_reconciler_applies_only_finalized_batches(monkeypatch):
+    jobs = [
+        SimpleNamespace(
+            batch_id="done", purpose=LLMBatchPurpose.ARTICLE_SUMMARY
+        ),
+        SimpleNamespace(
+            batch_id="running", purpose=LLMBatchPurpose.ENTITY_TRANSLATION
+        ),
+    ]
+    monkeypatch.setattr(
+        llm_batch_reconciler.LLMBatchJobRepository,
+        "get_unapplied_jobs",
+        AsyncMock(return_value=jobs),
+    )
+    batches = {
+        "done": SimpleNamespace(id="done", status="completed"),
+        "running": SimpleNamespace(id="running", status="in_progress"),
+    }
+    monkeypatch.setattr(
+        BatchRunner,
+        "retrieve",
+        AsyncMock(side_effect=lambda batch_id: batches[batch_id]),
+    )
+    apply_job = AsyncMock(return_value=10)
+    monkeypatch.setattr(BatchRunner, "apply_job", apply_job)
+
+    applied = await llm_batch_reconciler.LLMBatchReconciler.run()
+
+    assert applied == 1
+    batch, handler = apply_job.await_args.args
+    assert batch is batches["done"]
+    assert handler is ArticleSummaryService.store_batch_output
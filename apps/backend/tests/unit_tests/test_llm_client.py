@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from pydantic import BaseModel
+
+from app.services.llm_service import llm_client as llm_client_module
+from app.services.llm_service.llm_client import LLMClient
+from app.services.llm_service.llm_models import TaskModelMapping
+
+
+class Answer(BaseModel):
+    text: str
+
+
+@pytest.mark.asyncio
+async def test_agenerate_typed_response_uses_async_completion(monkeypatch):
+    response = SimpleNamespace(
+        choices=[
+            SimpleNamespace(message=SimpleNamespace(content='{"text": "hi"}'))
+        ]
+    )
+    acompletion = AsyncMock(return_value=response)
+    monkeypatch.setattr(llm_client_module, "acompletion", acompletion)
+
+    client = LLMClient(TaskModelMapping.ARTICLE_SUMMARY)
+    answer = await client.agenerate_typed_response("Say hi", Answer)
+
+    assert answer == Answer(text="hi")
+    kwargs = acompletion.await_args.kwargs
+    assert kwargs["response_format"] is Answer
+    assert kwargs["messages"] == [{"role": "user", "content": "Say hi"}]
+    assert (
+        llm_client_module.litellm.aclient_session
+        is llm_client_module.get_async_http_client()
+    )
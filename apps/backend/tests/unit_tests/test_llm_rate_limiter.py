@@ -0,0 +1,103 @@
+import asyncio
+
+import litellm
+import pytest
+
+from app.services.llm_service.rate_limiter import (
+    AdaptiveConcurrency,
+    ModelRateLimiter,
+    TokenBucket,
+    get_rate_limiter,
+)
+
+
+def make_limiter():
+    return ModelRateLimiter(
+        model="gpt-test",
+        requests_per_minute=600,
+        tokens_per_minute=60000,
+        min_concurrency=2,
+        max_concurrency=8,
+        target_latency=10.0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrency_grows_when_healthy_and_halves_on_overload():
+    concurrency = AdaptiveConcurrency(
+        initial=2, min_limit=2, max_limit=8, target_latency=1.0
+    )
+
+    for _ in range(4):
+        await concurrency.acquire()
+        await concurrency.release(latency=0.1, overloaded=False)
+    assert int(concurrency.limit) == 6
+
+    await concurrency.acquire()
+    await concurrency.release(latency=0.1, overloaded=True)
+    assert int(concurrency.limit) == 3
+
+    # Healthy requests after a back-off only add a fraction of a slot
+    await concurrency.acquire()
+    await concurrency.release(latency=0.1, overloaded=False)
+    assert int(concurrency.limit) == 3
+
+
+@pytest.mark.asyncio
+async def test_slot_records_rate_limits_and_corrects_token_usage():
+    limiter = make_limiter()
+
+    async with limiter.slot(estimated_tokens=1000) as usage:
+        usage["used_tokens"] = 400
+    with pytest.raises(litellm.RateLimitError):
+        async with limiter.slot(estimated_tokens=1000):
+            raise litellm.RateLimitError(
+                message="slow down", llm_provider="openai", model="gpt-test"
+            )
+
+    metrics = limiter.snapshot()
+    assert metrics["requests"] == 2
+    assert metrics["rate_limited"] == 1
+    assert metrics["used_tokens"] == 400
+    assert metrics["in_flight"] == 0
+    # 60000 - 1000 + 600 refunded - 1000, plus a little refill
+    assert 58600 <= metrics["available_tokens"] <= 60000
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_waits_for_refill(monkeypatch):
+    clock = [0.0]
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr(
+        "app.services.llm_service.rate_limiter.asyncio.sleep", fake_sleep
+    )
+    monkeypatch.setattr(
+        "app.services.llm_service.rate_limiter.time.monotonic",
+        lambda: clock[0],
+    )
+    bucket = TokenBucket(rate_per_minute=60)
+    bucket.tokens = 0
+
+    await bucket.acquire(2)
+
+    assert sleeps == [pytest.approx(2.0)]
+    assert bucket.tokens == pytest.approx(0)
+
+
+def test_rate_limiters_are_created_per_event_loop():
+    async def use_limiter():
+        limiter = get_rate_limiter("gpt-test")
+        assert get_rate_limiter("gpt-test") is limiter
+        async with limiter.slot(10):
+            pass
+        return limiter
+
+    first = asyncio.run(use_limiter())
+    second = asyncio.run(use_limiter())
+
+    assert first is not second
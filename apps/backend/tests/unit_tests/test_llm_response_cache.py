@@ -0,0 +1,85 @@
+import os
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from pydantic import BaseModel
+
+from app.services.llm_service import llm_client as llm_client_module
+from app.services.llm_service.llm_client import LLMClient
+from app.services.llm_service.llm_models import TaskModelMapping
+from app.services.llm_service.response_cache import (
+    DiskResponseCache,
+    build_cache_key,
+)
+
+
+class Answer(BaseModel):
+    text: str
+
+
+class OtherAnswer(BaseModel):
+    text: str
+    score: int
+
+
+def test_cache_key_depends_on_every_request_parameter():
+    key = build_cache_key("gpt-test", 0.1, None, "prompt")
+
+    assert key == build_cache_key("gpt-test", 0.1, None, "prompt")
+    assert key != build_cache_key("gpt-other", 0.1, None, "prompt")
+    assert key != build_cache_key("gpt-test", 0.2, None, "prompt")
+    assert key != build_cache_key("gpt-test", 0.1, None, "prompt 2")
+    assert key != build_cache_key("gpt-test", 0.1, Answer, "prompt")
+    assert build_cache_key(
+        "gpt-test", 0.1, Answer, "prompt"
+    ) != build_cache_key("gpt-test", 0.1, OtherAnswer, "prompt")
+
+
+def test_disk_cache_expires_and_evicts_oldest(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(
+        "app.services.llm_service.response_cache.time.time",
+        lambda: clock[0],
+    )
+    cache = DiskResponseCache(tmp_path, ttl_seconds=60, max_entries=2)
+
+    cache.set("a", "first")
+    assert cache.get("a") == "first"
+    clock[0] += 61
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    for index, key in enumerate(["b", "c", "d"]):
+        path = tmp_path / f"{key}.json"
+        cache.set(key, key)
+        # Eviction orders entries by modification time
+        mtime = clock[0] + index
+        os.utime(path, (mtime, mtime))
+    cache._evict()
+
+    remaining = sorted(p.stem for p in tmp_path.glob("*.json"))
+    assert remaining == ["c", "d"]
+
+
+@pytest.mark.asyncio
+async def test_cached_response_skips_completion(tmp_path, monkeypatch):
+    response = SimpleNamespace(
+        choices=[
+            SimpleNamespace(message=SimpleNamespace(content='{"text": "hi"}'))
+        ],
+        usage=None,
+    )
+    acompletion = AsyncMock(return_value=response)
+    monkeypatch.setattr(llm_client_module, "acompletion", acompletion)
+
+    client = LLMClient(TaskModelMapping.ARTICLE_SUMMARY)
+    client.cache = DiskResponseCache(tmp_path, ttl_seconds=60, max_entries=10)
+
+    first = await client.agenerate_typed_response("Say hi", Answer)
+    second = await client.agenerate_typed_response("Say hi", Answer)
+
+    assert first == second == Answer(text="hi")
+    assert acompletion.await_count == 1
+    assert client.cache.stats()["hits"] == 1
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from app.services.web_harvester import crawler as crawler_module
+from app.services.web_harvester import web_harvester_orchestrator
+from app.services.web_harvester.crawler import CrawlerType, NewsAPICrawler
+
+
+def make_crawler(monkeypatch):
+    monkeypatch.setattr(crawler_module, "get_event_registry", lambda: None)
+    subscription = SimpleNamespace(id=uuid.uuid4(), name="Example")
+    return NewsAPICrawler(subscription, sourceUri="example.com")
+
+
+@pytest.mark.asyncio
+async def test_crawl_pages_streams_pages_up_to_limit(monkeypatch):
+    requests = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append(body)
+        page = body["articlesPage"]
+        results = [
+            {
+                "url": f"https://example.com/{page}/{i}",
+                "title": f"Article {i}",
+                "lang": "deu",
+                "dateTimePub": "2026-10-18T06:00:00Z",
+            }
+            for i in range(body["articlesCount"])
+        ]
+        return httpx.Response(
+            200, json={"articles": {"results": results, "pages": 5}}
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(
+        crawler_module, "get_newsapi_http_client", lambda: client
+    )
+    crawler = make_crawler(monkeypatch)
+
+    pages = [
+        page
+        async for page in crawler.crawl_pages(
+            date_start=datetime(2026, 10, 17),
+            date_end=datetime(2026, 10, 18),
+            limit=150,
+        )
+    ]
+
+    assert [len(page) for page in pages] == [100, 50]
+    assert [r["articlesCount"] for r in requests] == [100, 50]
+    assert pages[0][0].language == "de"
+    assert pages[0][0].published_at == datetime(2026, 10, 18, 6)
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "crawler_type, expected_max_running",
+    [(CrawlerType.NewsAPICrawler, 3), (CrawlerType.RSSFeedCrawler, 5)],
+)
+async def test_run_crawler_fetches_sources_concurrently(
+    monkeypatch, crawler_type, expected_max_running
+):
+    running = 0
+    max_running = 0
+
+    class SlowCrawler:
+        async def crawl_pages(self, date_start, date_end, limit):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            yield [SimpleNamespace(url="https://example.com/a?utm_source=x")]
+
+    subscriptions = [
+        SimpleNamespace(
+            name=f"Source {i}",
+            crawlers={crawler_type.value: SlowCrawler()},
+        )
+        for i in range(5)
+    ]
+    monkeypatch.setattr(
+        web_harvester_orchestrator,
+        "get_subscriptions_with_crawlers",
+        AsyncMock(return_value=subscriptions),
+    )
+    create = AsyncMock()
+    monkeypatch.setattr(
+        web_harvester_orchestrator.ArticleRepository,
+        "create_articles_batch",
+        create,
+    )
+    monkeypatch.setattr(
+        web_harvester_orchestrator.configs,
+        "NEWSAPI_MAX_CONCURRENT_SOURCES",
+        3,
+    )
+
+    await web_harvester_orchestrator.run_crawler(crawler_type)
+
+    assert create.await_count == 5
+    # Only NewsAPI sources are limited
+    assert max_running == expected_max_running
+    stored = create.await_args.args[0]
+    assert [article.url for article in stored] == ["https://example.com/a"]
@@ -0,0 +1,67 @@
+from unittest.mock import MagicMock
+
+from app.services.query_embedding_cache import (
+    CachedQueryEmbeddings,
+    QueryEmbeddingCache,
+)
+
+
+def make_embeddings():
+    embeddings = MagicMock()
+    embeddings.model = "text-embedding-3-large"
+    embeddings.dimensions = None
+    embeddings.embed_documents.side_effect = lambda texts: [
+        [float(len(t)), 1.0] for t in texts
+    ]
+    return embeddings
+
+
+def test_embed_queries_embeds_each_distinct_text_once():
+    embeddings = make_embeddings()
+    cached = CachedQueryEmbeddings(
+        embeddings, QueryEmbeddingCache(max_size=10, ttl_seconds=0)
+    )
+
+    first = cached.embed_queries(["Tariffs", " Tariffs ", "ESG"])
+    second = cached.embed_queries(["ESG", "Tariffs"])
+
+    embeddings.embed_documents.assert_called_once_with(["Tariffs", "ESG"])
+    assert first == [[7.0, 1.0], [7.0, 1.0], [3.0, 1.0]]
+    assert second == [[3.0, 1.0], [7.0, 1.0]]
+    stats = cached.cache.stats()["local"]
+    assert stats["hits"] == 2
+    assert stats["misses"] == 3
+
+
+def test_lru_tier_evicts_least_recently_used():
+    embeddings = make_embeddings()
+    cache = QueryEmbeddingCache(max_size=2, ttl_seconds=0)
+    cached = CachedQueryEmbeddings(embeddings, cache)
+
+    cached.embed_queries(["a", "bb"])
+    cached.embed_query("a")
+    cached.embed_query("ccc")
+
+    assert cache.local.stats()["evictions"] == 1
+    cached.embed_query("bb")
+    assert embeddings.embed_documents.call_count == 3
+
+
+def test_shared_tier_is_used_before_the_model():
+    embeddings = make_embeddings()
+    redis_client = MagicMock()
+    cache = QueryEmbeddingCache(
+        max_size=10, ttl_seconds=60, redis_client=redis_client
+    )
+    stored = CachedQueryEmbeddings(make_embeddings(), cache)
+    redis_client.mget.return_value = [None]
+    stored.embed_query("Semiconductors")
+    packed = redis_client.pipeline.return_value.set.call_args.args[1]
+
+    cache.local.clear()
+    redis_client.mget.return_value = [packed]
+    cached = CachedQueryEmbeddings(embeddings, cache)
+
+    assert cached.embed_query("Semiconductors") == [14.0, 1.0]
+    embeddings.embed_documents.assert_not_called()
+    assert cache.shared.stats()["hits"] == 1
@@ -0,0 +1,151 @@
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from app.services.web_harvester import crawler as crawler_module
+from app.services.web_harvester.crawler import RSSFeedCrawler
+
+FEED = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Example</title>
+<item><title>First</title><link>https://example.com/first</link>
+<pubDate>Sun, 18 Oct 2026 06:00:00 GMT</pubDate></item>
+<item><title>Old</title><link>https://example.com/old</link>
+<pubDate>Mon, 12 Oct 2026 06:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+@pytest.mark.asyncio
+async def test_crawl_pages_sends_validators_and_skips_304(monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            content=FEED.encode(),
+            headers={"ETag": '"v2"', "Last-Modified": "Sun, 18 Oct 2026"},
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(crawler_module, "get_rss_http_client", lambda: client)
+    repository = crawler_module.RSSFeedStateRepository
+    monkeypatch.setattr(
+        repository,
+        "get_states",
+        AsyncMock(
+            return_value={
+                "https://a.example.com/rss": SimpleNamespace(
+                    etag='"v1"', last_modified=None
+                )
+            }
+        ),
+    )
+    save_state = AsyncMock()
+    monkeypatch.setattr(repository, "save_state", save_state)
+    crawler = RSSFeedCrawler(
+        SimpleNamespace(id=uuid.uuid4(), name="Example"),
+        feed_urls=["https://a.example.com/rss", "https://b.example.com/rss"],
+        language="en",
+    )
+
+    pages = [
+        page
+        async for page in crawler.crawl_pages(
+            date_start=datetime(2026, 10, 17), date_end=datetime(2026, 10, 19)
+        )
+    ]
+
+    assert len(requests) == 2
+    assert [[a.url for a in page] for page in pages] == [
+        ["https://example.com/first"]
+    ]
+    save_state.assert_awaited_once_with(
+        "https://b.example.com/rss", '"v2"', "Sun, 18 Oct 2026"
+    )
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_crawl_pages_keeps_validators_of_cut_off_feeds(monkeypatch):
+    def handler(request):
+        if request.url.host == "bad.example.com":
+            raise httpx.InvalidURL("Invalid URL")
+        return httpx.Response(
+            200,
+            content=FEED.encode(),
+            headers={"ETag": f'"{request.url.host}"'},
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(crawler_module, "get_rss_http_client", lambda: client)
+    repository = crawler_module.RSSFeedStateRepository
+    monkeypatch.setattr(repository, "get_states", AsyncMock(return_value={}))
+    save_state = AsyncMock()
+    monkeypatch.setattr(repository, "save_state", save_state)
+    crawler = RSSFeedCrawler(
+        SimpleNamespace(id=uuid.uuid4(), name="Example"),
+        feed_urls=[
+            "https://bad.example.com/rss",
+            "https://a.example.com/rss",
+            "https://b.example.com/rss",
+        ],
+        language="en",
+    )
+
+    pages = [
+        page
+        async for page in crawler.crawl_pages(
+            date_start=datetime(2026, 10, 1),
+            date_end=datetime(2026, 10, 19),
+            limit=3,
+        )
+    ]
+
+    assert [len(page) for page in pages] == [2, 1]
+    # Only the feed whose articles were all yielded keeps its validators
+    save_state.assert_awaited_once()
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_crawl_pages_saves_validators_of_feeds_without_new_articles(
+    monkeypatch,
+):
+    def handler(request):
+        return httpx.Response(
+            200,
+            content=FEED.encode(),
+            headers={"ETag": '"v1"', "Last-Modified": "Sun, 18 Oct 2026"},
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(crawler_module, "get_rss_http_client", lambda: client)
+    repository = crawler_module.RSSFeedStateRepository
+    monkeypatch.setattr(repository, "get_states", AsyncMock(return_value={}))
+    save_state = AsyncMock()
+    monkeypatch.setattr(repository, "save_state", save_state)
+    crawler = RSSFeedCrawler(
+        SimpleNamespace(id=uuid.uuid4(), name="Example"),
+        feed_urls=["https://a.example.com/rss"],
+        language="en",
+    )
+
+    # All entries are older than the window
+    pages = [
+        page
+        async for page in crawler.crawl_pages(
+            date_start=datetime(2026, 10, 19), date_end=datetime(2026, 10, 20)
+        )
+    ]
+
+    assert pages == []
+    save_state.assert_awaited_once_with(
+        "https://a.example.com/rss", '"v1"', "Sun, 18 Oct 2026"
+    )
+    await client.aclose()
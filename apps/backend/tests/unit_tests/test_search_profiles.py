@@ -12,15 +12,18 @@ from app.services.search_profiles_service import SearchProfileService
 
 
 @patch(
-    "app.services.search_profiles_service.SubscriptionRepository.has_organization_subscription_access",
+    "app.services.search_profiles_service.ArticleTranslationService.translate_content",
     new_callable=AsyncMock,
 )
 @patch(
-    "app.services.search_profiles_service.SearchProfileRepository.get_by_id",
+    "app.services.search_profiles_service.ArticleTranslationService.schedule_content_translation",
+)
+@patch(
+    "app.services.search_profiles_service.SubscriptionRepository.has_organization_subscription_access",
     new_callable=AsyncMock,
 )
 @patch(
-    "app.services.search_profiles_service.ArticleRepository.get_subscription_id_for_article",
+    "app.services.search_profiles_service.SearchProfileRepository.get_by_id",
     new_callable=AsyncMock,
 )
 @patch(
@@ -39,9 +42,10 @@ def test_get_article_overview(
     mock_get_matches,
     mock_get_keywords,
     mock_get_topic_names,
-    mock_get_subscription_id,
     mock_get_profile,
     mock_has_subscription_access,
+    mock_schedule_content_translation,
+    mock_translate_content,
 ):
     search_profile_id = uuid4()
 
@@ -94,7 +98,6 @@ def test_get_article_overview(
     )()
 
     mock_get_matches.return_value = [match]
-    mock_get_subscription_id.return_value = article.subscription_id
     mock_get_topic_names.return_value = {match.topic_id: "TestTopic"}
     mock_get_keywords.return_value = {match.topic_id: ["keyword1", "keyword2"]}
     mock_get_profile.return_value = fake_search_profile
@@ -118,6 +121,15 @@ def test_get_article_overview(
 
     assert len(result.matches) == 1
     assert result.matches[0].article.headline["en"] == "Test"
+    mock_schedule_content_translation.assert_called_once_with([article])
+    mock_translate_content.assert_not_awaited()
+    mock_get_matches.assert_awaited_once_with(
+        search_profile_id,
+        start_date=request.startDate,
+        end_date=request.endDate,
+        subscription_ids=[],
+        topic_ids=[],
+    )
 
 
 def test_get_match_detail_success():
@@ -0,0 +1,257 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.article import Article, ArticleStatus
+from app.repositories import entity_translation_repository
+from app.repositories.bulk_update import update_from_values
+from app.repositories.entity_translation_repository import (
+    EntityTranslationRepository,
+)
+from app.services.translation_chunker import (
+    estimate_text_tokens,
+    join_chunks,
+    split_into_chunks,
+)
+from app.services.translation_service import ArticleTranslationService
+
+
+@pytest.mark.asyncio
+async def test_run_for_entities_translates_distinct_values(monkeypatch):
+    values = [
+        MagicMock(id=uuid.uuid4(), value="Automotive"),
+        MagicMock(id=uuid.uuid4(), value="Energie"),
+    ]
+    repository = "app.services.translation_service.EntityTranslationRepository"
+    add_missing = AsyncMock(return_value=2)
+    get_values = AsyncMock(side_effect=[values, []])
+    backfill = AsyncMock(return_value=1500)
+    monkeypatch.setattr(f"{repository}.add_missing_values", add_missing)
+    monkeypatch.setattr(
+        f"{repository}.get_values_without_translations", get_values
+    )
+    monkeypatch.setattr(f"{repository}.backfill_entities", backfill)
+    translate = AsyncMock(return_value=True)
+    monkeypatch.setattr(
+        ArticleTranslationService, "_translate_all_fields", translate
+    )
+
+    await ArticleTranslationService.run_for_entities(limit=50)
+
+    add_missing.assert_awaited_once()
+    ids, texts, _, target, _ = translate.await_args.args
+    assert ids == [f"{value.id}_value" for value in values]
+    assert texts == ["Automotive", "Energie"]
+    assert target is EntityTranslationRepository
+    backfill.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_backfill_entities_uses_one_update_from(fake_async_session):
+    session = fake_async_session(entity_translation_repository)
+    session.execute = AsyncMock(return_value=MagicMock(rowcount=7))
+
+    updated = await EntityTranslationRepository.backfill_entities()
+
+    assert updated == 7
+    statement = session.execute.await_args.args[0]
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE entities SET")
+    assert "FROM entity_translations" in sql
+
+
+def test_split_into_chunks_keeps_paragraphs_and_order():
+    paragraphs = [f"Paragraph {i}. " + "word " * 30 for i in range(6)]
+    text = "\n\n".join(p.strip() for p in paragraphs)
+
+    chunks = split_into_chunks(text, max_tokens=100)
+
+    assert len(chunks) > 1
+    assert all(estimate_text_tokens(c.text) <= 100 for c in chunks)
+    assert join_chunks([c.text for c in chunks], chunks) == text
+
+    long_paragraph = " ".join(f"Sentence {i} is here." for i in range(200))
+    chunks = split_into_chunks(long_paragraph, max_tokens=50)
+    assert all(c.separator == " " for c in chunks[:-1])
+    assert join_chunks([c.text for c in chunks], chunks) == long_paragraph
+
+
+@pytest.mark.asyncio
+async def test_long_content_is_translated_in_segments(monkeypatch):
+    english = "This paragraph is written in English and stays as it is. " * 3
+    german = (
+        "Dieser Absatz ist auf Deutsch geschrieben und wird übersetzt. " * 3
+    )
+    text = "\n\n".join([english.strip(), german.strip(), english.strip()])
+    # The text as a whole is mixed, its segments are not
+    monkeypatch.setattr(
+        "app.services.translation_service.detect_language",
+        lambda t: "fr",
+    )
+    monkeypatch.setattr(
+        ArticleTranslationService,
+        "_detect_language",
+        staticmethod(lambda t: "en" if t.startswith("This") else "de"),
+    )
+    prompts_sent = []
+
+    async def generate(prompt):
+        prompts_sent.append(prompt)
+        return "TRANSLATED"
+
+    monkeypatch.setattr(ArticleTranslationService, "_generate", generate)
+
+    custom_ids, prompts, _ = (
+        ArticleTranslationService._prepare_translation_content(
+            ["id_content"], [text], chunk_tokens=50
+        )
+    )
+    english_index = custom_ids.index("id_content_en")
+    response = await ArticleTranslationService._translate_one(
+        custom_ids[english_index], prompts[english_index]
+    )
+
+    content = response["response"]["body"]["choices"][0]["message"]["content"]
+    assert content == "\n\n".join(
+        [english.strip(), "TRANSLATED", english.strip()]
+    )
+    assert len(prompts_sent) == 1
+
+
+def test_stored_languages_skip_detection(monkeypatch):
+    def fail(text):
+        raise AssertionError("language detected again")
+
+    monkeypatch.setattr(
+        "app.services.translation_service.detect_language", fail
+    )
+    article = MagicMock(
+        id="a", field_languages={"title": "de", "content": "en"}
+    )
+    languages = ArticleTranslationService._stored_languages(
+        [article], "summary"
+    )
+    assert languages == ["en"]
+
+    custom_ids, _, auto_responses = (
+        ArticleTranslationService._prepare_translation_content(
+            ["a_title", "a_summary"],
+            ["Kurzer Titel", "An English summary " * 5],
+            languages=["de", "en"],
+        )
+    )
+    assert custom_ids == ["a_title_en", "a_summary_de"]
+    assert [r["custom_id"] for r in auto_responses] == [
+        "a_title_de",
+        "a_summary_en",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_store_translations_updates_page_at_once():
+    first, second = uuid.uuid4(), uuid.uuid4()
+    repository = MagicMock()
+    repository.update_translations_many = AsyncMock(return_value=2)
+
+    await ArticleTranslationService._store_translations(
+        {
+            first: {"en": {"title": "Title"}, "de": {"title": "Titel"}},
+            second: {"de": {"summary": "Zusammenfassung"}},
+        },
+        repository,
+    )
+
+    repository.update_translations_many.assert_awaited_once_with(
+        {
+            first: {"title_en": "Title", "title_de": "Titel"},
+            second: {"summary_de": "Zusammenfassung"},
+        }
+    )
+
+
+def test_update_from_values_keeps_missing_fields():
+    statements = update_from_values(
+        Article,
+        {uuid.uuid4(): {"title_en": "Title"}, uuid.uuid4(): {}},
+        ("title_en", "title_de"),
+        status=ArticleStatus.TRANSLATED,
+    )
+
+    assert len(statements) == 1
+    sql = str(statements[0].compile(dialect=postgresql.dialect()))
+    assert "FROM (VALUES" in sql
+    assert "coalesce(new_values.title_de, articles.title_de)" in sql
+
+
+@pytest.mark.asyncio
+async def test_translate_content_on_demand_keeps_status(
+    monkeypatch, fake_async_session
+):
+    article = MagicMock(
+        id=uuid.uuid4(),
+        content="Der Inhalt des Artikels.",
+        content_en=None,
+        content_de=None,
+        field_languages={"content": "de"},
+    )
+    translated = MagicMock(id=uuid.uuid4(), content_en="Text", content_de="T")
+
+    async def generate(prompt):
+        return "The content of the article."
+
+    monkeypatch.setattr(ArticleTranslationService, "_generate", generate)
+    update = AsyncMock()
+    monkeypatch.setattr(
+        "app.services.translation_service.ArticleRepository."
+        "update_article_translations",
+        update,
+    )
+    session = fake_async_session("app.services.translation_service")
+
+    stored = await ArticleTranslationService.translate_content(
+        [article, translated]
+    )
+
+    assert stored == 1
+    update.assert_awaited_once_with(
+        session,
+        {
+            article.id: {
+                "content_en": "The content of the article.",
+                "content_de": "Der Inhalt des Artikels.",
+            }
+        },
+    )
+    assert article.content_en == "The content of the article."
+    assert article.content_de == "Der Inhalt des Artikels."
+
+
+@pytest.mark.asyncio
+async def test_content_translation_is_scheduled_once(monkeypatch):
+    article = MagicMock(
+        id=uuid.uuid4(), content="Inhalt", content_en=None, content_de=None
+    )
+    translated = MagicMock(id=uuid.uuid4(), content_en="Text", content_de="T")
+    translate = AsyncMock(return_value=1)
+    monkeypatch.setattr(
+        ArticleTranslationService, "translate_content", translate
+    )
+
+    task = ArticleTranslationService.schedule_content_translation(
+        [article, translated]
+    )
+    # A second listing while the first translation runs adds nothing
+    assert (
+        ArticleTranslationService.schedule_content_translation([article])
+        is None
+    )
+    await task
+
+    translate.assert_awaited_once_with([article])
+    assert article.id not in ArticleTranslationService._content_article_ids
+    assert (
+        ArticleTranslationService.schedule_content_translation([translated])
+        is None
+    )
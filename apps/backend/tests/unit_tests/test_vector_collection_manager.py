@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from qdrant_client import models
+
+from app.services.vector_collection_manager import (
+    VectorCollectionManager,
+    get_collection_schema,
+    reduce_dimensions_transform,
+)
+
+
+def make_client(aliases=(), collections=()):
+    client = MagicMock()
+    existing = set(collections)
+    client.collection_exists.side_effect = lambda name: name in existing
+    client.create_collection.side_effect = lambda collection_name, **_: (
+        existing.add(collection_name)
+    )
+    client.get_aliases.return_value = SimpleNamespace(
+        aliases=[
+            SimpleNamespace(alias_name=alias, collection_name=collection)
+            for alias, collection in aliases
+        ]
+    )
+    return client
+
+
+def test_current_schema_uses_int8_quantization_with_rescoring():
+    schema = get_collection_schema()
+
+    assert schema.vectors_config()["dense"].on_disk is True
+    quantization = schema.quantization_config()
+    assert quantization.scalar.type == models.ScalarType.INT8
+    assert schema.search_params().quantization.rescore is True
+    assert schema.estimated_ram_bytes(1000) < get_collection_schema(
+        1
+    ).estimated_ram_bytes(1000)
+
+
+def test_migrate_legacy_collection_copies_points_and_creates_alias():
+    client = make_client(collections=["articles"])
+    record = SimpleNamespace(id="a", vector={"dense": [0.1]}, payload={})
+    client.scroll.side_effect = [([record], "next"), ([record], None)]
+
+    target = VectorCollectionManager(client).migrate(
+        "articles", get_collection_schema(2)
+    )
+
+    assert target == "articles_v2"
+    assert client.upsert.call_count == 2
+    client.delete_collection.assert_called_once_with(
+        collection_name="articles"
+    )
+    operations = client.update_collection_aliases.call_args.kwargs[
+        "change_aliases_operations"
+    ]
+    assert [type(op) for op in operations] == [models.CreateAliasOperation]
+
+
+def test_migrate_switches_existing_alias_atomically():
+    client = make_client(
+        aliases=[("articles", "articles_v1")], collections=["articles_v1"]
+    )
+    client.scroll.return_value = ([], None)
+
+    VectorCollectionManager(client).migrate(
+        "articles", get_collection_schema(2)
+    )
+
+    client.delete_collection.assert_not_called()
+    client.create_payload_index.assert_called()
+    operations = client.update_collection_aliases.call_args.kwargs[
+        "change_aliases_operations"
+    ]
+    assert [type(op) for op in operations] == [
+        models.DeleteAliasOperation,
+        models.CreateAliasOperation,
+    ]
+
+
+def test_reduce_dimensions_builds_shorter_normalized_collection():
+    client = make_client(
+        aliases=[("articles", "articles_v2")], collections=["articles_v2"]
+    )
+    sparse = models.SparseVector(indices=[1], values=[1.0])
+    record = SimpleNamespace(
+        id="a",
+        vector={"dense": [3.0, 4.0, 12.0], "sparse": sparse},
+        payload={"page_content": "summary"},
+    )
+    client.scroll.return_value = ([record], None)
+
+    target = VectorCollectionManager(client).migrate(
+        "articles",
+        get_collection_schema(2, dimensions=2),
+        transform=reduce_dimensions_transform(2),
+        switch_alias=False,
+    )
+
+    assert target == "articles_v2_2d"
+    vectors = client.create_collection.call_args.kwargs["vectors_config"]
+    assert vectors["dense"].size == 2
+    point = client.upsert.call_args.kwargs["points"][0]
+    assert point.vector["dense"] == pytest.approx([0.6, 0.8])
+    assert point.vector["sparse"] == sparse
+    client.update_collection_aliases.assert_not_called()
@@ -12,6 +12,7 @@ class Config(BaseSettings):
     EMAIL_JOB_INTERVAL: int
     RSS_JOB_INTERVAL: int
     BREAKING_NEWS_JOB_INTERVAL: int
+    LLM_BATCH_JOB_INTERVAL: int = -1
 
     # Pipeline job schedule configuration
     PIPELINE_MORNING_TIME: str = "10:00"
@@ -50,6 +50,14 @@ def schedule_jobs(service: SchedulerService, cfg: Config) -> None:
             args=[f"{cfg.API_BASE_URL}/v1/jobs/breaking-news"],
         )
 
+    if cfg.LLM_BATCH_JOB_INTERVAL > 0:
+        service.schedule_periodic(
+            id=UUID("2d0f6a4e-7c1b-4f3a-9e58-b6c1d2e3f4a5"),
+            every_seconds=cfg.LLM_BATCH_JOB_INTERVAL,
+            func=job_request,
+            args=[f"{cfg.API_BASE_URL}/v1/jobs/llm-batches"],
+        )
+
 
 def job_request(url: str, body: dict | None = None) -> None:
     req = requests.post(url, json=body)